@@ -0,0 +1,158 @@
+"""Compare les backends HTTP (requêtes par seconde, connexions ouvertes).
+
+Par défaut un serveur local HTTP/2 + HTTP/1.1 (hypercorn, certificat auto-signé via openssl)
+est démarré ; --url permet de viser un serveur existant.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import Settings
+from core.transport import TRANSPORTS, AiohttpTransport, create_transport
+
+PAGE = ("<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>"
+        + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 40
+        + "</body></html>")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RhinoScraper - HTTP backend benchmark")
+    parser.add_argument('--url', help="Base URL of an existing server (default: local test server)")
+    parser.add_argument('--requests', type=int, default=500, help="Requests per backend")
+    parser.add_argument('--concurrency', type=int, help="Connection limit (default: CONCURRENT_REQUESTS)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Let the adaptive concurrency controller raise the limit")
+    parser.add_argument('--backends', nargs='+', choices=sorted(TRANSPORTS), default=sorted(TRANSPORTS))
+    return parser.parse_args()
+
+
+async def _app(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    """Application ASGI minimale : une page HTML par chemin"""
+    if scope['type'] != 'http':
+        return
+    body = PAGE.format(i=scope['path']).encode()
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-type', b'text/html; charset=utf-8')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _serve(port: int, certfile: str, keyfile: str) -> None:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.accesslog = None
+    asyncio.run(serve(_app, config))
+
+
+def _self_signed_certificate(directory: str) -> List[str]:
+    certfile, keyfile = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-keyout', keyfile, '-out', certfile],
+                   check=True, capture_output=True)
+    return [certfile, keyfile]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Test server did not start on port {port}")
+
+
+async def run_backend(name: str, base_url: str, requests: int, keep_alive: bool = False) -> Dict[str, Any]:
+    transport = create_transport(name)
+    if keep_alive and isinstance(transport, AiohttpTransport):
+        transport.keep_alive = True
+    try:
+        # Requête de chauffe : établissement TLS et négociation ALPN hors mesure
+        first = await transport.request('GET', f"{base_url}/warmup")
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *[transport.request('GET', f"{base_url}/page/{i}") for i in range(requests)],
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        await transport.close()
+
+    errors = sum(1 for r in responses if isinstance(r, Exception))
+    return {
+        'backend': f"{name}/ka" if keep_alive else name,
+        'protocol': first.http_version,
+        'requests_per_second': (requests - errors) / elapsed,
+        'connections': transport.stats['connections'],
+        'errors': errors,
+        'seconds': elapsed,
+        'limit': max(limit for host, limit in transport.concurrency.limits().items() if host != 'all hosts')
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    settings = Settings.get_instance()
+    if args.concurrency:
+        settings.CONCURRENT_REQUESTS = args.concurrency
+    # Limite fixe par défaut pour comparer les backends à nombre de connexions égal
+    settings.ADAPTIVE_CONCURRENCY = args.adaptive
+
+    server: Optional[multiprocessing.Process] = None
+    base_url = args.url.rstrip('/') if args.url else None
+    with tempfile.TemporaryDirectory() as directory:
+        if base_url is None:
+            port = _free_port()
+            server = multiprocessing.get_context('spawn').Process(
+                target=_serve, args=(port, *_self_signed_certificate(directory)), daemon=True
+            )
+            server.start()
+            _wait_for_port(port)
+            base_url = f"https://127.0.0.1:{port}"
+
+        try:
+            print(f"{args.requests} requests per backend against {base_url}, "
+                  f"{settings.CONCURRENT_REQUESTS} concurrent requests"
+                  f"{' to start with (adaptive)' if args.adaptive else ''}\n")
+            print(f"{'backend':<12}{'protocol':<10}{'req/s':>10}{'connections':>13}{'errors':>8}{'limit':>7}")
+            # aiohttp tel que l'utilise le crawler (une connexion par requête), puis avec keep-alive :
+            # l'écart avec httpx mesure alors le multiplexage HTTP/2, pas la seule réutilisation des connexions
+            runs = [(name, False) for name in args.backends]
+            if AiohttpTransport.name in args.backends:
+                runs.insert(args.backends.index(AiohttpTransport.name) + 1, (AiohttpTransport.name, True))
+            for name, keep_alive in runs:
+                try:
+                    row = asyncio.run(run_backend(name, base_url, args.requests, keep_alive))
+                except RuntimeError as e:
+                    print(f"{name:<12}{str(e)}")
+                    continue
+                print(f"{row['backend']:<12}{row['protocol']:<10}{row['requests_per_second']:>10.1f}"
+                      f"{row['connections']:>13}{row['errors']:>8}{row['limit']:>7}")
+            print(f"\n{AiohttpTransport.name} opens one connection per request, as in the crawler; "
+                  f"{AiohttpTransport.name}/ka reuses connections (keep-alive) for a like-for-like "
+                  f"comparison with HTTP/2 multiplexing.")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
-from typing import Dict, Any, List, Optional, Set
-from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field, replace
+from contextlib import suppress
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
 import asyncio
-from bs4 import BeautifulSoup
-import aiohttp
+import logging
+from bs4 import BeautifulSoup, Tag
 from config.settings import Settings
 
 from core.session import SessionManager
+from core.transport import Transport, TransportError
 from core.cache import RhinoCache
+from core.checkpoint import CrawlCheckpoint
+from core.frontier import Frontier, FrontierEntry
+from core.fingerprint import DuplicateIndex, PageFingerprint, fingerprint
+from core.assets import AssetScanner, collect_asset_urls
+from core.documents import DOCUMENT_EXTENSIONS, DocumentScanner, collect_document_urls
+from core.budget import CrawlBudget
+from core.deliverability import DeliverabilityChecker
+from core.breaker import CircuitBreaker
+from core.scoring import LinkScorer
+from core.templates import TemplateBlock, TemplateIndex, block_hash, find_blocks, merge_findings
 from extractors import (
+    PageBuffers,
     ContentExtractor,
     SecurityExtractor,
     SocialExtractor,
@@ -19,6 +32,25 @@ from extractors import (
     TechnologyExtractor,
     SensitiveFileExtractor
 )
+from extractors.buffers import SEPARATOR
+
+logger = logging.getLogger(__name__)
+
+# Extracteurs activables par Settings.EXTRACTORS, dans leur ordre d'exécution
+EXTRACTORS = {
+    'content': ContentExtractor,
+    'security': SecurityExtractor,
+    'social': SocialExtractor,
+    'domain': DomainExtractor,
+    'email': EmailExtractor,
+    'phone': PhoneExtractor,
+    'technology': TechnologyExtractor,
+    'sensitive_files': SensitiveFileExtractor,
+}
+# Extracteurs propres à l'hôte (certificat, en-têtes, WHOIS) : relancés une fois par hôte en mode incrémental
+HOST_EXTRACTORS = ('security', 'domain')
+# Extracteurs sondant des chemins sous l'URL de la page : relancés une fois par préfixe en mode incrémental
+PATH_EXTRACTORS = ('sensitive_files',)
 
 
 @dataclass
@@ -36,106 +68,667 @@ class AnalysisResult:
     technologies: List[str]
     sensitive_files: List[Dict[str, Any]]
     internal_links: Dict[str, Any]
+    links: List[str] = field(default_factory=list)
+    link_scores: Dict[str, float] = field(default_factory=dict)
+    content_hash: str = ''
+    simhash: int = 0
+    duplicate: Optional[Dict[str, Any]] = None  # page identique ou quasi identique déjà analysée
+    asset_urls: List[str] = field(default_factory=list)  # scripts et feuilles de style référencés
+    assets: List[Dict[str, Any]] = field(default_factory=list)
+    document_urls: List[str] = field(default_factory=list)  # PDF, documents bureautiques et images liés
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    # Extracteurs sans résultat pour cette page : 'timeout', 'error' ou 'circuit open'
+    incomplete: Dict[str, str] = field(default_factory=dict)
+    template_blocks: List[str] = field(default_factory=list)  # empreintes des blocs de gabarit de la page
+    templates: List[Dict[str, Any]] = field(default_factory=list)  # page de départ : gabarit commun du site
+
+
+@dataclass
+class CrawlOptions:
+    """Réglages d'un appel à SiteAnalyzer.crawl (None : valeur de Settings)"""
+    max_depth: Optional[int] = None
+    max_pages: Optional[int] = None
+    time_limit: Optional[float] = None
+    depth: int = 0  # profondeur des URLs de départ
+    # Pages en cours d'analyse ou en attente du consommateur, au plus ; None : sans limite
+    buffer_size: Optional[int] = 16
 
 
 class SiteAnalyzer:
-    def __init__(self, session_manager: SessionManager, cache: RhinoCache):
-        self.session_manager = session_manager
-        self.cache = cache
+    """Crawl et analyse d'un site.
+
+    Utilisable comme gestionnaire de contexte asynchrone : sans session ni cache fournis,
+    l'analyseur crée les siens et les ferme à la sortie.
+
+        async with SiteAnalyzer() as analyzer:
+            async with aclosing(analyzer.crawl(['https://example.com'], CrawlOptions(max_pages=50))) as pages:
+                async for page in pages:
+                    ...
+    """
+
+    def __init__(self,
+                 session_manager: Optional[SessionManager] = None,
+                 cache: Optional[RhinoCache] = None,
+                 checkpoint: Optional[CrawlCheckpoint] = None):
+        # Session et cache créés ici : fermés par close()
+        self._owns_session = session_manager is None
+        self._owns_cache = cache is None
+        self.session_manager = session_manager or SessionManager()
+        self.cache = cache or RhinoCache()
+        self.checkpoint = checkpoint
         self.settings = Settings.get_instance()
+        if unknown := set(self.settings.EXTRACTORS) - set(EXTRACTORS):
+            logger.warning("Unknown extractors ignored: %s", ', '.join(sorted(unknown)))
         self.analyzed_urls: Set[str] = set()
+        self.frontier = Frontier()
+        self.pages: Dict[str, AnalysisResult] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.host_facts: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {'fetched': 0, 'cached': 0, 'errors': 0, 'collapsed': 0,
+                                         'unchanged': 0}
+        self.baseline: Optional[Dict[str, AnalysisResult]] = None
+        # Résultats des extracteurs d'hôte et de chemins pour les pages inchangées, par hôte ou préfixe
+        self.host_probes: Dict[str, List[Tuple[str, Any]]] = {}
+        self._probe_locks: Dict[str, asyncio.Lock] = {}
+        self.content_hashes: Dict[str, str] = {}
+        self.near_duplicates = DuplicateIndex(self.settings.SIMHASH_MAX_DISTANCE)
+        self.templates = TemplateIndex.from_settings()
+        # Partagé par les pages, les assets et les documents : un hôte coupé n'est plus sollicité
+        self.breaker = CircuitBreaker.from_settings()
+        self.asset_scanner = AssetScanner(self.session_manager, self.cache, self.breaker)
+        self.document_scanner = DocumentScanner(self.session_manager, self.cache, self.breaker)
+        self.budget = CrawlBudget.from_settings()
+        self.scorer = LinkScorer()
+        self.stop_reason: Optional[str] = None
+        self.seed: Optional[str] = None
+        # Pages analysées en attente du consommateur de crawl()
+        self._results: Optional[asyncio.Queue] = None
+        # Créneaux de crawl() : pris avant une URL, rendus quand sa page est consommée
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._crawl_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'SiteAnalyzer':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Arrête le crawl en cours et ferme la session et le cache créés par l'analyseur"""
+        if self._crawl_task is not None:
+            self._crawl_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._crawl_task
+        if self._owns_session:
+            await self.session_manager.close()
+        if self._owns_cache:
+            self.cache.close()
+
+    async def crawl(self,
+                    seeds: Union[str, Iterable[str]],
+                    options: Optional[CrawlOptions] = None) -> AsyncIterator[AnalysisResult]:
+        """Crawl à partir des URLs de départ ; chaque page est produite dès qu'elle est analysée.
+
+        Les pages produites ne portent pas l'arborescence (internal_links) : voir analyze().
+        Au plus options.buffer_size pages sont en cours d'analyse ou en attente du consommateur :
+        au-delà, les workers ne prennent plus d'URL dans la frontière.
+
+        Le crawl s'arrête (avec un checkpoint) quand le générateur est fermé : une boucle
+        interrompue par break doit donc être écrite dans contextlib.aclosing(), sans quoi le
+        crawl continue tant qu'une référence au générateur subsiste. L'annulation de la tâche
+        consommatrice et la sortie du bloc async with de l'analyseur l'arrêtent aussi.
+        """
+        options = options or CrawlOptions()
+        self._apply(options)
+        for seed in [seeds] if isinstance(seeds, str) else seeds:
+            if self.seed is None:
+                self.seed = seed
+            if seed not in self.analyzed_urls:
+                self.analyzed_urls.add(seed)
+                self.frontier.push(seed, options.depth)
+        self.budget.start()
+
+        # La file ne déborde jamais : chaque page qui y entre occupe déjà un créneau
+        results: asyncio.Queue = asyncio.Queue()
+        self._results = results
+        slots = self._slots = (asyncio.Semaphore(max(1, options.buffer_size))
+                               if options.buffer_size is not None else None)
+        crawl_task = self._crawl_task = asyncio.create_task(self._run_workers())
+        getter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(results.get())
+                await asyncio.wait((getter, crawl_task), return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    # Crawl terminé (ou arrêté par close()) : plus aucune page ne peut arriver
+                    break
+                if slots is not None:
+                    slots.release()
+                yield getter.result()
+            while not results.empty():
+                yield results.get_nowait()
+            if not crawl_task.cancelled():
+                crawl_task.result()
+        finally:
+            if getter is not None:
+                getter.cancel()
+            if not crawl_task.done():
+                crawl_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await crawl_task
+            self._crawl_task = None
+            self._results = None
+            self._slots = None
+            # Checkpoint final, y compris en cas d'interruption (Ctrl-C)
+            self.save_checkpoint()
 
     async def analyze(self, url: str, depth: int = 0) -> Optional[AnalysisResult]:
-        """Analyse complète d'une URL avec tous les extracteurs"""
+        """Analyse complète d'une URL et de ses liens internes"""
+        # Les pages sont consommées aussitôt : la concurrence n'est limitée que par les workers
+        async for _ in self.crawl(url, CrawlOptions(depth=depth, buffer_size=None)):
+            pass
+
+        # Chaque script ou feuille de style n'est téléchargé qu'une fois pour tout le crawl
+        if self.settings.SCAN_ASSETS and self.stop_reason != 'time limit':
+            await self.asset_scanner.scan(self.pages)
+            self.save_checkpoint()
+        # De même pour les documents liés, dont seules les métadonnées sont lues
+        if self.settings.SCAN_DOCUMENTS and self.stop_reason != 'time limit':
+            await self.document_scanner.scan(self.pages)
+            self.save_checkpoint()
+        # Délivrabilité des emails : une résolution DNS par domaine pour toutes les adresses
+        if self.settings.CHECK_DELIVERABILITY and self.stop_reason != 'time limit':
+            await DeliverabilityChecker().annotate(self.pages)
+            self.save_checkpoint()
+
+        tree = self._build_tree(url)
+        if tree is not None and self.settings.DETECT_TEMPLATES:
+            # Entités du gabarit commun, rapportées une seule fois pour le site
+            tree = replace(tree, templates=self.templates.summary())
+        return tree
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Reprend un crawl à partir d'un checkpoint"""
+        self.seed = state['seed']
+        self.analyzed_urls = set(state['seen'])
+        self.pages = dict(state['pages'])
+        self.children = {k: list(v) for k, v in state['children'].items()}
+        self.host_facts = dict(state['host_facts'])
+        self.counters.update(state['counters'])
+        self.templates.blocks.update(state.get('templates', {}))
+        # Profondeur et budget du crawl interrompu (absents des checkpoints plus anciens)
+        if 'max_depth' in state:
+            self.settings = replace(self.settings, MAX_DEPTH=state['max_depth'])
+        self.budget.pages = state.get('budget', {}).get('pages', 0)
+        self.budget.bytes = state.get('budget', {}).get('bytes', 0)
+        for url, result in self.pages.items():
+            self._index_fingerprint(url, result)
+        for entry in state['frontier']:
+            self.frontier.push(*entry)
+        logger.info("Resuming crawl of %s: %d pages done, %d queued",
+                    self.seed, len(self.pages), len(self.frontier))
+
+    def set_baseline(self, pages: Dict[str, AnalysisResult]) -> None:
+        """Résultats d'un scan précédent : seules les pages modifiées sont ré-extraites"""
+        self.baseline = pages
+        logger.info("Incremental scan against %d previously analyzed pages", len(pages))
+
+    def state(self) -> Dict[str, Any]:
+        """État sérialisable du crawl en cours"""
+        return {
+            'seed': self.seed,
+            'frontier': [tuple(entry) for entry in self.frontier.snapshot()],
+            'seen': set(self.analyzed_urls),
+            'pages': dict(self.pages),
+            'children': {k: list(v) for k, v in self.children.items()},
+            'host_facts': dict(self.host_facts),
+            'counters': dict(self.counters),
+            'templates': dict(self.templates.blocks),
+            'max_depth': self.settings.MAX_DEPTH,
+            'budget': {'pages': self.budget.pages, 'bytes': self.budget.bytes},
+            'complete': not len(self.frontier) and not self.frontier.in_flight and not self.frontier.deferred,
+            'stop_reason': self.stop_reason
+        }
+
+    def save_checkpoint(self) -> None:
+        if self.checkpoint and self.seed:
+            self.checkpoint.save(self.state(), len(self.pages))
+
+    def progress(self) -> Dict[str, int]:
+        """Avancement du crawl, pour la ligne de progression"""
+        return {
+            'pages': len(self.pages),
+            'queued': len(self.frontier),
+            'in_flight': self.frontier.in_flight,
+            'errors': self.counters['errors']
+        }
+
+    def _apply(self, options: CrawlOptions) -> None:
+        if options.max_depth is not None:
+            self.settings = replace(self.settings, MAX_DEPTH=options.max_depth)
+        if options.max_pages is not None:
+            self.budget.max_pages = options.max_pages
+        if options.time_limit is not None:
+            self.budget.time_limit = options.time_limit
+
+    async def _run_workers(self) -> None:
+        # Le contrôleur de concurrence décide du nombre de requêtes réellement simultanées
+        workers = [asyncio.create_task(self._worker())
+                   for _ in range(max(1, self.session_manager.concurrency.ceiling))]
         try:
-            if url in self.analyzed_urls or depth > self.settings.MAX_DEPTH:
-                return None
-
-            if cached_result := self.cache.get(url):
-                return cached_result
-
-            print(f"Analyzing URL: {url} at depth {depth}")  # Debug
-            self.analyzed_urls.add(url)
-
-            session = await self.session_manager.get_session()
-            async with session.get(url, ssl=False) as response:
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-
-                # Création des instances d'extracteurs
-                extractors = [
-                    ContentExtractor(soup, url),
-                    SecurityExtractor(soup, url),
-                    SocialExtractor(soup, url),
-                    DomainExtractor(soup, url),
-                    EmailExtractor(soup, url),
-                    PhoneExtractor(soup, url),
-                    TechnologyExtractor(soup, url),
-                    SensitiveFileExtractor(soup, url),  # Suppression du paramètre session
-                ]
-
-                # Exécution parallèle des extracteurs
-                results = await asyncio.gather(
-                    *[extractor.extract() for extractor in extractors],
-                    return_exceptions=True
-                )
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _worker(self) -> None:
+        while True:
+            slots = self._slots
+            if slots is not None:
+                # Consommateur en retard : le worker attend avant de prendre une autre URL
+                await slots.acquire()
+            handed_off = False
+            try:
+                entry = await self.frontier.get()
+                if entry is None:
+                    return
+                if reason := self.budget.exhausted(self.frontier.in_flight - 1):
+                    # Budget épuisé : l'entrée reste dans la frontière pour une reprise éventuelle
+                    if self.stop_reason is None:
+                        logger.info("Crawl budget exhausted (%s), stopping with %d URLs queued",
+                                    reason, len(self.frontier) + 1)
+                        self.stop_reason = reason
+                    self.frontier.requeue(entry)
+                    return
+                host = urlparse(entry.url).netloc
+                if not self.budget.host_allowed(self.host_facts.get(host, {})):
+                    self.frontier.defer(entry)
+                    continue
+                if not self.breaker.allow(host):
+                    # Hôte coupé : l'entrée revient après le refroidissement, ou attend une reprise
+                    if (delay := self.breaker.retry_after(host)) is None:
+                        self.frontier.defer(entry)
+                    else:
+                        self.frontier.hold(entry, delay)
+                    continue
+                result = None
+                try:
+                    result = await self._process(entry)
+                except asyncio.CancelledError:
+                    # L'entrée reste "en cours" : elle sera reprise depuis le checkpoint
+                    raise
+                except Exception:
+                    self.counters['errors'] += 1
+                    logger.exception("Error analyzing %s", entry.url)
+                self.frontier.task_done(entry)
+                if self.checkpoint and self.checkpoint.due(len(self.pages)):
+                    self.save_checkpoint()
+                if result is not None and self._results is not None:
+                    # La page garde son créneau jusqu'à ce que le consommateur la prenne
+                    self._results.put_nowait(result)
+                    handed_off = True
+            finally:
+                if slots is not None and not handed_off:
+                    slots.release()
+
+    async def _process(self, entry: FrontierEntry) -> Optional[AnalysisResult]:
+        """Analyse une entrée de la frontière ; renvoie le résultat de la page, ou None"""
+        host = urlparse(entry.url).netloc
+        if entry.depth > self.settings.MAX_DEPTH:
+            self.breaker.release(host)
+            return None
 
-                # Traitement des résultats
-                combined_results = {}
-                for result in results:
-                    if isinstance(result, Exception):
-                        print(f"Extractor error: {str(result)}")
-                        continue
-                    if isinstance(result, dict):
-                        combined_results.update(result)
-
-                # Analyse récursive des liens internes si nécessaire
-                internal_links = {}
-                if depth < self.settings.MAX_DEPTH:
-                    found_links = self._get_internal_links(soup, url)
-                    print(f"Found {len(found_links)} internal links")
-                    if found_links:  # Ne procéder que s'il y a des liens à analyser
-                        internal_links = await self._analyze_internal_links(found_links, depth + 1)
-
-                # Construction du résultat final
-                analysis_result = AnalysisResult(
-                    url=url,
+        facts = self.host_facts.setdefault(host, {'pages': 0, 'errors': 0, 'bytes': 0})
+
+        # En mode incrémental, chaque page est re-téléchargée pour comparer son empreinte
+        if self.baseline is None and (cached_result := self.cache.get(self._cache_key(entry.url))):
+            self.counters['cached'] += 1
+            self.breaker.release(host)
+            result = cached_result
+            self._register_templates(host, entry.url, getattr(result, 'template_blocks', []))
+        else:
+            result = await self._analyze_page(entry.url, entry.depth, facts)
+            if result is None or result.status_code >= 500:
+                self.breaker.record_failure(host)
+            else:
+                self.breaker.record_success(host)
+            if result is None:
+                self.counters['errors'] += 1
+                facts['errors'] += 1
+                return None
+            self.counters['fetched'] += 1
+            # Un résultat partiel n'est pas mis en cache : la page sera ré-analysée au prochain run
+            if not result.incomplete:
+                self.cache.set(self._cache_key(entry.url), result)
+
+        facts['pages'] += 1
+        self.budget.add_page()
+        self.pages[entry.url] = result
+        self._index_fingerprint(entry.url, result)
+
+        # Analyse des liens internes si nécessaire
+        if entry.depth < self.settings.MAX_DEPTH:
+            self._enqueue_links(getattr(result, 'links', []), getattr(result, 'link_scores', {}),
+                                entry.depth + 1, entry.url)
+        return result
+
+    def _cache_key(self, url: str) -> str:
+        """Clé du résultat d'une page : les résultats d'un jeu réduit d'extracteurs sont mis à part"""
+        enabled = sorted(name for name in EXTRACTORS if name in self.settings.EXTRACTORS)
+        if len(enabled) == len(EXTRACTORS):
+            return url
+        return f"{url}#extractors={','.join(enabled)}"
+
+    def _enqueue_links(self, links: List[str], scores: Dict[str, float], depth: int, parent: str) -> None:
+        """Ajoute à la frontière les liens internes non encore vus, les plus prometteurs d'abord"""
+        new_links = [link for link in links if link not in self.analyzed_urls]
+        logger.debug("%d new links to analyze from %s", len(new_links), parent)
+
+        # Tri par score décroissant, puis alphabétique pour garder une analyse reproductible
+        links_to_process = sorted(new_links, key=lambda link: (-scores.get(link, 0.0), link))
+        for link in links_to_process[:self.settings.MAX_LINKS_PER_LEVEL]:
+            self.analyzed_urls.add(link)
+            self.children.setdefault(parent, []).append(link)
+            self.frontier.push(link, depth, parent, scores.get(link, 0.0))
+
+    async def _analyze_page(self,
+                            url: str,
+                            depth: int,
+                            facts: Dict[str, Any]) -> Optional[AnalysisResult]:
+        """Analyse d'une page avec tous les extracteurs"""
+        try:
+            logger.debug("Analyzing %s at depth %d", url, depth)
+
+            transport = await self.session_manager.get_transport()
+            response = await transport.request('GET', url, max_bytes=self.settings.MAX_PAGE_BYTES or None)
+            html = response.text
+            facts['bytes'] += len(html)
+            self.budget.add_bytes(len(html))
+            soup = BeautifulSoup(html, 'html.parser')
+            host = urlparse(url).netloc
+            # Gabarit du site retiré le temps de l'extraction : chaque bloc n'est analysé qu'une fois
+            detached = self._detach_templates(soup) if self.settings.DETECT_TEMPLATES else []
+            new_blocks = {digest: PageBuffers(element) for _, digest, element, _, _ in detached
+                          if self.templates.get(host, digest) is None}
+            # Une seule passe sur le DOM, partagée par l'empreinte et les extracteurs
+            buffers = PageBuffers(soup)
+            # SimHash ne dépend que des mots : texte de la page puis texte de ses blocs de gabarit
+            page_fingerprint = fingerprint(html, SEPARATOR.join(
+                [buffers.text] + [new_blocks[digest].text if digest in new_blocks else
+                                  self.templates.get(host, digest).text for _, digest, _, _, _ in detached]
+            ))
+
+            # Page identique déjà analysée : ses résultats de contenu sont réutilisés
+            memo = self.pages.get(self.content_hashes.get(page_fingerprint.content_hash, ''))
+            duplicate = None
+            previous = self.baseline.get(url) if self.baseline else None
+            unchanged = (previous is not None and
+                         getattr(previous, 'content_hash', '') == page_fingerprint.content_hash and
+                         not (getattr(previous, 'duplicate', None) or {}).get('skipped') and
+                         not getattr(previous, 'incomplete', None))
+            if unchanged:
+                # Page inchangée depuis le scan précédent
+                self.counters['unchanged'] += 1
+                memo = previous
+            elif memo is not None:
+                duplicate = {'url': memo.url, 'kind': 'exact', 'distance': 0, 'skipped': False}
+            elif near := self.near_duplicates.find(page_fingerprint.simhash):
+                duplicate = {'url': near[0], 'kind': 'near', 'distance': near[1],
+                             'skipped': self.settings.SKIP_NEAR_DUPLICATES}
+                if duplicate['skipped']:
+                    # Page quasi identique : ni extraction ni exploration des liens
+                    logger.debug("Skipping near-duplicate %s of %s", url, near[0])
+                    self.counters['collapsed'] += 1
+                    return self._collapsed_result(url, response.status, page_fingerprint, duplicate)
+
+            # Création des instances d'extracteurs
+            extractors = [EXTRACTORS[name](soup, url, buffers, transport)
+                          for name in EXTRACTORS if name in self.settings.EXTRACTORS]
+            if memo is not None:
+                extractors = [e for e in extractors if not e.depends_on_content]
+
+            if unchanged:
+                # Page inchangée : seuls les extracteurs d'hôte et de chemins sont relancés,
+                # une fois par hôte et par préfixe d'URL
+                page_results = self._probe_host(host, soup, url, buffers, transport)
+            else:
+                page_results = asyncio.gather(*[self._run_extractor(extractor, host) for extractor in extractors])
+
+            # Exécution parallèle des extracteurs, chacun avec son propre délai,
+            # et des extracteurs de contenu sur les blocs de gabarit encore inconnus
+            results, *block_results = await asyncio.gather(
+                page_results,
+                *[self._extract_block(element, new_blocks[digest], url, host, transport)
+                  for _, digest, element, _, _ in detached if digest in new_blocks]
+            )
+            self._reattach_templates(detached)
+
+            # Traitement des résultats
+            combined_results = self._content_results(memo) if memo is not None else {}
+            incomplete = {}
+            self._combine(results, combined_results, incomplete)
+            new_detached = [block for block in detached if block[1] in new_blocks]
+            for (kind, digest, _, _, _), (findings, failed) in zip(new_detached, block_results):
+                if failed:
+                    # Bloc incomplet : il sera de nouveau analysé sur la page suivante
+                    incomplete.update(failed)
+                elif self.templates.get(host, digest) is None:
+                    self.templates.add(TemplateBlock(host, digest, kind, url, new_blocks[digest].text, findings))
+                    self.cache.set(f"template:{host}:{digest}", self.templates.get(host, digest))
+            template_blocks = [digest for _, digest, _, _, _ in detached]
+            if memo is None:
+                # Résultats de contenu de la page complétés par ceux de ses blocs de gabarit
+                for digest in template_blocks:
+                    if (block := self.templates.get(host, digest)) is not None:
+                        merge_findings(combined_results, block.findings, located=block.url == url)
+                if 'technologies' in combined_results:
+                    combined_results['technologies'] = sorted(combined_results['technologies'])
+            self._register_templates(host, url, template_blocks)
+
+            if unchanged:
+                # Résultats du scan précédent ; hôte et fichiers sensibles mis à jour
+                return replace(
+                    previous,
                     status_code=response.status,
                     analyzed_at=datetime.now().isoformat(),
-                    content=combined_results.get('content', {}),
-                    security=combined_results.get('security_info', {}),
-                    social=combined_results.get('social_media', {}),
-                    domain=combined_results.get('domain_info', {}),
-                    emails=combined_results.get('emails', []),
-                    phones=combined_results.get('phones', []),
-                    technologies=combined_results.get('technologies', []),
-                    sensitive_files=combined_results.get('sensitive_files', []),
-                    internal_links=internal_links
+                    security=combined_results.get('security_info', previous.security),
+                    domain=combined_results.get('domain_info', previous.domain),
+                    sensitive_files=combined_results.get('sensitive_files', previous.sensitive_files),
+                    internal_links={},
+                    duplicate=None,
+                    incomplete=incomplete,
+                    template_blocks=template_blocks
                 )
 
-                self.cache.set(url, analysis_result)
-                return analysis_result
-
-        except aiohttp.ClientError as e:
-
-            print(f"Network error analyzing {url}: {str(e)}")
+            found_links = self._get_internal_links(soup, url)
+            logger.debug("Found %d internal links on %s", len(found_links), url)
+
+            # Construction du résultat de la page (les sous-pages sont rattachées plus tard)
+            return AnalysisResult(
+                url=url,
+                status_code=response.status,
+                analyzed_at=datetime.now().isoformat(),
+                content=combined_results.get('content', {}),
+                security=combined_results.get('security_info', {}),
+                social=combined_results.get('social_media', {}),
+                domain=combined_results.get('domain_info', {}),
+                emails=combined_results.get('emails', []),
+                phones=combined_results.get('phones', []),
+                technologies=combined_results.get('technologies', []),
+                sensitive_files=combined_results.get('sensitive_files', []),
+                internal_links={},
+                links=sorted(found_links),
+                link_scores=found_links,
+                asset_urls=collect_asset_urls(soup, url),
+                document_urls=collect_document_urls(soup, url),
+                content_hash=page_fingerprint.content_hash,
+                simhash=page_fingerprint.simhash,
+                duplicate=duplicate,
+                incomplete=incomplete,
+                template_blocks=template_blocks
+            )
+
+        except TransportError as e:
+
+            logger.warning("Network error analyzing %s: %s", url, e)
 
             return None
 
-        except Exception as e:
+        except Exception:
 
-            print(f"Error analyzing {url}: {str(e)}")
+            logger.exception("Error analyzing %s", url)
 
             return None
 
-    def _get_internal_links(self, soup: BeautifulSoup, base_url: str) -> Set[str]:
-        """Extrait les liens internes de la page"""
-        internal_links = set()
+    async def _run_extractor(self, extractor, host: str) -> Tuple[str, Any]:
+        """(nom, résultat) d'un extracteur ; le résultat est la raison de l'échec s'il n'a pas abouti"""
+        name = type(extractor).__name__
+        # Un extracteur qui expire sans cesse sur un hôte est coupé, comme l'hôte lui-même
+        key = f"{host}/{name}"
+        if not self.breaker.allow(key):
+            return name, 'circuit open'
+        try:
+            result = await asyncio.wait_for(extractor.extract(),
+                                            extractor.timeout or self.settings.EXTRACTOR_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Extractor %s timed out on %s", name, extractor.url)
+            self.breaker.record_failure(key)
+            return name, 'timeout'
+        except Exception:
+            logger.exception("Extractor %s failed on %s", name, extractor.url)
+            self.breaker.release(key)
+            return name, 'error'
+        self.breaker.record_success(key)
+        return name, result
+
+    async def _probe_host(self,
+                          host: str,
+                          soup: BeautifulSoup,
+                          url: str,
+                          buffers: PageBuffers,
+                          transport: Transport) -> List[Tuple[str, Any]]:
+        """Résultats des extracteurs d'hôte et de chemins, obtenus sur la première page inchangée
+        de l'hôte et de chaque préfixe d'URL (les chemins sondés sont relatifs à l'URL de la page)"""
+        host_results, path_results = await asyncio.gather(
+            self._probe(host, HOST_EXTRACTORS, host, soup, url, buffers, transport),
+            self._probe(url.rstrip('/'), PATH_EXTRACTORS, host, soup, url, buffers, transport))
+        return host_results + path_results
+
+    async def _probe(self,
+                     key: str,
+                     names: Tuple[str, ...],
+                     host: str,
+                     soup: BeautifulSoup,
+                     url: str,
+                     buffers: PageBuffers,
+                     transport: Transport) -> List[Tuple[str, Any]]:
+        """Résultats des extracteurs names, calculés une seule fois pour key"""
+        async with self._probe_locks.setdefault(key, asyncio.Lock()):
+            if key not in self.host_probes:
+                extractors = [EXTRACTORS[name](soup, url, buffers, transport)
+                              for name in names if name in self.settings.EXTRACTORS]
+                self.host_probes[key] = list(await asyncio.gather(
+                    *[self._run_extractor(extractor, host) for extractor in extractors]))
+        return self.host_probes[key]
+
+    async def _extract_block(self,
+                             element: Tag,
+                             buffers: PageBuffers,
+                             url: str,
+                             host: str,
+                             transport: Transport) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """(résultats, extracteurs en échec) des extracteurs de contenu sur un bloc de gabarit"""
+        extractors = [EXTRACTORS[name](element, url, buffers, transport) for name in EXTRACTORS
+                      if name in self.settings.EXTRACTORS and EXTRACTORS[name].depends_on_content]
+        findings: Dict[str, Any] = {}
+        failed: Dict[str, str] = {}
+        self._combine(await asyncio.gather(*[self._run_extractor(e, host) for e in extractors]),
+                      findings, failed)
+        return findings, failed
+
+    @staticmethod
+    def _combine(results: List[Tuple[str, Any]], combined: Dict[str, Any], incomplete: Dict[str, str]) -> None:
+        for name, result in results:
+            if isinstance(result, str):
+                incomplete[name] = result
+            elif isinstance(result, dict):
+                combined.update(result)
+
+    @staticmethod
+    def _detach_templates(soup: BeautifulSoup) -> List[Tuple[str, str, Tag, Tag, int]]:
+        """Retire du DOM les blocs de gabarit : (type, empreinte, élément, parent, position) de chacun"""
+        detached = []
+        for kind, element in find_blocks(soup):
+            parent = element.parent
+            position = parent.index(element)
+            detached.append((kind, block_hash(element), element.extract(), parent, position))
+        return detached
+
+    @staticmethod
+    def _reattach_templates(detached: List[Tuple[str, str, Tag, Tag, int]]) -> None:
+        """Remet les blocs en place : liens, assets et documents sont relevés sur la page entière"""
+        for _, _, element, parent, position in reversed(detached):
+            parent.insert(position, element)
+
+    def _register_templates(self, host: str, url: str, digests: List[str]) -> None:
+        """Compte la page pour chacun de ses blocs de gabarit (repris du cache si besoin)"""
+        for digest in digests:
+            block = self.templates.get(host, digest)
+            if block is None and (cached := self.cache.get(f"template:{host}:{digest}")):
+                block = replace(cached, pages=set())
+                self.templates.add(block)
+            if block is not None:
+                block.pages.add(url)
+
+    def _index_fingerprint(self, url: str, result: AnalysisResult) -> None:
+        """Enregistre les empreintes d'une page analysée (hors pages écartées)"""
+        content_hash = getattr(result, 'content_hash', '')
+        if not content_hash or getattr(result, 'duplicate', None):
+            return
+        self.content_hashes.setdefault(content_hash, url)
+        self.near_duplicates.add(result.simhash, url)
+
+    @staticmethod
+    def _content_results(result: AnalysisResult) -> Dict[str, Any]:
+        """Résultats des extracteurs de contenu d'une page déjà analysée"""
+        return {
+            'content': result.content,
+            'social_media': result.social,
+            'emails': result.emails,
+            'phones': result.phones,
+            'technologies': result.technologies
+        }
+
+    @staticmethod
+    def _collapsed_result(url: str,
+                          status_code: int,
+                          page_fingerprint: PageFingerprint,
+                          duplicate: Dict[str, Any]) -> AnalysisResult:
+        return AnalysisResult(
+            url=url,
+            status_code=status_code,
+            analyzed_at=datetime.now().isoformat(),
+            content={},
+            security={},
+            social={},
+            domain={},
+            emails=[],
+            phones=[],
+            technologies=[],
+            sensitive_files=[],
+            internal_links={},
+            content_hash=page_fingerprint.content_hash,
+            simhash=page_fingerprint.simhash,
+            duplicate=duplicate
+        )
+
+    def _get_internal_links(self, soup: BeautifulSoup, base_url: str) -> Dict[str, float]:
+        """Extrait les liens internes de la page avec leur score d'intérêt"""
+        internal_links: Dict[str, float] = {}
         base_domain = urlparse(base_url).netloc.replace('www.', '')  # Supprime le www pour la comparaison
 
-        print(f"Base domain: {base_domain}")  # Debug
-
-        for a in soup.find_all('a', href=True):
+        anchors = soup.find_all('a', href=True)
+        for index, a in enumerate(anchors):
             href = a['href'].strip()
 
             # Ignorer les liens vides ou spéciaux
@@ -150,53 +743,26 @@ class SiteAnalyzer:
                 # Normaliser le domaine pour la comparaison (enlever le www si présent)
                 url_domain = parsed_url.netloc.replace('www.', '')
 
-                # Vérifier que c'est un lien HTTP(S) et interne
-                if (parsed_url.scheme in ('http', 'https') and
-                        url_domain == base_domain and
-                        full_url not in internal_links):  # Éviter les doublons
-                    print(f"Found internal link: {full_url}")  # Debug
-                    internal_links.add(full_url)
+                # Vérifier que c'est un lien HTTP(S) et interne ; les documents sont lus par DocumentScanner
+                if (parsed_url.scheme in ('http', 'https') and url_domain == base_domain and
+                        not parsed_url.path.lower().endswith(DOCUMENT_EXTENSIONS)):
+                    # Un lien présent plusieurs fois garde son meilleur score
+                    score = self.scorer.score(full_url, a, index / len(anchors))
+                    internal_links[full_url] = max(score, internal_links.get(full_url, score))
             except Exception as e:
-                print(f"Error processing URL {href}: {str(e)}")
+                logger.debug("Error processing URL %s: %s", href, e)
                 continue
 
-        print(f"Total internal links found: {len(internal_links)}")  # Debug
         return internal_links
 
-    async def _analyze_internal_links(self,
-                                      links: Set[str],
-                                      depth: int) -> Dict[str, Any]:
-        """Analyse récursive des liens internes"""
-        print(f"Analyzing {len(links)} links at depth {depth}")
-
-        if depth > self.settings.MAX_DEPTH:
-            return {}
-
-        # Filtrer les liens déjà analysés
-        new_links = [link for link in links if link not in self.analyzed_urls]
-        print(f"New links to analyze: {len(new_links)}")  # Debug
-
-        # Trier les liens pour assurer une cohérence dans l'analyse
-        links_to_process = sorted(new_links)[:self.settings.MAX_LINKS_PER_LEVEL]
-        print(f"Links selected for processing: {len(links_to_process)}")  # Debug
-
-        if not links_to_process:
-            return {}
-
-        tasks = []
-        for link in links_to_process:
-            if link not in self.analyzed_urls:
-                tasks.append(self.analyze(link, depth))
-
-        results = []
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Construire le dictionnaire des résultats
-        analyzed_links = {}
-        for link, result in zip(links_to_process, results):
-            if not isinstance(result, Exception) and result is not None:
-                analyzed_links[link] = result
-                print(f"Successfully analyzed: {link}")  # Debug
-
-        return analyzed_links
\ No newline at end of file
+    def _build_tree(self, url: str) -> Optional[AnalysisResult]:
+        """Reconstruit l'arborescence des résultats à partir des pages analysées"""
+        result = self.pages.get(url)
+        if result is None or url not in self.children:
+            return result
+
+        internal_links = {}
+        for link in sorted(self.children[url]):
+            if (child := self._build_tree(link)) is not None:
+                internal_links[link] = child
+        return replace(result, internal_links=internal_links)
@@ -0,0 +1,183 @@
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urljoin, urlparse
+import asyncio
+import logging
+import re
+from bs4 import BeautifulSoup
+from email_validator import validate_email
+
+from config.settings import Settings
+from core.breaker import CircuitBreaker
+from core.session import SessionManager
+from core.transport import TransportError, TransportResponse
+from core.cache import RhinoCache
+from extractors import ContentExtractor, EmailExtractor, TechnologyExtractor
+
+logger = logging.getLogger(__name__)
+
+SECRET_PATTERNS = {
+    'google_api_key': r'AIza[0-9A-Za-z_-]{35}',
+    'aws_access_key_id': r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b',
+    'stripe_live_key': r'\b(?:sk|pk|rk)_live_[0-9A-Za-z]{24,}\b',
+    'slack_token': r'\bxox[abprs]-[0-9A-Za-z-]{10,}\b',
+    'github_token': r'\bgh[pousr]_[0-9A-Za-z]{36}\b',
+    'sentry_dsn': r'https://[0-9a-f]{32}@[a-z0-9.-]+/\d+',
+    'jwt': r'\beyJ[0-9A-Za-z_-]{10,}\.eyJ[0-9A-Za-z_-]{10,}\.[0-9A-Za-z_-]{10,}',
+    'private_key': r'-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----',
+}
+
+# Faux positifs fréquents du pattern email dans les bundles (ex. logo@2x.png)
+ASSET_FILE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.js', '.css')
+
+
+def collect_asset_urls(soup: BeautifulSoup, page_url: str) -> List[str]:
+    """URLs des scripts externes et feuilles de style référencés par la page"""
+    assets = set()
+    for tag in soup.find_all('script', src=True):
+        assets.add(urljoin(page_url, tag['src'].strip()).split('#')[0])
+    for tag in soup.find_all('link', href=True):
+        rel = tag.get('rel') or []
+        if 'stylesheet' in [r.lower() for r in rel]:
+            assets.add(urljoin(page_url, tag['href'].strip()).split('#')[0])
+    return sorted(a for a in assets if urlparse(a).scheme in ('http', 'https'))
+
+
+async def guarded_fetch(session_manager: SessionManager,
+                        breaker: CircuitBreaker,
+                        url: str,
+                        **options: Any) -> TransportResponse:
+    """Requête soumise au disjoncteur de l'hôte, comme les pages : refusée tant que l'hôte est coupé"""
+    host = urlparse(url).netloc
+    if not breaker.allow(host):
+        raise TransportError('circuit open')
+    try:
+        response = await session_manager.fetch(url, **options)
+    except TransportError:
+        breaker.record_failure(host)
+        raise
+    if response.status >= 500:
+        breaker.record_failure(host)
+    else:
+        breaker.record_success(host)
+    return response
+
+
+class AssetScanner:
+    """Télécharge une seule fois par crawl chaque script et feuille de style référencé.
+
+    Les requêtes passent par le disjoncteur du crawl : un hôte coupé n'est pas sollicité.
+    """
+
+    # Attributs des pages : URLs référencées et résultats rattachés
+    references_attribute = 'asset_urls'
+    results_attribute = 'assets'
+    label = 'assets'
+
+    def __init__(self,
+                 session_manager: SessionManager,
+                 cache: RhinoCache,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.session_manager = session_manager
+        self.cache = cache
+        self.breaker = breaker or CircuitBreaker.from_settings()
+        self.settings = Settings.get_instance()
+        self.findings: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def third_party(self) -> bool:
+        return self.settings.SCAN_THIRD_PARTY_ASSETS
+
+    def _in_scope(self, asset_url: str, page_urls: Set[str]) -> bool:
+        if self.third_party:
+            return True
+        asset_domain = urlparse(asset_url).netloc.replace('www.', '')
+        return any(urlparse(page).netloc.replace('www.', '') == asset_domain for page in page_urls)
+
+    async def scan(self, pages: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Analyse les assets de toutes les pages et rattache les résultats à chaque page"""
+        references: Dict[str, Set[str]] = {}
+        for url, page in pages.items():
+            for asset_url in getattr(page, self.references_attribute, []):
+                references.setdefault(asset_url, set()).add(url)
+
+        to_scan = sorted(a for a, refs in references.items()
+                         if a not in self.findings and self._in_scope(a, refs))
+        logger.info("Scanning %d unique %s referenced by %d pages", len(to_scan), self.label, len(pages))
+
+        semaphore = asyncio.Semaphore(max(1, self.session_manager.concurrency.ceiling))
+
+        async def bounded(asset_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._scan_asset(asset_url)
+
+        results = await asyncio.gather(*[bounded(a) for a in to_scan], return_exceptions=True)
+
+        for asset_url, result in zip(to_scan, results):
+            if isinstance(result, Exception):
+                logger.warning("Scan error for %s: %s", asset_url, result)
+                continue
+            self.findings[asset_url] = result
+
+        # Chaque résultat est rattaché à toutes les pages qui référencent l'asset
+        for asset_url, result in self.findings.items():
+            result['pages'] = sorted(references.get(asset_url, set()) | set(result.get('pages', [])))
+        for url, page in pages.items():
+            setattr(page, self.results_attribute,
+                    [self.findings[a] for a in getattr(page, self.references_attribute, []) if a in self.findings])
+        return self.findings
+
+    async def _scan_asset(self, asset_url: str) -> Dict[str, Any]:
+        cache_key = f"asset:{asset_url}"
+        if cached := self.cache.get(cache_key):
+            return dict(cached)
+
+        result: Dict[str, Any] = {'url': asset_url, 'status': None, 'size': 0, 'truncated': False}
+        try:
+            body = await self._fetch(asset_url, result)
+            result.update(self._analyze(body))
+        except TransportError as e:
+            result['error'] = str(e) or type(e).__name__
+            return result
+
+        self.cache.set(cache_key, result)
+        return result
+
+    async def _fetch(self, asset_url: str, result: Dict[str, Any]) -> str:
+        """Lit le corps de l'asset sans dépasser MAX_ASSET_BYTES"""
+        response = await guarded_fetch(self.session_manager, self.breaker, asset_url,
+                                       max_bytes=self.settings.MAX_ASSET_BYTES)
+        result['status'] = response.status
+        if response.status != 200:
+            return ''
+        if response.truncated:
+            result['truncated'] = True
+        result['size'] = len(response.body)
+        return response.text
+
+    @staticmethod
+    def _analyze(body: str) -> Dict[str, Any]:
+        lowered = body.lower()
+        technologies = sorted({name for pattern, name in TechnologyExtractor.TECH_PATTERNS.items()
+                               if pattern in lowered})
+
+        emails = set()
+        for candidate in set(re.findall(EmailExtractor.EMAIL_PATTERN, body)):
+            if candidate.lower().endswith(ASSET_FILE_SUFFIXES):
+                continue
+            try:
+                emails.add(validate_email(candidate, check_deliverability=False).email)
+            except Exception:
+                continue
+
+        secrets = [
+            {'type': name, 'value': value}
+            for name, pattern in SECRET_PATTERNS.items()
+            for value in sorted(set(re.findall(pattern, body)))
+        ]
+
+        return {
+            'technologies': technologies,
+            'emails': sorted(emails),
+            'analytics_ids': sorted(set(re.findall(ContentExtractor.ANALYTICS_PATTERN, body))),
+            'secrets': secrets
+        }
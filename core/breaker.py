@@ -0,0 +1,96 @@
+from typing import Dict, Optional
+from dataclasses import dataclass
+import time
+import logging
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trips: int = 0
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """Disjoncteur par clé (hôte, ou hôte et extracteur).
+
+    Après failure_threshold échecs consécutifs, la clé est refusée pendant cool_down
+    secondes, puis une seule requête d'essai est autorisée. Au bout de max_trips
+    ouvertures, la clé est abandonnée pour le reste du crawl (0 = jamais).
+    """
+
+    def __init__(self, failure_threshold: int = 5, cool_down: float = 60, max_trips: int = 3):
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.max_trips = max_trips
+        self._circuits: Dict[str, _Circuit] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'CircuitBreaker':
+        settings = Settings.get_instance()
+        return cls(
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            cool_down=settings.BREAKER_COOL_DOWN,
+            max_trips=settings.BREAKER_MAX_TRIPS
+        )
+
+    def allow(self, key: str) -> bool:
+        """Indique si une requête peut être émise pour cette clé"""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return True
+        if self.abandoned(key) or circuit.probing:
+            return False
+        if time.monotonic() - circuit.opened_at < self.cool_down:
+            return False
+        # Fin du refroidissement : une seule requête d'essai à la fois
+        circuit.probing = True
+        return True
+
+    def retry_after(self, key: str) -> Optional[float]:
+        """Secondes avant le prochain essai, ou None si la clé est abandonnée"""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return 0.0
+        if self.abandoned(key):
+            return None
+        if circuit.probing:
+            return 1.0
+        return max(0.0, self.cool_down - (time.monotonic() - circuit.opened_at))
+
+    def abandoned(self, key: str) -> bool:
+        circuit = self._circuits.get(key)
+        return bool(circuit and self.max_trips and circuit.trips >= self.max_trips)
+
+    def record_success(self, key: str) -> None:
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.probing = False
+
+    def release(self, key: str) -> None:
+        """Libère la requête d'essai sans résultat (ex. page servie par le cache)"""
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            circuit.probing = False
+
+    def record_failure(self, key: str) -> None:
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        if circuit.probing or circuit.failures >= self.failure_threshold:
+            if circuit.opened_at is None or circuit.probing:
+                circuit.trips += 1
+                logger.warning("Circuit open for %s after %d failures", key, circuit.failures)
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
+
+    def open_keys(self) -> Dict[str, int]:
+        """Clés actuellement refusées, avec leur nombre d'échecs consécutifs"""
+        return {key: circuit.failures for key, circuit in self._circuits.items()
+                if circuit.opened_at is not None}
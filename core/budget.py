@@ -0,0 +1,70 @@
+from typing import Any, Dict, Optional
+import time
+
+from config.settings import Settings
+
+
+class CrawlBudget:
+    """Limites d'un crawl : durée, nombre de pages et volume, au total et par hôte (0 = illimité)"""
+
+    def __init__(self,
+                 max_pages: int = 0,
+                 max_bytes: int = 0,
+                 time_limit: float = 0,
+                 max_pages_per_host: int = 0,
+                 max_bytes_per_host: int = 0):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.time_limit = time_limit
+        self.max_pages_per_host = max_pages_per_host
+        self.max_bytes_per_host = max_bytes_per_host
+        self.pages = 0
+        self.bytes = 0
+        self._started: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> 'CrawlBudget':
+        settings = Settings.get_instance()
+        return cls(
+            max_pages=settings.CRAWL_MAX_PAGES,
+            max_bytes=settings.CRAWL_MAX_BYTES,
+            time_limit=settings.CRAWL_TIME_LIMIT,
+            max_pages_per_host=settings.CRAWL_MAX_PAGES_PER_HOST,
+            max_bytes_per_host=settings.CRAWL_MAX_BYTES_PER_HOST
+        )
+
+    def start(self) -> None:
+        if self._started is None:
+            self._started = time.monotonic()
+
+    def time_left(self) -> Optional[float]:
+        if not self.time_limit or self._started is None:
+            return None
+        return max(0.0, self.time_limit - (time.monotonic() - self._started))
+
+    def exhausted(self, in_progress: int = 0) -> Optional[str]:
+        """Raison de l'arrêt du crawl, ou None s'il reste du budget.
+
+        in_progress : pages en cours d'analyse, comptées d'avance dans la limite de pages
+        """
+        if self.time_limit and self.time_left() == 0:
+            return 'time limit'
+        if self.max_pages and self.pages + in_progress >= self.max_pages:
+            return 'page limit'
+        if self.max_bytes and self.bytes >= self.max_bytes:
+            return 'byte limit'
+        return None
+
+    def host_allowed(self, facts: Dict[str, Any]) -> bool:
+        """Indique si l'hôte (voir SiteAnalyzer.host_facts) peut encore être sollicité"""
+        if self.max_pages_per_host and facts.get('pages', 0) >= self.max_pages_per_host:
+            return False
+        if self.max_bytes_per_host and facts.get('bytes', 0) >= self.max_bytes_per_host:
+            return False
+        return True
+
+    def add_page(self) -> None:
+        self.pages += 1
+
+    def add_bytes(self, size: int) -> None:
+        self.bytes += size
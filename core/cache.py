@@ -2,11 +2,18 @@ from typing import Any, Optional
 from datetime import datetime, timedelta
 from diskcache import Cache
 import hashlib
+import logging
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
 
 class RhinoCache:
-    def __init__(self, cache_dir: str = './rhinocache', expiration_days: int = 7):
-        self.cache = Cache(cache_dir)
-        self.expiration = timedelta(days=expiration_days)
+    def __init__(self, cache_dir: Optional[str] = None, expiration_days: Optional[int] = None):
+        settings = Settings.get_instance()
+        self.cache = Cache(cache_dir or settings.CACHE_DIR)
+        self.expiration = timedelta(days=settings.CACHE_DURATION if expiration_days is None else expiration_days)
 
     def _generate_key(self, url: str) -> str:
         """Génère une clé de cache unique pour l'URL"""
@@ -21,7 +28,7 @@ class RhinoCache:
                 if datetime.now() - datetime.fromisoformat(cached_data['timestamp']) < self.expiration:
                     return cached_data['data']
         except Exception as e:
-            print(f"Cache retrieval error: {str(e)}")
+            logger.warning("Cache retrieval error: %s", e)
         return None
 
     def set(self, url: str, data: Any) -> None:
@@ -34,11 +41,15 @@ class RhinoCache:
             }
             self.cache.set(key, cache_data, expire=int(self.expiration.total_seconds()))
         except Exception as e:
-            print(f"Cache storage error: {str(e)}")
+            logger.warning("Cache storage error: %s", e)
+
+    def close(self) -> None:
+        """Ferme la base du cache"""
+        self.cache.close()
 
     def clear(self) -> None:
         """Vide le cache"""
         try:
             self.cache.clear()
         except Exception as e:
-            print(f"Cache clear error: {str(e)}")
\ No newline at end of file
+            logger.warning("Cache clear error: %s", e)
\ No newline at end of file
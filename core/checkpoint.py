@@ -0,0 +1,63 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+import os
+import logging
+import pickle
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class CrawlCheckpoint:
+    """Sauvegarde périodique et atomique de l'état d'un crawl"""
+
+    def __init__(self, path: str, interval: int = 30, every_pages: int = 20):
+        self.path = path
+        self.interval = interval
+        self.every_pages = every_pages
+        self._last_save = time.monotonic()
+        self._pages_at_last_save = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def due(self, pages_done: int) -> bool:
+        """Indique si un nouveau checkpoint doit être écrit"""
+        return (pages_done - self._pages_at_last_save >= self.every_pages or
+                time.monotonic() - self._last_save >= self.interval)
+
+    def save(self, state: Dict[str, Any], pages_done: int = 0) -> None:
+        """Écrit l'état dans un fichier temporaire puis le renomme (atomique)"""
+        state = dict(state, version=CHECKPOINT_VERSION, saved_at=datetime.now().isoformat())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.rhinockpt-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Checkpoint write error: %s", e)
+            return
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self._last_save = time.monotonic()
+        self._pages_at_last_save = pages_done
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Charge le dernier checkpoint écrit"""
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            logger.warning("Checkpoint read error: %s", e)
+            return None
+        if state.get('version') != CHECKPOINT_VERSION:
+            logger.warning("Unsupported checkpoint version in %s", self.path)
+            return None
+        return state
@@ -0,0 +1,179 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, FrozenSet, Optional
+import asyncio
+import logging
+import time
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Issue d'une requête, vue par le contrôleur ; LATENCY signale une latence en hausse
+OK, TIMEOUT, THROTTLED, ERROR, LATENCY = 'ok', 'timeout', 'throttled', 'error', 'latency'
+# Réponses observées avant de juger la latence
+WARMUP_SAMPLES = 10
+
+
+class AdaptiveLimiter:
+    """Limite de requêtes simultanées ajustée en AIMD.
+
+    La limite croît d'environ 1 par fenêtre de requêtes réussies tant que la latence reste
+    stable, et est divisée par deux sur les signaux de surcharge (au plus une fois par aller-retour).
+    """
+
+    def __init__(self,
+                 name: str,
+                 initial: int,
+                 minimum: int = 1,
+                 maximum: int = 32,
+                 latency_tolerance: float = 2.0,
+                 signals: FrozenSet[str] = frozenset({TIMEOUT, THROTTLED, LATENCY}),
+                 adaptive: bool = True):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.latency_tolerance = latency_tolerance
+        self.signals = signals
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # moyenne glissante rapide
+        self.baseline: Optional[float] = None  # latence de référence (moyenne lente)
+        self.samples = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # La place venait d'être attribuée : elle est rendue
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, outcome: str) -> None:
+        # La limite n'augmente que si elle a réellement été atteinte
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if self.adaptive:
+            self._update(latency, outcome, saturated)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _update(self, latency: float, outcome: str, saturated: bool) -> None:
+        if outcome in self.signals:
+            self._decrease(outcome)
+            return
+        if outcome != OK:
+            return
+        self.samples += 1
+        self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+        self.baseline = latency if self.baseline is None else 0.95 * self.baseline + 0.05 * latency
+        if (LATENCY in self.signals and self.samples > WARMUP_SAMPLES and
+                self.latency > self.baseline * self.latency_tolerance):
+            self._decrease(LATENCY)
+        elif saturated:
+            self._set_limit(self.limit + 1.0 / self.limit)
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        # Les requêtes déjà en vol subissent la même surcharge : une seule réduction par aller-retour
+        if now - self._last_decrease < (self.latency or 1.0):
+            return
+        self._last_decrease = now
+        self._set_limit(self.limit / 2, reason)
+
+    def _set_limit(self, limit: float, reason: str = '') -> None:
+        previous = int(self.limit)
+        self.limit = min(max(limit, self.minimum), self.maximum)
+        if int(self.limit) != previous:
+            # Les hausses sont routinières, seules les baisses (surcharge) sont signalées
+            logger.log(logging.INFO if reason else logging.DEBUG, "Concurrency for %s: %d -> %d%s",
+                       self.name, previous, int(self.limit), f" ({reason})" if reason else "")
+
+
+class ConcurrencyController:
+    """Limites adaptatives par hôte et pour l'ensemble du crawl"""
+
+    def __init__(self,
+                 initial: int = 3,
+                 maximum: int = 32,
+                 host_maximum: int = 8,
+                 latency_tolerance: float = 2.0,
+                 adaptive: bool = True):
+        self.initial = initial
+        self.host_maximum = host_maximum if adaptive else initial
+        self.latency_tolerance = latency_tolerance
+        self.adaptive = adaptive
+        # Globalement seuls les timeouts comptent : 429, 5xx et latence sont propres à un hôte
+        self.overall = AdaptiveLimiter('all hosts', initial, maximum=maximum if adaptive else initial,
+                                       latency_tolerance=latency_tolerance,
+                                       signals=frozenset({TIMEOUT}), adaptive=adaptive)
+        self.hosts: Dict[str, AdaptiveLimiter] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'ConcurrencyController':
+        settings = Settings.get_instance()
+        return cls(
+            initial=settings.CONCURRENT_REQUESTS,
+            maximum=settings.CONCURRENCY_MAX,
+            host_maximum=settings.HOST_CONCURRENCY_MAX,
+            latency_tolerance=settings.LATENCY_TOLERANCE,
+            adaptive=settings.ADAPTIVE_CONCURRENCY
+        )
+
+    @property
+    def ceiling(self) -> int:
+        """Nombre maximal de requêtes simultanées, tous hôtes confondus"""
+        return self.overall.maximum
+
+    def host(self, host: str) -> AdaptiveLimiter:
+        if host not in self.hosts:
+            self.hosts[host] = AdaptiveLimiter(host, self.initial, maximum=self.host_maximum,
+                                               latency_tolerance=self.latency_tolerance,
+                                               adaptive=self.adaptive)
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[Dict[str, str]]:
+        """Réserve une place pour une requête ; l'appelant renseigne outcome['result']"""
+        limiters = [self.host(host), self.overall]
+        acquired = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire()
+                acquired.append(limiter)
+        except asyncio.CancelledError:
+            for limiter in acquired:
+                limiter.release(0.0, ERROR)
+            raise
+        outcome = {'result': ERROR}
+        started = time.monotonic()
+        try:
+            yield outcome
+        finally:
+            latency = time.monotonic() - started
+            for limiter in acquired:
+                limiter.release(latency, outcome['result'])
+
+    def limits(self) -> Dict[str, int]:
+        """Limites courantes, pour l'instrumentation"""
+        limits = {'all hosts': int(self.overall.limit)}
+        limits.update({host: int(limiter.limit) for host, limiter in sorted(self.hosts.items())})
+        return limits
@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from bisect import bisect
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+
+from config.settings import Settings
+from core.analyzer import SiteAnalyzer, AnalysisResult
+from core.session import SessionManager
+from core.cache import RhinoCache
+from utils.log import setup_logging
+
+logger = logging.getLogger(__name__)
+
+VIRTUAL_NODES = 64
+# Délai d'attente des résultats avant de vérifier que les workers sont toujours en vie
+WORKER_POLL_INTERVAL = 2.0
+
+
+class HashRing:
+    """Hachage cohérent des hôtes vers les workers"""
+
+    def __init__(self, nodes: int, replicas: int = VIRTUAL_NODES):
+        self._ring: List[Tuple[int, int]] = sorted(
+            (self._hash(f"worker-{node}:{i}"), node)
+            for node in range(nodes)
+            for i in range(replicas)
+        )
+        self._keys = [key for key, _ in self._ring]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+    def node_for(self, host: str) -> int:
+        index = bisect(self._keys, self._hash(host)) % len(self._ring)
+        return self._ring[index][1]
+
+
+def _take_host_group(worker_id: int, shards: List[Any]) -> Optional[Tuple[str, List[str]]]:
+    """Prend un groupe d'hôte dans sa propre file, sinon en vole un aux autres workers.
+
+    Chaque file se termine par une sentinelle None, toujours remise en place après lecture :
+    une file épuisée répond immédiatement None à tous les workers, qui passent à la suivante.
+    """
+    order = [worker_id] + [i for i in range(len(shards)) if i != worker_id]
+    for index in order:
+        group = shards[index].get()
+        if group is None:
+            shards[index].put(None)
+            continue
+        if index != worker_id:
+            logger.info("Worker %d stole %s from worker %d", worker_id, group[0], index)
+        return group
+    return None
+
+
+async def _run_worker(worker_id: int, shards: List[Any], results: Any) -> None:
+    session_manager = SessionManager()
+    cache = RhinoCache()
+    try:
+        while (group := _take_host_group(worker_id, shards)) is not None:
+            host, seeds = group
+            results.put(('claim', worker_id, group))
+            # Un hôte n'appartient qu'à un seul worker : la politesse par hôte est conservée
+            analyzer = SiteAnalyzer(session_manager, cache)
+            for seed in seeds:
+                try:
+                    result = await analyzer.analyze(seed, depth=0)
+                except Exception:
+                    logger.exception("Worker %d error on %s", worker_id, seed)
+                    result = None
+                results.put(('result', worker_id, (seed, result)))
+    finally:
+        await session_manager.close()
+
+
+def _worker_main(worker_id: int, shards: List[Any], results: Any, settings: Settings) -> None:
+    # Le processus est lancé en mode spawn : il reprend les réglages du coordinateur
+    Settings._instance = settings
+    setup_logging(settings.LOG_LEVEL, settings.LOG_FILE or None)
+    try:
+        asyncio.run(_run_worker(worker_id, shards, results))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        results.put(('done', worker_id, None))
+
+
+class CrawlCoordinator:
+    """Répartit les hôtes cibles entre plusieurs processus et fusionne leurs résultats"""
+
+    def __init__(self, workers: int = 0):
+        self.settings = Settings.get_instance()
+        self.workers = workers or self.settings.WORKER_PROCESSES or os.cpu_count() or 1
+
+    def shard(self, seeds: List[str]) -> List[Dict[str, List[str]]]:
+        """Regroupe les URLs par hôte puis assigne chaque hôte à un worker"""
+        ring = HashRing(self.workers)
+        shards: List[Dict[str, List[str]]] = [{} for _ in range(self.workers)]
+        for seed in seeds:
+            host = urlparse(seed).netloc.lower()
+            shards[ring.node_for(host)].setdefault(host, []).append(seed)
+        return shards
+
+    def run(self, seeds: List[str]) -> Dict[str, Optional[AnalysisResult]]:
+        ctx = multiprocessing.get_context('spawn')
+        assignment = self.shard(seeds)
+        shards = [ctx.Queue() for _ in range(self.workers)]
+        results = ctx.Queue()
+
+        for shard, groups in zip(shards, assignment):
+            for host, host_seeds in groups.items():
+                shard.put((host, host_seeds))
+            shard.put(None)
+
+        processes = [
+            ctx.Process(target=_worker_main, args=(i, shards, results, self.settings), daemon=True)
+            for i in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        logger.info("Started %d workers for %d targets", self.workers, len(seeds))
+
+        # Le coordinateur est le seul à écrire dans le stockage fusionné
+        merged: Dict[str, Optional[AnalysisResult]] = {}
+        claimed: Dict[int, List[str]] = {}
+        running = set(range(len(processes)))
+        try:
+            while running:
+                try:
+                    kind, worker_id, payload = results.get(timeout=WORKER_POLL_INTERVAL)
+                except queue.Empty:
+                    self._reap(processes, running, claimed, merged)
+                    continue
+                if kind == 'claim':
+                    claimed[worker_id] = list(payload[1])
+                elif kind == 'result':
+                    seed, result = payload
+                    merged[seed] = result
+                    if seed in claimed.get(worker_id, []):
+                        claimed[worker_id].remove(seed)
+                    logger.info("Completed %s (%d/%d)", seed, len(merged), len(seeds))
+                else:
+                    running.discard(worker_id)
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        missing = [seed for seed in seeds if seed not in merged]
+        if missing:
+            logger.error("%d targets were not analyzed: %s", len(missing), ', '.join(missing))
+        return {seed: merged.get(seed) for seed in seeds}
+
+    @staticmethod
+    def _reap(processes: List[Any], running: Set[int], claimed: Dict[int, List[str]],
+              merged: Dict[str, Optional[AnalysisResult]]) -> None:
+        """Workers morts sans sentinelle (OOM, SIGKILL) : leur hôte en cours est marqué en échec"""
+        for worker_id in list(running):
+            process = processes[worker_id]
+            if process.is_alive():
+                continue
+            running.discard(worker_id)
+            lost = claimed.pop(worker_id, [])
+            logger.error("Worker %d died (exit code %s), %d targets failed: %s",
+                         worker_id, process.exitcode, len(lost), ', '.join(lost) or '-')
+            for seed in lost:
+                merged[seed] = None
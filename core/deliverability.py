@@ -0,0 +1,90 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import dns.asyncresolver
+import dns.name
+import dns.resolver
+
+from config.settings import Settings
+from core.intel import DomainIntelStore
+
+logger = logging.getLogger(__name__)
+
+
+class DeliverabilityChecker:
+    """Vérifie que le domaine de chaque email trouvé accepte du courrier (MX, à défaut A/AAAA).
+
+    Une seule résolution par domaine, quel que soit le nombre d'adresses, mise en cache entre
+    les runs (DomainIntelStore, type 'mx') ; les requêtes DNS sont asynchrones et en nombre limité.
+    """
+
+    def __init__(self, store: Optional[DomainIntelStore] = None):
+        self.settings = Settings.get_instance()
+        self.store = store or DomainIntelStore.get_instance()
+        self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.lifetime = self.settings.DNS_TIMEOUT
+        self._semaphore = asyncio.Semaphore(max(1, self.settings.DNS_CONCURRENCY))
+
+    async def check(self, domains: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Résultat par domaine : deliverable vaut True, False, ou None si le DNS n'a pas répondu"""
+        domains = sorted({domain.lower() for domain in domains if domain})
+        results = await asyncio.gather(*[self._check_domain(domain) for domain in domains])
+        return dict(zip(domains, results))
+
+    async def annotate(self, pages: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Annote les emails de toutes les pages avec le résultat de leur domaine"""
+        emails: List[Dict[str, Any]] = [email for page in pages.values()
+                                        for email in page.emails or [] if email.get('domain')]
+        if not emails:
+            return {}
+        domains = {email['domain'].lower() for email in emails}
+        logger.info("Checking deliverability of %d emails across %d domains", len(emails), len(domains))
+
+        results = await self.check(domains)
+        for email in emails:
+            email.update(results[email['domain'].lower()])
+
+        undeliverable = sorted(domain for domain, result in results.items() if result['deliverable'] is False)
+        if undeliverable:
+            logger.info("Domains without mail exchanger: %s", ', '.join(undeliverable))
+        return results
+
+    async def _check_domain(self, domain: str) -> Dict[str, Any]:
+        ok, value = await self.store.lookup('mx', domain, lambda: self._resolve(domain))
+        if ok:
+            return value
+        # Échec DNS (délai, serveurs injoignables) : pas de conclusion sur le domaine
+        return {'deliverable': None, 'mx': [], 'reason': value}
+
+    async def _resolve(self, domain: str) -> Dict[str, Any]:
+        """Serveurs de courrier du domaine ; lève une exception si le DNS ne répond pas"""
+        try:
+            answer = await self._query(domain, 'MX')
+        except dns.resolver.NXDOMAIN:
+            return {'deliverable': False, 'mx': [], 'reason': 'domain does not exist'}
+        except dns.resolver.NoAnswer:
+            answer = None
+
+        if answer is not None:
+            exchanges: List[Tuple[int, str]] = sorted(
+                (record.preference, record.exchange.to_text(omit_final_dot=True))
+                for record in answer if record.exchange != dns.name.root
+            )
+            hosts = [host for _, host in exchanges]
+            if not hosts:
+                # MX nul (RFC 7505) : le domaine déclare ne recevoir aucun courrier
+                return {'deliverable': False, 'mx': [], 'reason': 'null MX'}
+            return {'deliverable': True, 'mx': hosts, 'reason': None}
+
+        # Sans MX, le courrier est remis à l'adresse du domaine lui-même (MX implicite)
+        for rdtype in ('A', 'AAAA'):
+            try:
+                await self._query(domain, rdtype)
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                continue
+            return {'deliverable': True, 'mx': [domain], 'reason': 'implicit MX'}
+        return {'deliverable': False, 'mx': [], 'reason': 'no MX or address records'}
+
+    async def _query(self, domain: str, rdtype: str) -> dns.resolver.Answer:
+        async with self._semaphore:
+            return await self.resolver.resolve(domain, rdtype, search=False)
@@ -0,0 +1,103 @@
+from typing import Any, Dict, Iterable, List, Set
+from datetime import datetime
+from urllib.parse import urlparse
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _entities(pages: Dict[str, Any], extract) -> Dict[str, Set[str]]:
+    """Associe chaque entité aux pages où elle apparaît"""
+    found: Dict[str, Set[str]] = {}
+    for url, page in pages.items():
+        for entity in extract(page):
+            found.setdefault(entity, set()).add(url)
+    return found
+
+
+def _entity_changes(previous: Dict[str, Set[str]], current: Dict[str, Set[str]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        'added': [{'value': value, 'pages': sorted(current[value])}
+                  for value in sorted(current.keys() - previous.keys())],
+        'removed': [{'value': value, 'pages': sorted(previous[value])}
+                    for value in sorted(previous.keys() - current.keys())]
+    }
+
+
+def _by_host(pages: Dict[str, Any], section: str) -> Dict[str, Dict[str, Any]]:
+    """Dernière valeur connue d'une information de sécurité, par hôte"""
+    values = {}
+    for url, page in pages.items():
+        value = (page.security or {}).get(section)
+        if isinstance(value, dict) and 'error' not in value:
+            values[urlparse(url).netloc] = value
+    return values
+
+
+def _host_changes(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    changes = []
+    for host in sorted(previous.keys() & current.keys()):
+        old, new = previous[host], current[host]
+        for name in sorted(set(old) | set(new)):
+            if old.get(name) != new.get(name):
+                changes.append({'host': host, 'name': name,
+                                'before': old.get(name), 'after': new.get(name)})
+    return changes
+
+
+def _emails(page) -> Iterable[str]:
+    return (email['email'] for email in page.emails or [] if email.get('email'))
+
+
+def _phones(page) -> Iterable[str]:
+    return page.phones or []
+
+
+def _technologies(page) -> Iterable[str]:
+    return page.technologies or []
+
+
+def _sensitive_files(page) -> Iterable[str]:
+    return (f"{item.get('url', '')} ({item.get('status', '')})" for item in page.sensitive_files or [])
+
+
+def compute_changes(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensemble des changements entre deux scans (dictionnaires url -> AnalysisResult)"""
+    changed_pages = sorted(
+        url for url in previous.keys() & current.keys()
+        if getattr(previous[url], 'content_hash', '') != getattr(current[url], 'content_hash', '')
+    )
+    changes = {
+        'pages': {
+            'added': sorted(current.keys() - previous.keys()),
+            'removed': sorted(previous.keys() - current.keys()),
+            'changed': changed_pages
+        },
+        'emails': _entity_changes(_entities(previous, _emails), _entities(current, _emails)),
+        'phones': _entity_changes(_entities(previous, _phones), _entities(current, _phones)),
+        'technologies': _entity_changes(_entities(previous, _technologies), _entities(current, _technologies)),
+        'sensitive_files': _entity_changes(_entities(previous, _sensitive_files),
+                                           _entities(current, _sensitive_files)),
+        'headers': _host_changes(_by_host(previous, 'headers'), _by_host(current, 'headers')),
+        'certificates': _host_changes(_by_host(previous, 'ssl'), _by_host(current, 'ssl'))
+    }
+    changes['total'] = (
+        sum(len(changes['pages'][k]) for k in ('added', 'removed', 'changed')) +
+        sum(len(changes[k]['added']) + len(changes[k]['removed'])
+            for k in ('emails', 'phones', 'technologies', 'sensitive_files')) +
+        len(changes['headers']) + len(changes['certificates'])
+    )
+    return changes
+
+
+def save_changes(changes: Dict[str, Any], url: str) -> str:
+    """Sauvegarde l'ensemble des changements au format JSON"""
+    filename = f"rhinoscraper_changes_{urlparse(url).netloc}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(changes, f, indent=2, default=str)
+        return filename
+    except Exception as e:
+        logger.error("Error saving changes: %s", e)
+        return None
@@ -0,0 +1,256 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+import logging
+import re
+from bs4 import BeautifulSoup
+
+from core.assets import AssetScanner, guarded_fetch
+from core.breaker import CircuitBreaker
+from core.metadata import (
+    OOXML_PARTS,
+    ZIP_LOCAL_HEADER,
+    detect_type,
+    parse_jpeg,
+    parse_ooxml_properties,
+    parse_pdf_info,
+    parse_png,
+    parse_tiff,
+    pdf_object,
+    pdf_object_from_stream,
+    pdf_reference,
+    pdf_startxref,
+    pdf_xref_stream,
+    pdf_xref_table,
+    zip_central_directory,
+    zip_entries,
+    zip_member
+)
+from core.session import SessionManager
+from core.transport import TransportError
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_EXTENSIONS = ('.pdf', '.docx', '.docm', '.xlsx', '.xlsm', '.pptx', '.pptm',
+                       '.jpg', '.jpeg', '.png', '.tif', '.tiff')
+IMAGE_PARSERS = {'jpeg': parse_jpeg, 'png': parse_png, 'tiff': parse_tiff}
+# Sections /Prev suivies dans un PDF modifié par mises à jour incrémentales
+MAX_PDF_SECTIONS = 8
+
+
+def collect_document_urls(soup: BeautifulSoup, page_url: str) -> List[str]:
+    """URLs des documents (PDF, bureautique, images) liés ou affichés par la page"""
+    documents = set()
+    for tag, attribute in (('a', 'href'), ('img', 'src')):
+        for element in soup.find_all(tag, **{attribute: True}):
+            url = urljoin(page_url, element[attribute].strip()).split('#')[0]
+            parsed = urlparse(url)
+            if parsed.scheme in ('http', 'https') and parsed.path.lower().endswith(DOCUMENT_EXTENSIONS):
+                documents.add(url)
+    return sorted(documents)
+
+
+class DocumentError(Exception):
+    """Document illisible : statut HTTP inattendu ou octets hors de portée"""
+
+
+class RangeReader:
+    """Lecture partielle d'un document distant par requêtes Range.
+
+    Si le serveur ignore les plages (réponse 200), le corps est lu une seule fois,
+    plafonné à max_bytes, et sert aux lectures suivantes.
+    """
+
+    def __init__(self,
+                 session_manager: SessionManager,
+                 url: str,
+                 max_bytes: int,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.session_manager = session_manager
+        self.breaker = breaker or CircuitBreaker.from_settings()
+        self.url = url
+        self.max_bytes = max_bytes
+        self.size: Optional[int] = None
+        self.status: Optional[int] = None
+        self.body: Optional[bytes] = None
+        self.truncated = False
+        self.requests = 0
+
+    @property
+    def ranged(self) -> bool:
+        return self.body is None
+
+    async def read(self, start: int, length: int) -> bytes:
+        """length octets à partir de start ; start négatif : les -start derniers octets"""
+        if self.body is None:
+            if start >= 0 and self.size is not None:
+                length = min(length, self.size - start)
+                if length <= 0:
+                    return b''
+            self.requests += 1
+            response = await guarded_fetch(
+                self.session_manager,
+                self.breaker,
+                self.url,
+                max_bytes=self.max_bytes,
+                # Les plages portent sur le contenu encodé : pas de compression
+                headers={'Range': f"bytes={start}-{start + length - 1}" if start >= 0 else f"bytes={start}",
+                         'Accept-Encoding': 'identity'}
+            )
+            self.status = response.status
+            if response.status == 206:
+                total = re.search(r'/(\d+)\s*$', response.headers.get('Content-Range', ''))
+                if total:
+                    self.size = int(total.group(1))
+                return response.body[:length]
+            if response.status == 416:
+                return b''
+            if response.status != 200:
+                raise DocumentError(f"HTTP {response.status}")
+            self.body = response.body
+            self.truncated = response.truncated
+            if not response.truncated:
+                self.size = len(response.body)
+        if start < 0:
+            if self.truncated:
+                raise DocumentError(f"end of document beyond {self.max_bytes} bytes")
+            return self.body[start:]
+        return self.body[start:start + length]
+
+
+class DocumentScanner(AssetScanner):
+    """Métadonnées des documents liés (auteur, logiciel, dates, EXIF/GPS), une fois par crawl.
+
+    Seuls les octets utiles sont téléchargés : en-tête des images, fin du fichier et
+    dictionnaire Info des PDF, répertoire central et docProps des documents OOXML.
+    """
+
+    references_attribute = 'document_urls'
+    results_attribute = 'documents'
+    label = 'documents'
+
+    @property
+    def third_party(self) -> bool:
+        return self.settings.SCAN_THIRD_PARTY_DOCUMENTS
+
+    async def _scan_asset(self, document_url: str) -> Dict[str, Any]:
+        cache_key = f"document:{document_url}"
+        if cached := self.cache.get(cache_key):
+            return dict(cached)
+
+        reader = RangeReader(self.session_manager, document_url, self.settings.MAX_DOCUMENT_BYTES, self.breaker)
+        result: Dict[str, Any] = {'url': document_url, 'type': None, 'metadata': {}}
+        try:
+            head = await reader.read(0, self.settings.DOCUMENT_RANGE_BYTES)
+            result['type'] = detect_type(head)
+            if result['type'] in IMAGE_PARSERS:
+                result['metadata'] = IMAGE_PARSERS[result['type']](head)
+            elif result['type'] == 'pdf':
+                result['metadata'] = await self._pdf_metadata(reader, head)
+            elif result['type'] == 'ooxml':
+                result['metadata'] = await self._ooxml_metadata(reader)
+        except (TransportError, DocumentError) as e:
+            result['error'] = str(e) or type(e).__name__
+        result.update(status=reader.status, size=reader.size, requests=reader.requests,
+                      ranged=reader.ranged, truncated=reader.truncated)
+        if 'error' not in result:
+            self.cache.set(cache_key, result)
+        return result
+
+    async def _read_at(self, reader: RangeReader, offset: int, tail: bytes) -> bytes:
+        """Octets d'un objet PDF à partir de sa position, flux compris"""
+        tail_start = reader.size - len(tail) if reader.size is not None else None
+        if tail_start is not None and offset >= tail_start:
+            data = tail[offset - tail_start:]
+        else:
+            data = await reader.read(offset, self.settings.DOCUMENT_RANGE_BYTES)
+        if b'endobj' in data or not re.match(rb'\s*\d+\s+\d+\s+obj', data):
+            return data
+        # Flux plus long qu'une lecture : relu en entier d'après /Length
+        stream_at = data.find(b'stream')
+        length = re.search(rb'/Length\s+(\d+)(?!\s+\d+\s+R)', data[:stream_at]) if stream_at >= 0 else None
+        if length:
+            needed = stream_at + int(length.group(1)) + 32
+            data = await reader.read(offset, min(needed, self.settings.MAX_DOCUMENT_BYTES))
+        return data
+
+    async def _pdf_metadata(self, reader: RangeReader, head: bytes) -> Dict[str, Any]:
+        if reader.truncated:
+            # Serveur sans plages et fichier trop gros : seul un PDF linéarisé reste lisible (Info au début)
+            tail, head = b'', reader.body
+        else:
+            tail = await reader.read(-self.settings.DOCUMENT_RANGE_BYTES, self.settings.DOCUMENT_RANGE_BYTES)
+        if b'/Encrypt' in tail:
+            # Les chaînes du dictionnaire Info sont chiffrées
+            return {'encrypted': True}
+        # Un PDF linéarisé porte aussi son trailer au début du fichier
+        info = pdf_reference(tail, b'Info')
+        if info is None:
+            info = pdf_reference(head, b'Info')
+        if info is None:
+            return {}
+        for data in (tail, head):
+            if (found := pdf_object(data, info)) is not None and b'>>' in found:
+                return parse_pdf_info(found)
+        found = await self._pdf_locate(reader, tail, info)
+        return parse_pdf_info(found) if found else {}
+
+    async def _pdf_locate(self, reader: RangeReader, tail: bytes, number: int) -> Optional[bytes]:
+        """Objet PDF retrouvé via les tables (ou flux) de références croisées"""
+        offset = pdf_startxref(tail)
+        for _ in range(MAX_PDF_SECTIONS):
+            if offset is None:
+                return None
+            section = (await self._read_at(reader, offset, tail)).lstrip()
+            if section.startswith(b'xref'):
+                position, offset = pdf_xref_table(section, number)
+                if position is not None:
+                    return pdf_object(await self._read_at(reader, position, tail), number)
+                continue
+            entry, offset = pdf_xref_stream(section, number)
+            if entry is None:
+                continue
+            kind, location, index = entry
+            if kind == 1:
+                return pdf_object(await self._read_at(reader, location, tail), number)
+            if kind == 2:
+                # Objet compressé dans un flux d'objets, lui-même référencé par la table
+                object_stream = await self._pdf_locate(reader, tail, location)
+                return pdf_object_from_stream(object_stream, index) if object_stream else None
+            return None
+        return None
+
+    async def _ooxml_metadata(self, reader: RangeReader) -> Dict[str, Any]:
+        tail = await reader.read(-self.settings.DOCUMENT_RANGE_BYTES, self.settings.DOCUMENT_RANGE_BYTES)
+        location = zip_central_directory(tail)
+        if reader.size is None or location is None:
+            return {}
+        tail_start = reader.size - len(tail)
+        offset, size = location
+        if offset >= tail_start:
+            directory = tail[offset - tail_start:offset - tail_start + size]
+        else:
+            directory = await reader.read(offset, size)
+
+        entries = zip_entries(directory)
+        parts = [entries[part] for part in OOXML_PARTS
+                 if part in entries and entries[part]['compressed_size'] <= self.settings.MAX_DOCUMENT_BYTES]
+        # Marge pour le champ extra de l'en-tête local, absent du répertoire central
+        spans = [(entry['offset'], entry['offset'] + ZIP_LOCAL_HEADER.size + entry['name_length'] +
+                  entry['compressed_size'] + 1024) for entry in parts]
+        # Parties voisines (cas habituel) : une seule lecture
+        start, end = min((s for s, _ in spans), default=0), max((e for _, e in spans), default=0)
+        window = b''
+        if spans and start < tail_start and end - start <= self.settings.DOCUMENT_RANGE_BYTES:
+            window = await reader.read(start, end - start)
+
+        metadata: Dict[str, Any] = {}
+        for entry, (offset, stop) in zip(parts, spans):
+            if offset >= tail_start:
+                data = tail[offset - tail_start:]
+            elif window:
+                data = window[offset - start:]
+            else:
+                data = await reader.read(offset, stop - offset)
+            if (xml := zip_member(data, entry)) is not None:
+                metadata.update(parse_ooxml_properties(xml))
+        return metadata
@@ -0,0 +1,65 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from collections import Counter
+import hashlib
+import re
+
+SIMHASH_BITS = 64
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class PageFingerprint(NamedTuple):
+    content_hash: str
+    simhash: int
+
+
+def simhash(text: str) -> int:
+    """SimHash 64 bits des mots du texte, pondérés par leur fréquence"""
+    weights = [0] * SIMHASH_BITS
+    for word, count in Counter(WORD_PATTERN.findall(text.lower())).items():
+        h = int.from_bytes(hashlib.md5(word.encode()).digest()[:8], 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def fingerprint(html: str, text: str) -> PageFingerprint:
+    return PageFingerprint(
+        content_hash=hashlib.sha256(html.encode('utf-8', 'replace')).hexdigest(),
+        simhash=simhash(text)
+    )
+
+
+class DuplicateIndex:
+    """Index des SimHash pour retrouver les pages quasi identiques.
+
+    Le hash est découpé en max_distance + 1 bandes : deux hash à moins de
+    max_distance bits d'écart partagent forcément au moins une bande.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._width = SIMHASH_BITS // self._bands
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(self._bands)]
+
+    def _band_values(self, value: int) -> List[int]:
+        mask = (1 << self._width) - 1
+        return [(value >> (i * self._width)) & mask for i in range(self._bands)]
+
+    def add(self, value: int, url: str) -> None:
+        for bucket, band in zip(self._buckets, self._band_values(value)):
+            bucket.setdefault(band, []).append((value, url))
+
+    def find(self, value: int) -> Optional[Tuple[str, int]]:
+        """Retourne (url, distance) de la page la plus proche sous le seuil"""
+        best = None
+        for bucket, band in zip(self._buckets, self._band_values(value)):
+            for candidate, url in bucket.get(band, []):
+                distance = hamming_distance(value, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (url, distance)
+        return best
@@ -0,0 +1,89 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+
+
+class FrontierEntry(NamedTuple):
+    url: str
+    depth: int
+    parent: Optional[str]
+    score: float = 0.0
+
+
+class Frontier:
+    """File de priorité des URLs à analyser, partagée entre les workers du crawl.
+
+    Les entrées sortent par score décroissant, puis par profondeur croissante
+    et enfin dans l'ordre d'ajout.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[float, int, int, FrontierEntry]] = []
+        self._in_flight: Dict[str, FrontierEntry] = {}
+        self._deferred: List[FrontierEntry] = []
+        self._held: Dict[int, FrontierEntry] = {}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def push(self, url: str, depth: int, parent: Optional[str] = None, score: float = 0.0) -> None:
+        entry = FrontierEntry(url, depth, parent, score)
+        heapq.heappush(self._pending, (-score, depth, next(self._counter), entry))
+        self._changed.set()
+
+    async def get(self) -> Optional[FrontierEntry]:
+        """Retourne la prochaine entrée, ou None quand le crawl est terminé"""
+        while True:
+            if self._pending:
+                entry = heapq.heappop(self._pending)[-1]
+                self._in_flight[entry.url] = entry
+                return entry
+            if not self._in_flight and not self._held:
+                # Réveille les autres workers pour qu'ils constatent la fin
+                self._changed.set()
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    def task_done(self, entry: FrontierEntry) -> None:
+        self._in_flight.pop(entry.url, None)
+        self._changed.set()
+
+    def requeue(self, entry: FrontierEntry) -> None:
+        """Remet une entrée en attente sans l'avoir traitée (budget épuisé)"""
+        self._in_flight.pop(entry.url, None)
+        self.push(*entry)
+
+    def defer(self, entry: FrontierEntry) -> None:
+        """Met de côté une entrée hors budget ; elle reste dans les checkpoints"""
+        self._in_flight.pop(entry.url, None)
+        self._deferred.append(entry)
+        self._changed.set()
+
+    def hold(self, entry: FrontierEntry, delay: float) -> None:
+        """Remet une entrée en attente après un délai (hôte temporairement coupé)"""
+        self._in_flight.pop(entry.url, None)
+        key = next(self._counter)
+        self._held[key] = entry
+        asyncio.get_running_loop().call_later(delay, self._release, key)
+
+    def _release(self, key: int) -> None:
+        if (entry := self._held.pop(key, None)) is not None:
+            self.push(*entry)
+
+    @property
+    def deferred(self) -> int:
+        return len(self._deferred)
+
+    def snapshot(self) -> List[FrontierEntry]:
+        """Entrées restantes, en incluant celles en cours (elles seront refaites)"""
+        pending = [item[-1] for item in sorted(self._pending)]
+        return (list(self._in_flight.values()) + pending +
+                list(self._held.values()) + list(self._deferred))
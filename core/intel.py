@@ -0,0 +1,122 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import ipaddress
+import json
+import sqlite3
+import time
+
+from config.settings import Settings
+from core.session import RateLimiter
+
+# Suffixes publics à deux niveaux les plus courants (liste volontairement réduite)
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk', 'me.uk', 'net.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au', 'co.nz', 'org.nz', 'govt.nz',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'go.jp', 'co.kr', 'or.kr', 'co.in', 'net.in', 'org.in',
+    'com.br', 'net.br', 'org.br', 'gov.br', 'com.cn', 'net.cn', 'org.cn', 'gov.cn',
+    'com.mx', 'com.ar', 'com.tr', 'com.tw', 'com.hk', 'com.sg', 'com.my', 'co.za', 'org.za',
+    'co.il', 'co.id', 'or.id', 'com.ua', 'com.pl', 'com.es', 'gouv.fr', 'asso.fr', 'co.at', 'or.at',
+}
+
+
+def registrable_domain(hostname: str) -> str:
+    """Domaine enregistrable (eTLD+1) d'un nom d'hôte, ex. www.shop.example.co.uk -> example.co.uk"""
+    hostname = hostname.lower().strip('.')
+    try:
+        ipaddress.ip_address(hostname)
+        return hostname
+    except ValueError:
+        pass
+    labels = hostname.split('.')
+    if len(labels) <= 2:
+        return '.'.join(labels)
+    if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class DomainIntelStore:
+    """Stockage persistant des informations de domaine, avec une durée de validité par type.
+
+    - whois : par domaine enregistrable (eTLD+1)
+    - dns, tls : par nom d'hôte
+    - mx : par domaine d'adresse email
+    Les échecs sont aussi mémorisés (cache négatif) pour ne pas réinterroger un service en panne.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.settings = Settings.get_instance()
+        self.path = path or self.settings.INTEL_STORE
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS facts ('
+            'kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT, ok INTEGER NOT NULL, '
+            'fetched_at REAL NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (kind, key))'
+        )
+        self.conn.commit()
+        self.ttls = {
+            'whois': self.settings.WHOIS_TTL,
+            'dns': self.settings.DNS_TTL,
+            'tls': self.settings.TLS_TTL,
+            'mx': self.settings.MX_TTL,
+        }
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._whois_limiters: Dict[str, RateLimiter] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'DomainIntelStore':
+        """Retourne une instance singleton du stockage"""
+        if not hasattr(cls, '_instance'):
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, kind: str, key: str) -> Optional[Tuple[bool, Any]]:
+        """(succès, valeur) si l'information est encore valide, sinon None"""
+        row = self.conn.execute(
+            'SELECT value, ok FROM facts WHERE kind = ? AND key = ? AND expires_at > ?',
+            (kind, key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return bool(row[1]), json.loads(row[0])
+
+    def put(self, kind: str, key: str, value: Any, ok: bool = True) -> None:
+        ttl = self.ttls[kind] if ok else self.settings.NEGATIVE_TTL
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO facts (kind, key, value, ok, fetched_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (kind, key, json.dumps(value, default=str), int(ok), now, now + ttl)
+            )
+
+    async def lookup(self,
+                     kind: str,
+                     key: str,
+                     loader: Callable[[], Awaitable[Any]]) -> Tuple[bool, Any]:
+        """Retourne l'information en cache ou l'obtient via loader (une seule requête à la fois par clé)"""
+        if (fact := self.get(kind, key)) is not None:
+            return fact
+
+        lock = self._locks.setdefault((kind, key), asyncio.Lock())
+        async with lock:
+            # Une autre tâche a pu obtenir l'information pendant l'attente
+            if (fact := self.get(kind, key)) is not None:
+                return fact
+            if kind == 'whois':
+                await self._whois_limiter(key).acquire()
+            try:
+                value = await loader()
+            except Exception as e:
+                self.put(kind, key, str(e), ok=False)
+                return False, str(e)
+            self.put(kind, key, value)
+            return True, value
+
+    def _whois_limiter(self, domain: str) -> RateLimiter:
+        """Limiteur par serveur WHOIS ; les serveurs WHOIS sont propres à chaque TLD"""
+        server = domain.rsplit('.', 1)[-1]
+        if server not in self._whois_limiters:
+            self._whois_limiters[server] = RateLimiter(calls_per_second=self.settings.WHOIS_QUERIES_PER_SECOND)
+        return self._whois_limiters[server]
@@ -0,0 +1,507 @@
+"""Lecture des métadonnées de documents à partir de fragments d'octets.
+
+Fonctions pures, sans accès réseau : DocumentScanner (core/documents.py) décide quels
+octets télécharger et les passe à ces fonctions. Les données peuvent être tronquées,
+chaque parseur renvoie ce qu'il a pu lire.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+import re
+import struct
+import zlib
+
+# Sorties décompressées plafonnées (fichiers XML et flux PDF)
+MAX_INFLATED_BYTES = 1024 * 1024
+
+SIGNATURES = (
+    (b'%PDF-', 'pdf'),
+    (b'PK\x03\x04', 'ooxml'),
+    (b'\xff\xd8', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+)
+
+
+def detect_type(head: bytes) -> Optional[str]:
+    """Type de document d'après ses premiers octets"""
+    for signature, kind in SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    return None
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.replace('\x00', '').strip()
+        return value[:500] or None
+    return value
+
+
+def _compact(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in ((k, _clean(v)) for k, v in metadata.items())
+            if value not in (None, '', [])}
+
+
+# --- Images : EXIF (JPEG, TIFF) et chunks texte PNG ---
+
+EXIF_TAGS = {
+    0x010E: 'description',
+    0x010F: 'make',
+    0x0110: 'model',
+    0x0131: 'software',
+    0x0132: 'modified',
+    0x013B: 'author',
+    0x8298: 'copyright',
+    0x9003: 'created',
+    0xA430: 'owner',
+    0xA431: 'serial_number',
+    0xA434: 'lens',
+}
+EXIF_IFD, GPS_IFD = 0x8769, 0x8825
+# Taille en octets de chaque type de valeur TIFF
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+
+def _tiff_value(data: bytes, endian: str, kind: int, count: int, raw: bytes) -> Any:
+    size = TIFF_TYPE_SIZES.get(kind)
+    if size is None:
+        return None
+    if size * count > 4:
+        offset = struct.unpack(endian + 'I', raw)[0]
+        raw = data[offset:offset + size * count]
+        if len(raw) < size * count:
+            return None  # en dehors des octets lus
+    if kind == 2:
+        return raw[:count].split(b'\x00')[0].decode('utf-8', errors='replace')
+    if kind in (1, 7):
+        return raw[:count]
+    if kind in (5, 10):
+        fmt = endian + ('I' if kind == 5 else 'i') * 2
+        values = [struct.unpack(fmt, raw[i * 8:i * 8 + 8]) for i in range(count)]
+        return [num / den if den else 0.0 for num, den in values]
+    fmt = {3: 'H', 4: 'I', 9: 'i'}[kind]
+    return list(struct.unpack(endian + fmt * count, raw[:size * count]))
+
+
+def _tiff_ifd(data: bytes, endian: str, offset: int) -> Dict[int, Any]:
+    entries: Dict[int, Any] = {}
+    if offset + 2 > len(data):
+        return entries
+    count = struct.unpack(endian + 'H', data[offset:offset + 2])[0]
+    for i in range(count):
+        start = offset + 2 + i * 12
+        if start + 12 > len(data):
+            break
+        tag, kind, number = struct.unpack(endian + 'HHI', data[start:start + 8])
+        entries[tag] = _tiff_value(data, endian, kind, number, data[start + 8:start + 12])
+    return entries
+
+
+def _gps_coordinate(values: Any, ref: Any) -> Optional[float]:
+    if not isinstance(values, list) or len(values) != 3:
+        return None
+    degrees = values[0] + values[1] / 60 + values[2] / 3600
+    return round(-degrees if ref in ('S', 'W') else degrees, 6)
+
+
+def parse_tiff(data: bytes) -> Dict[str, Any]:
+    """Métadonnées EXIF d'une structure TIFF (fichier TIFF ou segment EXIF d'un JPEG)"""
+    if len(data) < 8 or data[:2] not in (b'II', b'MM'):
+        return {}
+    endian = '<' if data[:2] == b'II' else '>'
+    ifd0 = _tiff_ifd(data, endian, struct.unpack(endian + 'I', data[4:8])[0])
+    tags = dict(ifd0)
+    for pointer in (EXIF_IFD, GPS_IFD):
+        offset = ifd0.get(pointer)
+        if isinstance(offset, list) and offset:
+            entries = _tiff_ifd(data, endian, offset[0])
+            if pointer == GPS_IFD:
+                latitude = _gps_coordinate(entries.get(2), entries.get(1))
+                longitude = _gps_coordinate(entries.get(4), entries.get(3))
+                if latitude is not None and longitude is not None:
+                    tags['gps'] = f"{latitude:.6f}, {longitude:.6f}"
+            else:
+                tags.update(entries)
+    metadata = {name: tags.get(tag) for tag, name in EXIF_TAGS.items() if isinstance(tags.get(tag), str)}
+    metadata['gps'] = tags.get('gps')
+    return _compact(metadata)
+
+
+def parse_jpeg(data: bytes) -> Dict[str, Any]:
+    """Segments EXIF et commentaire d'un JPEG (seul l'en-tête est nécessaire)"""
+    metadata: Dict[str, Any] = {}
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        if marker in (0xD9, 0xDA):  # fin d'image, début des données compressées
+            break
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        segment = data[pos + 4:pos + 2 + length]
+        if marker == 0xE1 and segment.startswith(b'Exif\x00\x00'):
+            metadata.update(parse_tiff(segment[6:]))
+        elif marker == 0xFE:
+            metadata.setdefault('comment', segment.decode('utf-8', errors='replace'))
+        pos += 2 + length
+    return _compact(metadata)
+
+
+PNG_KEYWORDS = {
+    'author': 'author',
+    'software': 'software',
+    'creation time': 'created',
+    'copyright': 'copyright',
+    'title': 'title',
+    'description': 'description',
+    'comment': 'comment',
+    'source': 'make',
+}
+
+
+def parse_png(data: bytes) -> Dict[str, Any]:
+    """Chunks texte (tEXt, zTXt, iTXt) et EXIF (eXIf) d'un PNG situés avant les données d'image"""
+    metadata: Dict[str, Any] = {}
+    pos = 8
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b'IDAT' or len(body) < length:
+            break
+        text = None
+        keyword = b''
+        try:
+            if kind == b'tEXt':
+                keyword, _, raw = body.partition(b'\x00')
+                text = raw.decode('latin-1')
+            elif kind == b'zTXt':
+                keyword, _, raw = body.partition(b'\x00')
+                text = zlib.decompressobj().decompress(raw[1:], MAX_INFLATED_BYTES).decode('latin-1')
+            elif kind == b'iTXt':
+                keyword, _, rest = body.partition(b'\x00')
+                compressed, rest = rest[0], rest[2:]
+                _, _, rest = rest.partition(b'\x00')  # langue
+                _, _, raw = rest.partition(b'\x00')  # mot-clé traduit
+                if compressed:
+                    raw = zlib.decompressobj().decompress(raw, MAX_INFLATED_BYTES)
+                text = raw.decode('utf-8', errors='replace')
+            elif kind == b'eXIf':
+                metadata.update(parse_tiff(body))
+        except (IndexError, zlib.error):
+            text = None
+        name = PNG_KEYWORDS.get(keyword.decode('latin-1').lower())
+        if text and name:
+            metadata.setdefault(name, text)
+        pos += 12 + length
+    return _compact(metadata)
+
+
+# --- PDF : trailer, table de références croisées et dictionnaire Info ---
+
+PDF_INFO_FIELDS = {
+    b'Title': 'title',
+    b'Author': 'author',
+    b'Subject': 'subject',
+    b'Keywords': 'keywords',
+    b'Creator': 'software',
+    b'Producer': 'producer',
+    b'CreationDate': 'created',
+    b'ModDate': 'modified',
+}
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+               b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def pdf_startxref(tail: bytes) -> Optional[int]:
+    """Position de la dernière table de références croisées"""
+    match = re.search(rb'startxref\s+(\d+)\s+%%EOF', tail[tail.rfind(b'startxref'):])
+    return int(match.group(1)) if match else None
+
+
+def pdf_reference(data: bytes, key: bytes) -> Optional[int]:
+    """Numéro d'objet d'une entrée « /Key N G R » (la dernière trouvée)"""
+    matches = re.findall(rb'/' + key + rb'\s+(\d+)\s+\d+\s+R', data)
+    return int(matches[-1]) if matches else None
+
+
+def _pdf_literal(data: bytes, pos: int) -> Tuple[bytes, int]:
+    """Chaîne littérale commençant après « ( » ; renvoie (octets, position après « ) »)"""
+    out, depth = bytearray(), 1
+    while pos < len(data):
+        char = data[pos:pos + 1]
+        if char == b'\\':
+            following = data[pos + 1:pos + 2]
+            if following in PDF_ESCAPES:
+                out += PDF_ESCAPES[following]
+                pos += 2
+            elif following.isdigit():
+                octal = re.match(rb'[0-7]{1,3}', data[pos + 1:pos + 4]).group(0)
+                out.append(int(octal, 8) & 0xFF)
+                pos += 1 + len(octal)
+            elif following in (b'\r', b'\n'):
+                # Fin de ligne échappée : continuation
+                pos += 2 + (data[pos + 1:pos + 3] == b'\r\n')
+            else:
+                out += following
+                pos += 2
+            continue
+        if char == b'(':
+            depth += 1
+        elif char == b')':
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+        out += char
+        pos += 1
+    return bytes(out), pos
+
+
+def _pdf_text(raw: bytes) -> str:
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', errors='replace')
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return raw[3:].decode('utf-8', errors='replace')
+    return raw.decode('latin-1')
+
+
+def _pdf_date(value: str) -> str:
+    """D:AAAAMMJJHHmmSS+HH'mm' -> AAAA-MM-JJTHH:mm:SS+HH:mm"""
+    match = re.match(r"D?:?(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?([Zz+-])?(\d{2})?'?(\d{2})?", value)
+    if not match:
+        return value
+    year, month, day, hour, minute, second, sign, tz_hour, tz_minute = match.groups()
+    date = f"{year}-{month or '01'}-{day or '01'}T{hour or '00'}:{minute or '00'}:{second or '00'}"
+    if sign in ('Z', 'z'):
+        date += 'Z'
+    elif sign and tz_hour:
+        date += f"{sign}{tz_hour}:{tz_minute or '00'}"
+    return date
+
+
+def parse_pdf_info(data: bytes) -> Dict[str, Any]:
+    """Champs d'un dictionnaire Info (chaînes littérales ou hexadécimales)"""
+    metadata: Dict[str, Any] = {}
+    for match in re.finditer(rb'/(' + b'|'.join(PDF_INFO_FIELDS) + rb')\s*([(<])', data):
+        key, opener, pos = match.group(1), match.group(2), match.end()
+        if opener == b'(':
+            raw, _ = _pdf_literal(data, pos)
+        else:
+            end = data.find(b'>', pos)
+            if end < 0:
+                continue
+            hex_digits = re.sub(rb'\s', b'', data[pos:end])
+            raw = bytes.fromhex((hex_digits + b'0' * (len(hex_digits) % 2)).decode('ascii', errors='ignore'))
+        name = PDF_INFO_FIELDS[key]
+        text = _pdf_text(raw)
+        metadata.setdefault(name, _pdf_date(text) if name in ('created', 'modified') else text)
+    return _compact(metadata)
+
+
+def pdf_object(data: bytes, number: int) -> Optional[bytes]:
+    """Contenu de l'objet « N G obj ... endobj » s'il figure dans les octets lus"""
+    match = None
+    for match in re.finditer(rb'(?<![0-9])%d\s+\d+\s+obj\b' % number, data):
+        pass  # la dernière définition prévaut (mises à jour incrémentales)
+    if match is None:
+        return None
+    end = data.find(b'endobj', match.end())
+    return data[match.end():end if end >= 0 else len(data)]
+
+
+def pdf_xref_table(data: bytes, number: int) -> Tuple[Optional[int], Optional[int]]:
+    """(position de l'objet, /Prev) d'après une table de références croisées classique"""
+    trailer_at = data.find(b'trailer')
+    tokens = data[4:trailer_at if trailer_at >= 0 else len(data)].split()
+    prev = re.search(rb'/Prev\s+(\d+)', data[trailer_at:]) if trailer_at >= 0 else None
+    offset = None
+    i = 0
+    while i + 1 < len(tokens):
+        try:
+            start, count = int(tokens[i]), int(tokens[i + 1])
+        except ValueError:
+            break
+        entry = i + 2 + (number - start) * 3
+        if start <= number < start + count and entry + 2 < len(tokens) and tokens[entry + 2] == b'n':
+            offset = int(tokens[entry])
+        i += 2 + count * 3
+    return offset, int(prev.group(1)) if prev else None
+
+
+def pdf_stream(data: bytes) -> Optional[bytes]:
+    """Flux d'un objet, décompressé (FlateDecode et prédicteurs PNG)"""
+    start = data.find(b'stream')
+    if start < 0:
+        return None
+    dictionary = data[:start]
+    start += 6
+    start += 2 if data[start:start + 2] == b'\r\n' else 1
+    length = re.search(rb'/Length\s+(\d+)(?!\s+\d+\s+R)', dictionary)
+    end = start + int(length.group(1)) if length else data.find(b'endstream', start)
+    raw = data[start:end]
+    if b'/FlateDecode' in dictionary:
+        try:
+            raw = zlib.decompressobj().decompress(raw, MAX_INFLATED_BYTES)
+        except zlib.error:
+            return None
+    predictor = re.search(rb'/Predictor\s+(\d+)', dictionary)
+    if predictor and int(predictor.group(1)) >= 10:
+        columns = re.search(rb'/Columns\s+(\d+)', dictionary)
+        raw = _png_unfilter(raw, int(columns.group(1)) if columns else 1)
+    return raw
+
+
+def _png_unfilter(raw: bytes, columns: int) -> bytes:
+    """Filtres PNG par ligne (None, Sub, Up) utilisés par les flux de références croisées"""
+    rows, previous = [], bytearray(columns)
+    for start in range(0, len(raw) - columns, columns + 1):
+        kind, row = raw[start], bytearray(raw[start + 1:start + 1 + columns])
+        for i in range(len(row)):
+            if kind == 1 and i:
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + previous[i]) & 0xFF
+        rows.append(bytes(row))
+        previous = row
+    return b''.join(rows)
+
+
+def pdf_xref_stream(data: bytes, number: int) -> Tuple[Optional[Tuple[int, int, int]], Optional[int]]:
+    """(entrée de l'objet, /Prev) d'après un flux de références croisées (PDF 1.5+).
+
+    L'entrée est (type, champ 2, champ 3) : type 1 = (1, position, génération),
+    type 2 = (2, numéro du flux d'objets, index dans ce flux).
+    """
+    prev = re.search(rb'/Prev\s+(\d+)', data[:data.find(b'stream')])
+    prev_offset = int(prev.group(1)) if prev else None
+    widths = re.search(rb'/W\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s*\]', data)
+    stream = pdf_stream(data)
+    if not widths or stream is None:
+        return None, prev_offset
+    widths = [int(w) for w in widths.groups()]
+    index = re.search(rb'/Index\s*\[([\d\s]+)\]', data)
+    size = re.search(rb'/Size\s+(\d+)', data)
+    ranges = [int(n) for n in index.group(1).split()] if index else [0, int(size.group(1)) if size else 0]
+    row_size, position = sum(widths), 0
+    for start, count in zip(ranges[::2], ranges[1::2]):
+        if start <= number < start + count:
+            row = stream[position + (number - start) * row_size:position + (number - start + 1) * row_size]
+            if len(row) < row_size:
+                return None, prev_offset
+            fields, cursor = [], 0
+            for width in widths:
+                fields.append(int.from_bytes(row[cursor:cursor + width], 'big') if width else None)
+                cursor += width
+            kind = 1 if fields[0] is None else fields[0]
+            return (kind, fields[1] or 0, fields[2] or 0), prev_offset
+        position += count * row_size
+    return None, prev_offset
+
+
+def pdf_object_from_stream(data: bytes, index: int) -> Optional[bytes]:
+    """Objet numéro index d'un flux d'objets (/Type /ObjStm)"""
+    first = re.search(rb'/First\s+(\d+)', data)
+    stream = pdf_stream(data)
+    if not first or stream is None:
+        return None
+    first = int(first.group(1))
+    header = [int(n) for n in stream[:first].split()]
+    offsets = header[1::2]
+    if index >= len(offsets):
+        return None
+    end = first + offsets[index + 1] if index + 1 < len(offsets) else len(stream)
+    return stream[first + offsets[index]:end]
+
+
+# --- OOXML (docx, xlsx, pptx) : répertoire central de l'archive ZIP et docProps ---
+
+OOXML_PARTS = ('docProps/core.xml', 'docProps/app.xml')
+OOXML_FIELDS = {
+    'creator': 'author',
+    'lastModifiedBy': 'last_modified_by',
+    'created': 'created',
+    'modified': 'modified',
+    'title': 'title',
+    'subject': 'subject',
+    'keywords': 'keywords',
+    'revision': 'revision',
+    'lastPrinted': 'printed',
+    'Application': 'software',
+    'AppVersion': 'software_version',
+    'Company': 'company',
+    'Manager': 'manager',
+    'Template': 'template',
+    'TotalTime': 'editing_minutes',
+}
+ZIP_EOCD = struct.Struct('<4s4H2LH')
+ZIP_CENTRAL_ENTRY = struct.Struct('<4s6H3L5H2L')
+ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+def zip_central_directory(tail: bytes) -> Optional[Tuple[int, int]]:
+    """(position, taille) du répertoire central d'après la fin de l'archive"""
+    pos = tail.rfind(b'PK\x05\x06')
+    if pos < 0 or pos + ZIP_EOCD.size > len(tail):
+        return None
+    fields = ZIP_EOCD.unpack(tail[pos:pos + ZIP_EOCD.size])
+    size, offset = fields[5], fields[6]
+    if offset == 0xFFFFFFFF:
+        return None  # ZIP64, inutile pour des documents bureautiques
+    return offset, size
+
+
+def zip_entries(directory: bytes) -> Dict[str, Dict[str, int]]:
+    """Entrées du répertoire central : nom -> méthode, tailles, position de l'en-tête local"""
+    entries, pos = {}, 0
+    while pos + ZIP_CENTRAL_ENTRY.size <= len(directory):
+        fields = ZIP_CENTRAL_ENTRY.unpack(directory[pos:pos + ZIP_CENTRAL_ENTRY.size])
+        if fields[0] != b'PK\x01\x02':
+            break
+        name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+        name = directory[pos + ZIP_CENTRAL_ENTRY.size:pos + ZIP_CENTRAL_ENTRY.size + name_length]
+        entries[name.decode('utf-8', errors='replace')] = {
+            'method': fields[4],
+            'compressed_size': fields[8],
+            'offset': fields[16],
+            'name_length': name_length,
+        }
+        pos += ZIP_CENTRAL_ENTRY.size + name_length + extra_length + comment_length
+    return entries
+
+
+def zip_member(data: bytes, entry: Dict[str, int]) -> Optional[bytes]:
+    """Contenu d'un membre à partir des octets lus depuis son en-tête local"""
+    if len(data) < ZIP_LOCAL_HEADER.size:
+        return None
+    fields = ZIP_LOCAL_HEADER.unpack(data[:ZIP_LOCAL_HEADER.size])
+    if fields[0] != b'PK\x03\x04':
+        return None
+    start = ZIP_LOCAL_HEADER.size + fields[9] + fields[10]
+    raw = data[start:start + entry['compressed_size']]
+    if entry['method'] == 0:
+        return raw
+    if entry['method'] == 8:
+        try:
+            return zlib.decompressobj(-15).decompress(raw, MAX_INFLATED_BYTES)
+        except zlib.error:
+            return None
+    return None
+
+
+def parse_ooxml_properties(xml: bytes) -> Dict[str, Any]:
+    """Propriétés de docProps/core.xml ou docProps/app.xml"""
+    try:
+        root = ElementTree.fromstring(xml)
+    except ElementTree.ParseError:
+        return {}
+    metadata = {}
+    for element in root:
+        name = OOXML_FIELDS.get(element.tag.rsplit('}', 1)[-1])
+        if name and element.text:
+            metadata[name] = element.text
+    return _compact(metadata)
+
+
+def summarize(metadata: Dict[str, Any]) -> List[str]:
+    """Champs présentés en priorité dans le rapport"""
+    order = ('author', 'last_modified_by', 'company', 'software', 'producer', 'make', 'model',
+             'serial_number', 'gps', 'created', 'modified')
+    return [key for key in order if key in metadata] + sorted(k for k in metadata if k not in order)
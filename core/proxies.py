@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Set, Type
+from urllib.parse import urlparse
+import asyncio
+import logging
+import time
+
+from core.breaker import CircuitBreaker
+from core.concurrency import ConcurrencyController
+from core.session import RateLimiter
+from core.transport import Transport, TransportError, TransportResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProxyEndpoint:
+    """Un proxy du pool, avec sa propre connexion (transport) et son limiteur de débit"""
+    url: str
+    transport: Transport
+    limiter: Optional[RateLimiter] = None
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    latency: Optional[float] = None  # moyenne glissante
+
+    @property
+    def label(self) -> str:
+        """URL sans identifiants, pour l'affichage"""
+        parsed = urlparse(self.url)
+        return f"{parsed.scheme}://{parsed.hostname}:{parsed.port}"
+
+
+class ProxyPool:
+    """Choix du proxy de chaque requête selon sa santé et sa charge.
+
+    Un proxy en échec est écarté (CircuitBreaker) puis réessayé après PROXY_REPROBE_INTERVAL.
+    Avec sticky, un hôte garde le même proxy tant que celui-ci est sain.
+    """
+
+    def __init__(self, endpoints: List[ProxyEndpoint], sticky: bool = True,
+                 max_failures: int = 3, reprobe_interval: float = 60):
+        self.endpoints = endpoints
+        self.sticky = sticky
+        # Clés sans identifiants ; max_trips=0 : un proxy éjecté est toujours réessayé
+        self.health = CircuitBreaker(failure_threshold=max_failures, cool_down=reprobe_interval, max_trips=0)
+        self.assignments: Dict[str, ProxyEndpoint] = {}
+
+    def choose(self, host: str, tried: Set[str] = frozenset()) -> Optional[ProxyEndpoint]:
+        """Proxy à utiliser pour cet hôte, ou None si aucun n'est disponible pour l'instant.
+
+        tried : proxies déjà essayés pour cette requête
+        """
+        current = self.assignments.get(host) if self.sticky else None
+        if (current is not None and current.label not in tried and
+                self._available(current) and self.health.allow(current.label)):
+            return current
+
+        candidates = [endpoint for endpoint in self.endpoints
+                      if endpoint.label not in tried and self._available(endpoint)]
+        if not candidates:
+            return None
+        # Le moins chargé d'abord, puis le plus rapide
+        endpoint = min(candidates, key=lambda e: (e.in_flight, e.latency or 0.0))
+        self.health.allow(endpoint.label)  # un proxy qui sort d'éjection sert de requête d'essai
+        if self.sticky:
+            if current is not None and current is not endpoint:
+                logger.info("Moving %s from proxy %s to %s", host, current.label, endpoint.label)
+            self.assignments[host] = endpoint
+        return endpoint
+
+    def retry_after(self) -> float:
+        """Délai avant qu'un proxy redevienne disponible"""
+        delays = [self.health.retry_after(endpoint.label) for endpoint in self.endpoints]
+        return max(0.1, min(delay for delay in delays if delay is not None))
+
+    def record_success(self, endpoint: ProxyEndpoint, latency: float) -> None:
+        endpoint.latency = latency if endpoint.latency is None else 0.8 * endpoint.latency + 0.2 * latency
+        self.health.record_success(endpoint.label)
+
+    def record_failure(self, endpoint: ProxyEndpoint) -> None:
+        endpoint.failures += 1
+        self.health.record_failure(endpoint.label)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """État des proxies, pour l'instrumentation"""
+        return [{
+            'proxy': endpoint.label,
+            'requests': endpoint.requests,
+            'failures': endpoint.failures,
+            'latency': round(endpoint.latency, 3) if endpoint.latency is not None else None,
+            'healthy': self._available(endpoint),
+            'hosts': sum(1 for assigned in self.assignments.values() if assigned is endpoint)
+        } for endpoint in self.endpoints]
+
+    def _available(self, endpoint: ProxyEndpoint) -> bool:
+        return self.health.retry_after(endpoint.label) == 0.0
+
+
+class ProxyTransport(Transport):
+    """Transport qui répartit les requêtes sur un pool de proxies HTTP ou SOCKS"""
+
+    name = 'proxy'
+
+    def __init__(self,
+                 backend: Type[Transport],
+                 proxies: List[str],
+                 concurrency: Optional[ConcurrencyController] = None):
+        super().__init__(concurrency)
+        rate = self.settings.PROXY_REQUESTS_PER_SECOND
+        # Les limites par hôte restent communes : elles protègent la cible, quel que soit le proxy
+        self.pool = ProxyPool(
+            [ProxyEndpoint(url, backend(self.concurrency, proxy=url),
+                           RateLimiter(calls_per_second=rate) if rate else None)
+             for url in proxies],
+            sticky=self.settings.PROXY_STICKY_HOSTS,
+            max_failures=self.settings.PROXY_MAX_FAILURES,
+            reprobe_interval=self.settings.PROXY_REPROBE_INTERVAL
+        )
+
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       max_bytes: Optional[int],
+                       allow_redirects: bool,
+                       headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        host = urlparse(url).netloc
+        error: Optional[TransportError] = None
+        tried: Set[str] = set()
+        # Une requête refusée par un proxy n'a pas atteint la cible : elle est rejouée via un autre
+        for _ in range(len(self.pool.endpoints)):
+            while (endpoint := self.pool.choose(host, tried)) is None:
+                if len(tried) == len(self.pool.endpoints):
+                    raise error
+                await asyncio.sleep(self.pool.retry_after())
+            tried.add(endpoint.label)
+            if endpoint.limiter:
+                await endpoint.limiter.acquire()
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            started = time.monotonic()
+            settled, failure = False, None
+            try:
+                response = await endpoint.transport._request(method, url, max_bytes, allow_redirects, headers)
+                if response.status != 407:
+                    self.pool.record_success(endpoint, time.monotonic() - started)
+                    settled = True
+                    return response
+                failure = TransportError(f"Proxy authentication required ({endpoint.label})", proxy=True)
+            except TransportError as e:
+                # Échec côté cible : le proxy n'est pas en cause
+                if not e.proxy:
+                    raise
+                failure = e
+            finally:
+                endpoint.in_flight -= 1
+                self.stats['connections'] = sum(other.transport.stats['connections']
+                                              for other in self.pool.endpoints)
+                if not settled and failure is None:
+                    # Erreur de la cible ou annulation : rien à conclure sur le proxy
+                    self.pool.health.release(endpoint.label)
+            self.pool.record_failure(endpoint)
+            error = failure
+        raise error
+
+    async def close(self) -> None:
+        for endpoint in self.pool.endpoints:
+            await endpoint.transport.close()
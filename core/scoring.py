@@ -0,0 +1,59 @@
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import re
+from bs4 import Tag
+
+# Mots-clés des pages riches en informations de contact et de propriété
+HIGH_VALUE_KEYWORDS: Dict[str, float] = {
+    'contact': 10.0, 'kontakt': 10.0, 'contacto': 10.0, 'contatti': 10.0,
+    'impressum': 10.0, 'imprint': 10.0, 'mentions-legales': 10.0, 'mentions_legales': 10.0,
+    'legal': 8.0, 'about': 8.0, 'a-propos': 8.0, 'qui-sommes-nous': 8.0, 'uber-uns': 8.0,
+    'team': 6.0, 'equipe': 6.0, 'staff': 6.0, 'people': 5.0, 'leadership': 5.0,
+    'privacy': 5.0, 'confidentialite': 5.0, 'datenschutz': 5.0, 'terms': 4.0, 'cgu': 4.0, 'cgv': 4.0,
+    'company': 4.0, 'societe': 4.0, 'press': 4.0, 'presse': 4.0, 'careers': 3.0, 'jobs': 3.0,
+    'support': 3.0, 'help': 2.0, 'security': 3.0, 'locations': 3.0, 'offices': 3.0,
+}
+
+# Pages d'archives et de listings : peu d'informations nouvelles
+LOW_VALUE_PATTERNS = [
+    (re.compile(r'/(tag|tags|category|categories|author|archive|archives)/'), -6.0),
+    (re.compile(r'/page/\d+|[?&](page|p|paged|offset)=\d+'), -6.0),
+    (re.compile(r'/\d{4}/\d{2}(/\d{2})?/'), -4.0),
+    (re.compile(r'[?&](sort|order|filter|replytocom|share)='), -5.0),
+    (re.compile(r'\.(pdf|jpe?g|png|gif|zip|mp4|mp3|docx?|xlsx?)$'), -8.0),
+]
+
+# Position dans la page : les liens d'en-tête et de pied de page mènent souvent aux pages légales
+REGION_BONUS = {'header': 1.5, 'nav': 1.5, 'footer': 2.5}
+
+
+class LinkScorer:
+    """Estime l'intérêt d'un lien interne à partir de son URL, son texte et sa position"""
+
+    def score(self, url: str, anchor: Optional[Tag] = None, position: float = 0.0) -> float:
+        parsed = urlparse(url)
+        path = parsed.path.lower()
+        target = path + ('?' + parsed.query.lower() if parsed.query else '')
+        text = anchor.get_text(' ', strip=True).lower() if anchor is not None else ''
+
+        score = 0.0
+        for keyword, weight in HIGH_VALUE_KEYWORDS.items():
+            if keyword in path:
+                score += weight
+            elif keyword.replace('-', ' ') in text:
+                score += weight * 0.7
+
+        for pattern, penalty in LOW_VALUE_PATTERNS:
+            if pattern.search(target):
+                score += penalty
+
+        # Les pages proches de la racine sont plus souvent des pages institutionnelles
+        score -= 0.5 * max(0, path.rstrip('/').count('/') - 1)
+
+        if anchor is not None:
+            region = anchor.find_parent(list(REGION_BONUS))
+            if region is not None:
+                score += REGION_BONUS[region.name]
+
+        # Légère préférence pour les liens en début de document (position entre 0 et 1)
+        return round(score + (1.0 - position) * 0.5, 3)
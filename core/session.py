@@ -1,15 +1,16 @@
-from typing import Optional
-import aiohttp
+from typing import Mapping, Optional
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
 from config.settings import Settings  # Import correct
+from core.concurrency import ConcurrencyController
+from core.transport import Transport, TransportResponse, create_transport
 
 @dataclass
 class RateLimiter:
-    calls_per_second: int = 2
+    calls_per_second: float = 2
     _last_call: float = 0
-    _lock: asyncio.Lock = asyncio.Lock()
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
     async def acquire(self):
         async with self._lock:
@@ -19,26 +20,30 @@ class RateLimiter:
             self._last_call = time.time()
 
 class SessionManager:
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, backend: Optional[str] = None):
+        self.transport: Optional[Transport] = None
         self.rate_limiter = RateLimiter()
         self.settings = Settings.get_instance()  # Utilisation des settings
+        self.backend = backend or self.settings.HTTP_BACKEND
+        # Conservé d'un transport à l'autre : les limites apprises restent valables
+        self.concurrency = ConcurrencyController.from_settings()
 
-    async def get_session(self) -> aiohttp.ClientSession:
-        if self.session is None:
-            timeout = aiohttp.ClientTimeout(total=self.settings.TIMEOUT)
-            connector = aiohttp.TCPConnector(
-                limit=self.settings.CONCURRENT_REQUESTS,
-                force_close=True
-            )
-            self.session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=connector,
-                headers=self.settings.HEADERS
-            )
-        return self.session
+    async def get_transport(self) -> Transport:
+        if self.transport is None:
+            self.transport = create_transport(self.backend, self.concurrency)
+        return self.transport
+
+    async def fetch(self,
+                    url: str,
+                    method: str = 'GET',
+                    max_bytes: Optional[int] = None,
+                    allow_redirects: bool = True,
+                    headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        transport = await self.get_transport()
+        return await transport.request(method, url, max_bytes=max_bytes, allow_redirects=allow_redirects,
+                                       headers=headers)
 
     async def close(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
\ No newline at end of file
+        if self.transport:
+            await self.transport.close()
+            self.transport = None
@@ -0,0 +1,237 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from urllib.parse import urlparse
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    seed TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    UNIQUE (run_id, host)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    host_id INTEGER NOT NULL REFERENCES hosts(id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    status_code INTEGER,
+    analyzed_at TEXT,
+    content_hash TEXT,
+    duplicate_of TEXT
+);
+CREATE TABLE IF NOT EXISTS emails (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    email TEXT NOT NULL,
+    domain TEXT
+);
+CREATE TABLE IF NOT EXISTS phones (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    phone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS social_links (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    platform TEXT NOT NULL,
+    link TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS technologies (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analytics_ids (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sensitive_files (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    url TEXT,
+    status INTEGER,
+    risk_level TEXT
+);
+CREATE TABLE IF NOT EXISTS asset_findings (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    asset_url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_metadata (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    document_url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS headers (
+    host_id INTEGER NOT NULL REFERENCES hosts(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT,
+    UNIQUE (host_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_hosts_host ON hosts(host);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash);
+CREATE INDEX IF NOT EXISTS idx_emails_email ON emails(email);
+CREATE INDEX IF NOT EXISTS idx_emails_domain ON emails(domain);
+CREATE INDEX IF NOT EXISTS idx_phones_phone ON phones(phone);
+CREATE INDEX IF NOT EXISTS idx_social_link ON social_links(link);
+CREATE INDEX IF NOT EXISTS idx_technologies_name ON technologies(name);
+CREATE INDEX IF NOT EXISTS idx_analytics_value ON analytics_ids(value);
+CREATE INDEX IF NOT EXISTS idx_sensitive_path ON sensitive_files(path);
+CREATE INDEX IF NOT EXISTS idx_asset_findings_value ON asset_findings(value);
+CREATE INDEX IF NOT EXISTS idx_document_metadata_value ON document_metadata(value);
+CREATE INDEX IF NOT EXISTS idx_headers_name_value ON headers(name, value);
+"""
+
+# Entités interrogeables : nom -> (table, colonne)
+ENTITIES: Dict[str, Tuple[str, str]] = {
+    'email': ('emails', 'email'),
+    'email_domain': ('emails', 'domain'),
+    'phone': ('phones', 'phone'),
+    'social': ('social_links', 'link'),
+    'technology': ('technologies', 'name'),
+    'analytics_id': ('analytics_ids', 'value'),
+    'sensitive_file': ('sensitive_files', 'path'),
+    'asset_finding': ('asset_findings', 'value'),
+    'document_metadata': ('document_metadata', 'value'),
+}
+
+
+def flatten(result: Any) -> List[Any]:
+    """Liste à plat des pages d'une arborescence d'AnalysisResult"""
+    pages, stack = [], [result]
+    while stack:
+        page = stack.pop()
+        if page is None:
+            continue
+        pages.append(page)
+        stack.extend(page.internal_links.values())
+    return pages
+
+
+class ResultStore:
+    """Stockage SQLite normalisé et indexé des résultats d'analyse"""
+
+    def __init__(self, path: str = 'rhinoscraper_results.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def save_run(self, seed: str, pages: Iterable[Any], started_at: Optional[str] = None) -> int:
+        """Enregistre toutes les pages d'un run dans une seule transaction"""
+        pages = list(pages)
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT INTO runs (seed, started_at, finished_at) VALUES (?, ?, ?)',
+                (seed, started_at, datetime.now().isoformat())
+            )
+            run_id = cur.lastrowid
+
+            host_ids: Dict[str, int] = {}
+            for page in pages:
+                host = urlparse(page.url).netloc
+                if host not in host_ids:
+                    host_ids[host] = self.conn.execute(
+                        'INSERT INTO hosts (run_id, host) VALUES (?, ?)', (run_id, host)
+                    ).lastrowid
+
+            rows: Dict[str, List[Tuple]] = {
+                'emails': [], 'phones': [], 'social_links': [], 'technologies': [],
+                'analytics_ids': [], 'sensitive_files': [], 'asset_findings': [], 'document_metadata': [],
+                'headers': []
+            }
+            seen_headers = set()
+            for page in pages:
+                host_id = host_ids[urlparse(page.url).netloc]
+                duplicate = getattr(page, 'duplicate', None) or {}
+                page_id = self.conn.execute(
+                    'INSERT INTO pages (run_id, host_id, url, status_code, analyzed_at, content_hash, duplicate_of) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (run_id, host_id, page.url, page.status_code, page.analyzed_at,
+                     getattr(page, 'content_hash', '') or None, duplicate.get('url'))
+                ).lastrowid
+
+                rows['emails'].extend((page_id, e.get('email'), e.get('domain'))
+                                      for e in page.emails or [] if e.get('email'))
+                rows['phones'].extend((page_id, phone) for phone in page.phones or [])
+                for platform, data in ((page.social or {}).get('links') or {}).items():
+                    rows['social_links'].extend((page_id, platform, link) for link in data.get('links', []))
+                rows['technologies'].extend((page_id, tech) for tech in page.technologies or [])
+                rows['analytics_ids'].extend(
+                    (page_id, value) for value in (page.content or {}).get('analytics_ids', [])
+                )
+                rows['sensitive_files'].extend(
+                    (page_id, f.get('path'), f.get('url'), f.get('status'), f.get('risk_level'))
+                    for f in page.sensitive_files or []
+                )
+                for asset in getattr(page, 'assets', []):
+                    rows['asset_findings'].extend(
+                        [(page_id, asset['url'], f"secret:{secret['type']}", secret['value'])
+                         for secret in asset.get('secrets', [])] +
+                        [(page_id, asset['url'], kind, value)
+                         for kind, key in (('email', 'emails'), ('analytics_id', 'analytics_ids'),
+                                           ('technology', 'technologies'))
+                         for value in asset.get(key, [])]
+                    )
+                for document in getattr(page, 'documents', []):
+                    rows['document_metadata'].extend(
+                        (page_id, document['url'], name, str(value))
+                        for name, value in document.get('metadata', {}).items()
+                    )
+                headers = (page.security or {}).get('headers') or {}
+                if headers and host_id not in seen_headers and 'error' not in headers:
+                    seen_headers.add(host_id)
+                    rows['headers'].extend((host_id, name, str(value)) for name, value in headers.items())
+
+            self.conn.executemany('INSERT INTO emails VALUES (?, ?, ?)', rows['emails'])
+            self.conn.executemany('INSERT INTO phones VALUES (?, ?)', rows['phones'])
+            self.conn.executemany('INSERT INTO social_links VALUES (?, ?, ?)', rows['social_links'])
+            self.conn.executemany('INSERT INTO technologies VALUES (?, ?)', rows['technologies'])
+            self.conn.executemany('INSERT INTO analytics_ids VALUES (?, ?)', rows['analytics_ids'])
+            self.conn.executemany('INSERT INTO sensitive_files VALUES (?, ?, ?, ?, ?)', rows['sensitive_files'])
+            self.conn.executemany('INSERT INTO asset_findings VALUES (?, ?, ?, ?)', rows['asset_findings'])
+            self.conn.executemany('INSERT INTO document_metadata VALUES (?, ?, ?, ?)', rows['document_metadata'])
+            self.conn.executemany('INSERT INTO headers VALUES (?, ?, ?)', rows['headers'])
+        return run_id
+
+    def find(self, entity: str, value: str, like: bool = False) -> List[Dict[str, Any]]:
+        """Hôtes et pages où une entité apparaît, tous runs confondus"""
+        table, column = ENTITIES[entity]
+        operator = 'LIKE' if like else '='
+        cur = self.conn.execute(
+            f'SELECT DISTINCT e.{column}, h.host, p.url, r.id, r.finished_at '
+            f'FROM {table} e JOIN pages p ON p.id = e.page_id '
+            f'JOIN hosts h ON h.id = p.host_id JOIN runs r ON r.id = p.run_id '
+            f'WHERE e.{column} {operator} ? ORDER BY h.host, p.url, r.id',
+            (value,)
+        )
+        return [dict(zip(('value', 'host', 'url', 'run_id', 'run_at'), row)) for row in cur.fetchall()]
+
+    def find_header(self, name: str, value: Optional[str] = None, like: bool = False) -> List[Dict[str, Any]]:
+        """Hôtes dont un en-tête de sécurité a une valeur donnée"""
+        query = ('SELECT DISTINCT hd.name, hd.value, h.host, r.id, r.finished_at FROM headers hd '
+                 'JOIN hosts h ON h.id = hd.host_id JOIN runs r ON r.id = h.run_id WHERE hd.name = ?')
+        params: List[Any] = [name]
+        if value is not None:
+            query += ' AND hd.value LIKE ?' if like else ' AND hd.value = ?'
+            params.append(value)
+        cur = self.conn.execute(query + ' ORDER BY h.host, r.id', params)
+        return [dict(zip(('name', 'value', 'host', 'run_id', 'run_at'), row)) for row in cur.fetchall()]
+
+    def runs(self) -> List[Dict[str, Any]]:
+        cur = self.conn.execute(
+            'SELECT r.id, r.seed, r.finished_at, COUNT(p.id) FROM runs r '
+            'LEFT JOIN pages p ON p.run_id = r.id GROUP BY r.id ORDER BY r.id'
+        )
+        return [dict(zip(('run_id', 'seed', 'run_at', 'pages'), row)) for row in cur.fetchall()]
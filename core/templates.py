@@ -0,0 +1,151 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import copy
+import hashlib
+import re
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+from config.settings import Settings
+from extractors.buffers import INVISIBLE_TAGS, SCANNED_ATTRIBUTES
+
+# Éléments du gabarit commun à toutes les pages d'un site
+TEMPLATE_TAGS = frozenset(('header', 'nav', 'footer', 'aside'))
+TEMPLATE_ROLES = {'banner': 'header', 'navigation': 'nav', 'contentinfo': 'footer', 'complementary': 'aside'}
+# Conteneurs reconnus à leur id ou leur classe (site-header, main-nav, sidebar...)
+HINTED_TAGS = frozenset(('div', 'section', 'ul'))
+HINT_PATTERN = re.compile(r'(?:^|[-_])(header|footer|navbar|nav|navigation|menu|sidebar)(?:$|[-_])', re.I)
+HINT_KINDS = {'navbar': 'nav', 'navigation': 'nav', 'menu': 'nav', 'sidebar': 'aside'}
+# Un en-tête ou pied de page d'article appartient à la page, pas au gabarit
+CONTENT_TAGS = frozenset(('article', 'main'))
+
+
+def block_kind(element: Tag) -> Optional[str]:
+    """Type de bloc de gabarit (header, nav, footer, aside) de l'élément, ou None"""
+    if element.name in TEMPLATE_TAGS:
+        return element.name
+    role = element.get('role')
+    if isinstance(role, str) and role.lower() in TEMPLATE_ROLES:
+        return TEMPLATE_ROLES[role.lower()]
+    if element.name in HINTED_TAGS:
+        tokens = [element.get('id') or ''] + list(element.get('class') or [])
+        for token in tokens:
+            if match := HINT_PATTERN.search(token):
+                word = match.group(1).lower()
+                return HINT_KINDS.get(word, word)
+    return None
+
+
+def find_blocks(soup: BeautifulSoup) -> List[Tuple[str, Tag]]:
+    """(type, élément) des blocs de gabarit de la page, sans blocs imbriqués, dans l'ordre du document"""
+    blocks: List[Tuple[str, Tag]] = []
+    chosen: Set[int] = set()
+    for element in soup.find_all(block_kind):
+        ancestors = list(element.parents)
+        if any(id(parent) in chosen or parent.name in CONTENT_TAGS or parent.name in INVISIBLE_TAGS
+               for parent in ancestors):
+            continue
+        chosen.add(id(element))
+        blocks.append((block_kind(element), element))
+    return blocks
+
+
+def block_hash(element: Tag) -> str:
+    """Empreinte du contenu d'un bloc : balises, texte et liens.
+
+    Les classes, id et styles sont ignorés : l'entrée de menu active ne change pas l'empreinte.
+    """
+    parts = []
+    for node in [element, *element.descendants]:
+        if isinstance(node, Tag):
+            parts.append(f"<{node.name}")
+            parts.extend(f"{name}={node[name]}" for name in SCANNED_ATTRIBUTES
+                         if isinstance(node.get(name), str))
+        elif isinstance(node, NavigableString) and not isinstance(node, PreformattedString):
+            if text := ' '.join(node.split()):
+                parts.append(text)
+    return hashlib.sha1('\x00'.join(parts).encode('utf-8', 'replace')).hexdigest()
+
+
+def merge_findings(target: Dict[str, Any], source: Dict[str, Any], located: bool = True) -> None:
+    """Ajoute à target les résultats d'extracteurs de source, sans doublons.
+
+    located : False si les lignes relevées dans source correspondent à une autre page
+    """
+    for key, value in source.items():
+        if key not in target or target[key] is None:
+            target[key] = _copy(value, located)
+        elif isinstance(value, dict) and isinstance(target[key], dict):
+            merge_findings(target[key], value, located)
+            # Liens sociaux : {'links': [...], 'count': n}
+            if isinstance(target[key].get('links'), list) and 'count' in target[key]:
+                target[key]['count'] = len(target[key]['links'])
+        elif isinstance(value, list) and isinstance(target[key], list):
+            present = {_identity(item) for item in target[key]}
+            for item in value:
+                if _identity(item) not in present:
+                    present.add(_identity(item))
+                    target[key].append(_copy(item, located))
+        elif isinstance(value, set) and isinstance(target[key], set):
+            target[key] |= value
+
+
+def _copy(value: Any, located: bool) -> Any:
+    value = copy.deepcopy(value)
+    if not located:
+        for item in (value if isinstance(value, list) else [value]):
+            if isinstance(item, dict) and 'line' in item:
+                item['line'] = None
+    return value
+
+
+def _identity(item: Any) -> Any:
+    """Clé de dédoublonnage ; un email reste le même quelle que soit sa position dans la page"""
+    if isinstance(item, dict):
+        return item.get('email') or repr(sorted(item.items(), key=lambda pair: pair[0]))
+    return item if isinstance(item, (str, int, float, tuple)) else repr(item)
+
+
+@dataclass
+class TemplateBlock:
+    """Bloc de gabarit d'un hôte et résultats de ses extracteurs, obtenus une seule fois"""
+    host: str
+    hash: str
+    kind: str
+    url: str  # page d'où viennent les résultats (et leurs numéros de ligne)
+    text: str  # texte visible, pour l'empreinte SimHash des pages qui le contiennent
+    findings: Dict[str, Any]
+    pages: Set[str] = field(default_factory=set)
+
+
+class TemplateIndex:
+    """Blocs de gabarit déjà vus, par hôte.
+
+    Un bloc présent sur au moins min_pages pages fait partie du gabarit du site :
+    ses entités sont rapportées une fois, au niveau du site.
+    """
+
+    def __init__(self, min_pages: int = 2):
+        self.min_pages = min_pages
+        self.blocks: Dict[Tuple[str, str], TemplateBlock] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'TemplateIndex':
+        return cls(Settings.get_instance().TEMPLATE_MIN_PAGES)
+
+    def get(self, host: str, block_hash: str) -> Optional[TemplateBlock]:
+        return self.blocks.get((host, block_hash))
+
+    def add(self, block: TemplateBlock) -> None:
+        self.blocks[(block.host, block.hash)] = block
+
+    def site_blocks(self) -> List[TemplateBlock]:
+        """Blocs communs à plusieurs pages, par hôte puis dans l'ordre de découverte"""
+        return sorted((block for block in self.blocks.values() if len(block.pages) >= self.min_pages),
+                      key=lambda block: block.host)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Blocs du gabarit de chaque site, pour le rapport"""
+        return [{'host': block.host, 'kind': block.kind, 'hash': block.hash,
+                 'pages': sorted(block.pages), 'findings': block.findings}
+                for block in self.site_blocks()]
@@ -0,0 +1,278 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Type
+from urllib.parse import urlparse
+import asyncio
+import aiohttp
+
+from config.settings import Settings
+from core.concurrency import ConcurrencyController, OK, THROTTLED, TIMEOUT
+
+try:
+    import httpx
+except ImportError:  # dépendance optionnelle : pip install "httpx[http2]"
+    httpx = None
+
+try:
+    from aiohttp_socks import ProxyConnector
+except ImportError:  # dépendance optionnelle pour les proxies SOCKS : pip install aiohttp-socks
+    ProxyConnector = None
+
+
+class TransportError(Exception):
+    """Erreur réseau, quel que soit le backend HTTP"""
+
+    def __init__(self, message: str, timeout: bool = False, proxy: bool = False):
+        super().__init__(message)
+        self.timeout = timeout
+        self.proxy = proxy  # échec imputable au proxy et non à la cible
+
+
+@dataclass
+class TransportResponse:
+    url: str
+    status: int
+    headers: Mapping[str, str]  # insensible à la casse pour les deux backends
+    body: bytes
+    encoding: Optional[str] = None
+    http_version: str = 'HTTP/1.1'
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class Transport(ABC):
+    """Client HTTP utilisé par SessionManager ; une instance par crawl"""
+
+    name: str = ''
+
+    def __init__(self,
+                 concurrency: Optional[ConcurrencyController] = None,
+                 proxy: Optional[str] = None):
+        self.settings = Settings.get_instance()
+        self.concurrency = concurrency or ConcurrencyController.from_settings()
+        self.proxy = proxy
+        self.stats: Dict[str, int] = {'requests': 0, 'connections': 0}
+        self._host_limiters: Dict[str, Any] = {}
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      max_bytes: Optional[int] = None,
+                      allow_redirects: bool = True,
+                      headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        """Effectue la requête ; au-delà de max_bytes le corps est tronqué.
+
+        headers : en-têtes ajoutés à ceux de Settings.HEADERS pour cette requête
+        """
+        host = urlparse(url).netloc
+        if self.settings.HOST_REQUESTS_PER_SECOND:
+            # Attente hors créneau : une requête espacée n'occupe pas de place de concurrence
+            await self._host_limiter(host).acquire()
+        self.stats['requests'] += 1
+        async with self.concurrency.slot(host) as outcome:
+            try:
+                response = await self._request(method, url, max_bytes, allow_redirects, headers)
+            except TransportError as e:
+                if e.timeout:
+                    outcome['result'] = TIMEOUT
+                raise
+            outcome['result'] = THROTTLED if response.status == 429 or response.status >= 500 else OK
+            return response
+
+    def _host_limiter(self, host: str) -> Any:
+        if host not in self._host_limiters:
+            # Import local : core.session dépend de ce module
+            from core.session import RateLimiter
+            self._host_limiters[host] = RateLimiter(calls_per_second=self.settings.HOST_REQUESTS_PER_SECOND)
+        return self._host_limiters[host]
+
+    @abstractmethod
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       max_bytes: Optional[int],
+                       allow_redirects: bool,
+                       headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 via aiohttp (backend par défaut)"""
+
+    name = 'aiohttp'
+    # Une connexion par requête par défaut ; True : connexions réutilisées (keep-alive)
+    keep_alive = False
+
+    def __init__(self,
+                 concurrency: Optional[ConcurrencyController] = None,
+                 proxy: Optional[str] = None):
+        super().__init__(concurrency, proxy)
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Proxy HTTP : passé à chaque requête ; proxy SOCKS : porté par le connecteur
+        self._socks = bool(proxy) and proxy.startswith('socks')
+        if self._socks and ProxyConnector is None:
+            raise RuntimeError('SOCKS proxies with the aiohttp backend require: pip install aiohttp-socks')
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection)
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.settings.TIMEOUT),
+                connector=self._connector(),
+                headers=self.settings.HEADERS,
+                trace_configs=[trace]
+            )
+        return self.session
+
+    def _connector(self) -> aiohttp.BaseConnector:
+        options = {'limit': self.concurrency.ceiling, 'force_close': not self.keep_alive}
+        if self.keep_alive:
+            options['limit_per_host'] = self.concurrency.ceiling
+        if self._socks:
+            return ProxyConnector.from_url(self.proxy, **options)
+        return aiohttp.TCPConnector(**options)
+
+    async def _on_connection(self, session: Any, context: Any, params: Any) -> None:
+        self.stats['connections'] += 1
+
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       max_bytes: Optional[int],
+                       allow_redirects: bool,
+                       headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        try:
+            proxy = self.proxy if self.proxy and not self._socks else None
+            async with self._session().request(method, url, ssl=False, proxy=proxy, headers=headers,
+                                               allow_redirects=allow_redirects) as response:
+                truncated = False
+                if max_bytes is None:
+                    body = await response.read()
+                else:
+                    chunks, size = [], 0
+                    async for chunk in response.content.iter_chunked(65536):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= max_bytes:
+                            truncated = True
+                            break
+                    body = b''.join(chunks)[:max_bytes]
+                return TransportResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    headers=response.headers,
+                    body=body,
+                    # get_encoding() exige un corps lu en entier
+                    encoding=response.get_encoding() if max_bytes is None else response.charset,
+                    http_version=f"HTTP/{response.version.major}.{response.version.minor}",
+                    truncated=truncated
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            proxy_error = bool(self.proxy) and isinstance(
+                e, (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError)
+            )
+            if self._socks and not proxy_error:
+                # aiohttp-socks signale l'échec du proxy par ses propres exceptions
+                proxy_error = type(e).__module__.startswith('python_socks')
+            raise TransportError(str(e) or type(e).__name__, isinstance(e, asyncio.TimeoutError),
+                                 proxy_error) from e
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+
+class HttpxTransport(Transport):
+    """HTTP/2 via httpx : les requêtes vers un même hôte partagent une connexion multiplexée"""
+
+    name = 'httpx'
+
+    def __init__(self,
+                 concurrency: Optional[ConcurrencyController] = None,
+                 proxy: Optional[str] = None):
+        super().__init__(concurrency, proxy)
+        if httpx is None:
+            raise RuntimeError('The httpx backend requires: pip install "httpx[http2]"')
+        self.client = httpx.AsyncClient(
+            http2=True,
+            proxy=proxy,
+            verify=False,
+            timeout=self.settings.TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency.ceiling),
+            headers=self.settings.HEADERS
+        )
+        # Flux réseau déjà vus : une entrée par connexion ouverte
+        self._streams: Dict[int, Any] = {}
+
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       max_bytes: Optional[int],
+                       allow_redirects: bool,
+                       headers: Optional[Mapping[str, str]] = None) -> TransportResponse:
+        try:
+            async with self.client.stream(method, url, headers=headers,
+                                          follow_redirects=allow_redirects) as response:
+                stream = response.extensions.get('network_stream')
+                if stream is not None and id(stream) not in self._streams:
+                    self._streams[id(stream)] = stream
+                    self.stats['connections'] += 1
+                truncated = False
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if max_bytes is not None and size >= max_bytes:
+                        truncated = True
+                        break
+                body = b''.join(chunks)
+                if max_bytes is not None:
+                    body = body[:max_bytes]
+                return TransportResponse(
+                    url=str(response.url),
+                    status=response.status_code,
+                    headers=response.headers,
+                    body=body,
+                    encoding=response.charset_encoding,
+                    http_version=response.http_version,
+                    truncated=truncated
+                )
+        except httpx.HTTPError as e:
+            # Derrière un proxy, la connexion ouverte est celle du proxy
+            proxy_error = bool(self.proxy) and isinstance(e, (httpx.ProxyError, httpx.ConnectError))
+            raise TransportError(str(e) or type(e).__name__, isinstance(e, httpx.TimeoutException),
+                                 proxy_error) from e
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self._streams.clear()
+
+
+TRANSPORTS: Dict[str, Type[Transport]] = {
+    AiohttpTransport.name: AiohttpTransport,
+    HttpxTransport.name: HttpxTransport,
+}
+
+
+def create_transport(name: Optional[str] = None,
+                     concurrency: Optional[ConcurrencyController] = None) -> Transport:
+    """Instancie le backend HTTP demandé (Settings.HTTP_BACKEND par défaut),
+    derrière le pool de proxies si Settings.PROXIES est renseigné"""
+    settings = Settings.get_instance()
+    name = name or settings.HTTP_BACKEND
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown HTTP backend '{name}' (available: {', '.join(TRANSPORTS)})")
+    if settings.PROXIES:
+        # Import local : core.proxies dépend de ce module
+        from core.proxies import ProxyTransport
+        return ProxyTransport(TRANSPORTS[name], settings.PROXIES, concurrency)
+    return TRANSPORTS[name](concurrency)
@@ -1,5 +1,6 @@
 # Import des extracteurs depuis leurs modules respectifs
 from extractors.base import BaseExtractor
+from extractors.buffers import PageBuffers
 from extractors.content import ContentExtractor
 from extractors.domain import DomainExtractor
 from extractors.email import EmailExtractor
@@ -12,6 +13,7 @@ from extractors.sensitive_files import SensitiveFileExtractor
 # Définition des exports du package
 __all__ = [
     'BaseExtractor',
+    'PageBuffers',
     'ContentExtractor',
     'DomainExtractor',
     'EmailExtractor',
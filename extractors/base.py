@@ -1,13 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 from bs4 import BeautifulSoup
 import aiohttp
+from core.transport import Transport, create_transport
+from .buffers import PageBuffers
 
 class BaseExtractor(ABC):
-    def __init__(self, soup: BeautifulSoup, url: str):
+    # False pour les extracteurs dont le résultat dépend de l'hôte et non du HTML
+    depends_on_content: bool = True
+    # Tampons parcourus par les expressions régulières (voir PageBuffers)
+    scans: Tuple[str, ...] = ('markup',)
+    # Délai propre à l'extracteur, sinon Settings.EXTRACTOR_TIMEOUT
+    timeout: Optional[float] = None
+
+    def __init__(self,
+                 soup: BeautifulSoup,
+                 url: str,
+                 buffers: Optional[PageBuffers] = None,
+                 transport: Optional[Transport] = None):
         self.soup = soup
         self.url = url
+        self._buffers = buffers
+        self._transport = transport
+
+    @property
+    def buffers(self) -> PageBuffers:
+        """Tampons de la page, partagés entre extracteurs quand l'analyseur les fournit"""
+        if self._buffers is None:
+            self._buffers = PageBuffers(self.soup)
+        return self._buffers
+
+    @asynccontextmanager
+    async def http(self) -> AsyncIterator[Transport]:
+        """Transport du crawl, ou un transport temporaire si l'extracteur est utilisé seul"""
+        if self._transport is not None:
+            yield self._transport
+            return
+        transport = create_transport()
+        try:
+            yield transport
+        finally:
+            await transport.close()
+
+    def scan_text(self) -> str:
+        """Concaténation des tampons déclarés dans scans"""
+        return '\n'.join(self.buffers.get(name) for name in self.scans)
 
     @abstractmethod
     async def extract(self) -> Dict[str, Any]:
-        pass
\ No newline at end of file
+        pass
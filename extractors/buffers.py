@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+# Éléments dont le texte n'est pas affiché
+INVISIBLE_TAGS = frozenset(('script', 'style', 'noscript', 'template', 'head', 'svg'))
+SCRIPT_TAGS = frozenset(('script',))
+SCANNED_ATTRIBUTES = ('href', 'content', 'src')
+SEPARATOR = '\n'
+
+
+class PageBuffers:
+    """Tampons de texte construits en une seule passe sur le DOM.
+
+    - text : texte visible (sans head, scripts, styles, SVG ni commentaires)
+    - attrs : valeurs des attributs href, content et src
+    - scripts : code des scripts inline
+    - markup : HTML complet, sérialisé à la demande
+
+    Chaque segment garde la position (ligne, colonne) de son élément dans la source.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+        self._parts: Dict[str, List[str]] = {'text': [], 'attrs': [], 'scripts': []}
+        self._starts: Dict[str, List[int]] = {'text': [], 'attrs': [], 'scripts': []}
+        self._positions: Dict[str, List[Tuple[Optional[int], Optional[int]]]] = {
+            'text': [], 'attrs': [], 'scripts': []
+        }
+        self._lengths: Dict[str, int] = {'text': 0, 'attrs': 0, 'scripts': 0}
+        self._built: Dict[str, str] = {}
+        self._walk()
+
+    def _append(self, name: str, value: str, element: Tag) -> None:
+        self._starts[name].append(self._lengths[name])
+        self._positions[name].append((element.sourceline, element.sourcepos))
+        self._parts[name].append(value)
+        self._lengths[name] += len(value) + len(SEPARATOR)
+
+    def _walk(self) -> None:
+        stack = [(self.soup, False)]
+        while stack:
+            node, hidden = stack.pop()
+            if isinstance(node, Tag):
+                if not isinstance(node, BeautifulSoup):
+                    for attribute in SCANNED_ATTRIBUTES:
+                        value = node.get(attribute)
+                        if isinstance(value, str) and value.strip():
+                            self._append('attrs', value.strip(), node)
+                # Enfants empilés à l'envers pour être traités dans l'ordre du document
+                child_hidden = hidden or node.name in INVISIBLE_TAGS
+                stack.extend((child, child_hidden) for child in reversed(node.contents))
+            elif (isinstance(node, NavigableString) and not isinstance(node, PreformattedString)
+                  and (text := node.strip())):
+                if node.parent.name in SCRIPT_TAGS:
+                    self._append('scripts', text, node.parent)
+                elif not hidden:
+                    self._append('text', text, node.parent)
+
+    def get(self, name: str) -> str:
+        if name not in self._built:
+            if name == 'markup':
+                self._built[name] = str(self.soup)
+            else:
+                self._built[name] = SEPARATOR.join(self._parts[name])
+        return self._built[name]
+
+    @property
+    def text(self) -> str:
+        return self.get('text')
+
+    @property
+    def attrs(self) -> str:
+        return self.get('attrs')
+
+    def source_position(self, name: str, offset: int) -> Optional[Tuple[int, int]]:
+        """(ligne, colonne) dans le HTML source de l'élément contenant l'offset"""
+        starts = self._starts.get(name)
+        if not starts:
+            return None
+        index = bisect_right(starts, offset) - 1
+        if index < 0:
+            return None
+        line, column = self._positions[name][index]
+        return (line, column) if line is not None else None
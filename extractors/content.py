@@ -1,10 +1,16 @@
 from typing import Dict, List, Any
 import re
+import logging
 from bs4 import BeautifulSoup, Comment
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class ContentExtractor(BaseExtractor):
+    scans = ('text',)
+    ANALYTICS_PATTERN = r'\b(?:UA-\d+-\d+|G-[A-Z0-9]{6,}|GTM-[A-Z0-9]+)\b'
+
     async def extract(self) -> Dict[str, Any]:
         try:
             meta_tags = []
@@ -27,11 +33,12 @@ class ContentExtractor(BaseExtractor):
                         string=lambda text: isinstance(text, Comment)
                     )],
                     'google_tags': google_tags,
-                    'dates': re.findall(r'\d{4}-\d{2}-\d{2}', str(self.soup))
+                    'dates': self._extract_dates(),
+                    'analytics_ids': self._extract_analytics_ids()
                 }
             }
         except Exception as e:
-            print(f"Content extraction error: {str(e)}")
+            logger.warning("Content extraction error on %s: %s", self.url, e)
             return {'content': {}}
 
     def _extract_meta_tags(self) -> List[str]:
@@ -61,5 +68,11 @@ class ContentExtractor(BaseExtractor):
         )
         return google_tags
 
+    def _extract_analytics_ids(self) -> List[str]:
+        """Identifiants Google Analytics / Tag Manager présents dans la page"""
+        # Les identifiants se trouvent dans les scripts inline et les URLs des tags
+        text = self.buffers.get('scripts') + '\n' + self.buffers.get('attrs')
+        return sorted(set(re.findall(self.ANALYTICS_PATTERN, text)))
+
     def _extract_dates(self) -> List[str]:
-        return re.findall(r'\d{4}-\d{2}-\d{2}', str(self.soup))
\ No newline at end of file
+        return re.findall(r'\d{4}-\d{2}-\d{2}', self.scan_text())
\ No newline at end of file
@@ -2,17 +2,23 @@ from typing import Dict, Any
 import whois
 import socket
 import asyncio
+import logging
 from datetime import datetime
 from urllib.parse import urlparse
+from core.intel import DomainIntelStore, registrable_domain
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class DomainExtractor(BaseExtractor):
+    depends_on_content = False
+
     async def extract(self) -> Dict[str, Any]:
         try:
-            domain = urlparse(self.url).netloc
-            whois_info = await self._get_whois_info(domain)
-            dns_info = await self._get_dns_info(domain)
+            hostname = urlparse(self.url).hostname or ''
+            whois_info = await self._get_whois_info(registrable_domain(hostname))
+            dns_info = await self._get_dns_info(hostname)
 
             return {
                 'domain_info': {
@@ -21,31 +27,41 @@ class DomainExtractor(BaseExtractor):
                 }
             }
         except Exception as e:
-            print(f"Domain extraction error: {str(e)}")
+            logger.warning("Domain extraction error on %s: %s", self.url, e)
             return {'domain_info': {}}
 
     async def _get_whois_info(self, domain: str) -> Dict[str, Any]:
-        try:
-            w = whois.whois(domain)
-            return {
-                'registrar': w.registrar,
-                'creation_date': str(w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date),
-                'expiration_date': str(
-                    w.expiration_date[0] if isinstance(w.expiration_date, list) else w.expiration_date)
-            }
-        except:
-            return {}
+        """WHOIS du domaine enregistrable, mis en cache entre les runs"""
+        ok, value = await DomainIntelStore.get_instance().lookup(
+            'whois', domain, lambda: asyncio.to_thread(self._query_whois, domain)
+        )
+        return value if ok else {}
+
+    @staticmethod
+    def _query_whois(domain: str) -> Dict[str, Any]:
+        w = whois.whois(domain)
+        return {
+            'registrar': w.registrar,
+            'creation_date': str(w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date),
+            'expiration_date': str(
+                w.expiration_date[0] if isinstance(w.expiration_date, list) else w.expiration_date)
+        }
 
     async def _get_dns_info(self, domain: str) -> Dict[str, Any]:
-        try:
-            info = socket.gethostbyname_ex(domain)
-            return {
-                'hostname': info[0],
-                'aliases': info[1],
-                'ip_addresses': info[2]
-            }
-        except:
-            return {}
+        """Résolution DNS du nom d'hôte, mise en cache entre les runs"""
+        ok, value = await DomainIntelStore.get_instance().lookup(
+            'dns', domain, lambda: asyncio.to_thread(self._query_dns, domain)
+        )
+        return value if ok else {}
+
+    @staticmethod
+    def _query_dns(domain: str) -> Dict[str, Any]:
+        info = socket.gethostbyname_ex(domain)
+        return {
+            'hostname': info[0],
+            'aliases': info[1],
+            'ip_addresses': info[2]
+        }
 
     async def _get_ip_info(self, domain: str) -> Dict[str, Any]:
         """Récupère les informations sur l'IP du domaine"""
@@ -1,19 +1,25 @@
 from typing import Dict, List, Any
 import re
-from email_validator import validate_email
+from email_validator import EmailNotValidError, validate_email
 from .base import BaseExtractor
 
 
 class EmailExtractor(BaseExtractor):
+    scans = ('text', 'attrs')
+    # Pattern email optimisé
+    EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
     async def extract(self) -> Dict[str, List[Dict[str, str]]]:
         """Extrait et valide les adresses email du contenu"""
         all_emails = set()
 
-        # Pattern email optimisé
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-
-        # Recherche dans le texte
-        all_emails.update(re.findall(email_pattern, str(self.soup)))
+        # Recherche dans le texte visible et les attributs (href, content, src),
+        # en gardant la position de la première occurrence dans le HTML source
+        positions = {}
+        for name in self.scans:
+            for match in re.finditer(self.EMAIL_PATTERN, self.buffers.get(name)):
+                positions.setdefault(match.group(), self.buffers.source_position(name, match.start()))
+        all_emails.update(positions)
 
         # Recherche dans les liens mailto
         for link in self.soup.find_all('a', href=lambda x: x and 'mailto:' in x.lower()):
@@ -25,13 +31,15 @@ class EmailExtractor(BaseExtractor):
         validated_emails = []
         for email in all_emails:
             try:
-                valid = validate_email(email)
+                # Syntaxe seulement : la délivrabilité est vérifiée une fois par domaine après le crawl
+                valid = validate_email(email, check_deliverability=False)
                 validated_emails.append({
                     'email': valid.email,
                     'domain': valid.domain,
-                    'source': 'page_content'
+                    'source': 'page_content',
+                    'line': (positions.get(email) or (None, None))[0]
                 })
-            except:
+            except EmailNotValidError:
                 continue
 
         return {'emails': validated_emails}
\ No newline at end of file
@@ -5,8 +5,10 @@ from .base import BaseExtractor
 
 
 class PhoneExtractor(BaseExtractor):
-    def __init__(self, soup, url):
-        super().__init__(soup, url)
+    scans = ('text', 'attrs')
+
+    def __init__(self, soup, url, buffers=None, transport=None):
+        super().__init__(soup, url, buffers, transport)
         self.country_codes = [
             "US", "GB", "FR", "DE", "ES", "IT", "CH", "BE", "NL",
             "CA", "AU", "IN", "CN", "JP", "BR", "RU"
@@ -81,7 +83,7 @@ class PhoneExtractor(BaseExtractor):
 
     async def extract(self) -> Dict[str, List[str]]:
         """Extrait les numéros de téléphone du contenu avec validation améliorée"""
-        text = str(self.soup)
+        text = self.scan_text()
         valid_phones = set()
 
         # Première passe : utiliser phonenumbers pour les numéros bien formés
@@ -1,16 +1,21 @@
 import ssl
 import socket
 import asyncio
-import aiohttp
+import logging
 from typing import Dict, Any
 from urllib.parse import urlparse
+from core.intel import DomainIntelStore
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class SecurityExtractor(BaseExtractor):
+    depends_on_content = False
+
     async def extract(self) -> Dict[str, Any]:
         try:
-            domain = urlparse(self.url).netloc
+            domain = urlparse(self.url).hostname or ''
             ssl_info = await self._get_ssl_info(domain)
             headers = await self._get_security_headers()
 
@@ -21,21 +26,26 @@ class SecurityExtractor(BaseExtractor):
                 }
             }
         except Exception as e:
-            print(f"Security extraction error: {str(e)}")
+            logger.warning("Security extraction error on %s: %s", self.url, e)
             return {'security_info': {}}
 
     async def _get_ssl_info(self, domain: str) -> Dict[str, Any]:
-        try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    return {
-                        'issuer': dict(x[0] for x in cert['issuer']),
-                        'expiry': cert['notAfter']
-                    }
-        except Exception as e:
-            return {'error': str(e)}
+        """Certificat TLS du nom d'hôte, mis en cache entre les runs"""
+        ok, value = await DomainIntelStore.get_instance().lookup(
+            'tls', domain, lambda: asyncio.to_thread(self._query_certificate, domain)
+        )
+        return value if ok else {'error': value}
+
+    @staticmethod
+    def _query_certificate(domain: str) -> Dict[str, Any]:
+        context = ssl.create_default_context()
+        with socket.create_connection((domain, 443), timeout=10) as sock:
+            with context.wrap_socket(sock, server_hostname=domain) as ssock:
+                cert = ssock.getpeercert()
+                return {
+                    'issuer': dict(x[0] for x in cert['issuer']),
+                    'expiry': cert['notAfter']
+                }
 
     async def _get_security_headers(self) -> Dict[str, str]:
         headers = {
@@ -44,12 +54,11 @@ class SecurityExtractor(BaseExtractor):
             'X-Frame-Options': 'Missing'
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.url) as response:
-                    resp_headers = response.headers
-                    for header in headers:
-                        if header in resp_headers:
-                            headers[header] = resp_headers[header]
+            async with self.http() as transport:
+                response = await transport.request('GET', self.url, max_bytes=0)
+            for header in headers:
+                if header in response.headers:
+                    headers[header] = response.headers[header]
             return headers
         except Exception as e:
             return {'error': str(e)}
\ No newline at end of file
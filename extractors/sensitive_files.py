@@ -1,13 +1,19 @@
 import asyncio
-import aiohttp
+import logging
 from typing import Dict, Any, Optional, List
 import async_timeout
+from core.transport import Transport
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class SensitiveFileExtractor(BaseExtractor):
-    def __init__(self, soup, url):
-        super().__init__(soup, url)
+    depends_on_content = False
+    timeout = 15  # une requête HEAD par chemin testé
+
+    def __init__(self, soup, url, buffers=None, transport=None):
+        super().__init__(soup, url, buffers, transport)
         self.sensitive_paths = [
             'robots.txt', '.git/HEAD', '.env', 'wp-config.php',
             '.htaccess', '.htpasswd', 'config.php', 'sitemap.xml',
@@ -22,11 +28,11 @@ class SensitiveFileExtractor(BaseExtractor):
             exposed_files = []
             base_url = self.url.rstrip('/')
 
-            async with aiohttp.ClientSession() as session:
+            async with self.http() as transport:
                 tasks = []
                 for path in self.sensitive_paths:
                     url = f"{base_url}/{path}"
-                    tasks.append(self._check_path(session, url, path))
+                    tasks.append(self._check_path(transport, url, path))
 
                 results = await asyncio.gather(*tasks, return_exceptions=True)
                 exposed_files = [r for r in results if r and not isinstance(r, Exception)]
@@ -34,20 +40,20 @@ class SensitiveFileExtractor(BaseExtractor):
             return {'sensitive_files': exposed_files}
 
         except Exception as e:
-            print(f"Sensitive files extraction error: {str(e)}")
+            logger.warning("Sensitive files extraction error on %s: %s", self.url, e)
             return {'sensitive_files': []}
 
-    async def _check_path(self, session: aiohttp.ClientSession, url: str, path: str) -> Optional[Dict[str, Any]]:
+    async def _check_path(self, transport: Transport, url: str, path: str) -> Optional[Dict[str, Any]]:
         try:
-            async with session.head(url, allow_redirects=False, ssl=False) as response:
-                if response.status in [200, 403]:
-                    return {
-                        'path': path,
-                        'status': response.status,
-                        'url': url,
-                        'risk_level': 'HIGH' if any(x in path for x in ['.env', 'config', 'credentials'])
-                        else 'MEDIUM'
-                    }
+            response = await transport.request('HEAD', url, allow_redirects=False)
+            if response.status in [200, 403]:
+                return {
+                    'path': path,
+                    'status': response.status,
+                    'url': url,
+                    'risk_level': 'HIGH' if any(x in path for x in ['.env', 'config', 'credentials'])
+                    else 'MEDIUM'
+                }
         except Exception as e:
-            print(f"Error checking path {path}: {str(e)}")
+            logger.debug("Error checking path %s: %s", path, e)
             return None
\ No newline at end of file
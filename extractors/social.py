@@ -1,11 +1,17 @@
 # extractors/social.py
 import re
+import logging
 from typing import Dict, Any, Set
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
+
 class SocialExtractor(BaseExtractor):
-    def __init__(self, soup, url):
-        super().__init__(soup, url)
+    scans = ('attrs', 'text')
+
+    def __init__(self, soup, url, buffers=None, transport=None):
+        super().__init__(soup, url, buffers, transport)
         self.social_patterns = {
             'facebook': [
                 r'facebook\.com/[A-Za-z0-9.]+',
@@ -30,7 +36,7 @@ class SocialExtractor(BaseExtractor):
         """Extrait tous les liens de réseaux sociaux de la page"""
         try:
             social_links = {}
-            html_content = str(self.soup)
+            html_content = self.scan_text()
 
             for platform, patterns in self.social_patterns.items():
                 found_links = set()
@@ -54,7 +60,7 @@ class SocialExtractor(BaseExtractor):
                 }
             }
         except Exception as e:
-            print(f"Social extraction error: {str(e)}")
+            logger.warning("Social extraction error on %s: %s", self.url, e)
             return {'social_media': {'links': {}, 'meta': {}}}
 
     def _extract_meta_social(self) -> Dict[str, set]:
@@ -77,7 +83,7 @@ class SocialExtractor(BaseExtractor):
             }
 
         except Exception as e:
-            print(f"Meta social extraction error: {str(e)}")
+            logger.warning("Meta social extraction error on %s: %s", self.url, e)
             meta_social = {'og': set(), 'twitter': set()}
 
         return meta_social
\ No newline at end of file
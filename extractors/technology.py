@@ -3,24 +3,24 @@ from typing import Dict, List, Any
 from .base import BaseExtractor
 
 class TechnologyExtractor(BaseExtractor):
+    # Patterns de détection rapide
+    TECH_PATTERNS = {
+        'wordpress': 'WordPress',
+        'drupal': 'Drupal',
+        'joomla': 'Joomla',
+        'bootstrap': 'Bootstrap',
+        'jquery': 'jQuery',
+        'react': 'React',
+        'vue': 'Vue.js',
+        'angular': 'Angular'
+    }
+
     async def extract(self) -> Dict[str, Any]:
         """Détecte les technologies utilisées sur le site"""
         technologies = set()
 
-        # Patterns de détection rapide
-        tech_patterns = {
-            'wordpress': 'WordPress',
-            'drupal': 'Drupal',
-            'joomla': 'Joomla',
-            'bootstrap': 'Bootstrap',
-            'jquery': 'jQuery',
-            'react': 'React',
-            'vue': 'Vue.js',
-            'angular': 'Angular'
-        }
-
-        html_content = str(self.soup).lower()
-        for pattern, tech_name in tech_patterns.items():
+        html_content = self.scan_text().lower()
+        for pattern, tech_name in self.TECH_PATTERNS.items():
             if pattern in html_content:
                 technologies.add(tech_name)
 
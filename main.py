@@ -1,11 +1,22 @@
+import argparse
 import asyncio
 import sys
+from datetime import datetime
+from typing import Any, Dict
+from urllib.parse import urlparse
 from colorama import init, Fore, Style
 from core.analyzer import SiteAnalyzer
 from core.session import SessionManager
 from core.cache import RhinoCache
+from core.checkpoint import CrawlCheckpoint
+from core.coordinator import CrawlCoordinator
+from core.diff import compute_changes, save_changes
+from core.store import ResultStore, flatten
+from core.transport import TRANSPORTS
+from core.proxies import ProxyTransport
 from utils.html_generator import HTMLReportGenerator
-from config.settings import Settings
+from utils.log import ProgressLine, setup_logging
+from config.settings import PROFILES, Settings
 
 init(autoreset=True)
 
@@ -18,30 +29,192 @@ ASCII_ART = """
 """
 
 
-async def main():
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RhinoScraper - Advanced OSINT Tool")
+    parser.add_argument('url', nargs='?', help="URL to analyze (prompted if omitted)")
+    parser.add_argument('--config', metavar='PATH',
+                        help="TOML or YAML settings file (default: rhinoscraper.toml/.yaml if present)")
+    parser.add_argument('--profile', metavar='NAME',
+                        help=f"Tuned settings bundle: {', '.join(sorted(PROFILES))}, "
+                             f"or a profile defined in the settings file")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help="Override any setting, e.g. --set TIMEOUT=30 (repeatable)")
+    parser.add_argument('--depth', type=int, metavar='N',
+                        help="Maximum crawl depth (prompted if omitted, up to MAX_DEPTH)")
+    parser.add_argument('--checkpoint', metavar='PATH',
+                        help="Checkpoint file (default: rhinoscraper_checkpoint_[domain].pkl)")
+    parser.add_argument('--resume', metavar='PATH',
+                        help="Resume an interrupted crawl from a checkpoint file")
+    parser.add_argument('--since', metavar='PATH',
+                        help="Checkpoint of a previous scan: only changed pages are re-extracted "
+                             "and a change set is reported")
+    parser.add_argument('--store', metavar='PATH',
+                        help="SQLite result store (default: rhinoscraper_results.db)")
+    parser.add_argument('--time-limit', type=int, metavar='SECONDS',
+                        help="Stop crawling after this many seconds (best pages are fetched first)")
+    parser.add_argument('--max-pages', type=int, metavar='N', help="Maximum number of pages to analyze")
+    parser.add_argument('--max-bytes', type=int, metavar='N', help="Maximum number of HTML bytes to download")
+    parser.add_argument('--http-backend', choices=sorted(TRANSPORTS),
+                        help="HTTP client: aiohttp (HTTP/1.1, default) or httpx (HTTP/2)")
+    parser.add_argument('--proxies', metavar='FILE',
+                        help="File with one HTTP or SOCKS proxy URL per line, requests are spread over them")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Log verbosity (default: INFO, DEBUG lists every page and link)")
+    parser.add_argument('--log-file', metavar='PATH', help="Also write logs as JSON lines to this file")
+    parser.add_argument('--targets', metavar='FILE',
+                        help="File with one URL per line, crawled by several worker processes")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Number of worker processes for --targets (default: one per core)")
+    return parser.parse_args()
+
+
+def cli_overrides(args: argparse.Namespace) -> Dict[str, Any]:
+    """Réglages donnés en ligne de commande, prioritaires sur le fichier et l'environnement"""
+    overrides: Dict[str, Any] = {}
+    for item in args.set:
+        name, separator, value = item.partition('=')
+        if not separator:
+            raise ValueError(f"Expected NAME=VALUE, got '{item}'")
+        overrides[name.strip()] = value
+    for option, name in (('depth', 'MAX_DEPTH'),
+                         ('time_limit', 'CRAWL_TIME_LIMIT'), ('max_pages', 'CRAWL_MAX_PAGES'),
+                         ('max_bytes', 'CRAWL_MAX_BYTES'), ('http_backend', 'HTTP_BACKEND'),
+                         ('log_level', 'LOG_LEVEL'), ('log_file', 'LOG_FILE')):
+        if (value := getattr(args, option)) is not None:
+            overrides[name] = value
+    if args.proxies:
+        with open(args.proxies, encoding='utf-8') as f:
+            overrides['PROXIES'] = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return overrides
+
+
+def save_to_store(args: argparse.Namespace, results: Dict[str, Any], started_at: str) -> None:
+    """Enregistre chaque cible analysée comme un run du stockage SQLite"""
+    store = ResultStore(args.store or Settings.get_instance().RESULT_STORE)
+    try:
+        for seed, result in results.items():
+            store.save_run(seed, flatten(result), started_at)
+        print(f"{Fore.GREEN}Results stored in {store.path}{Style.RESET_ALL}")
+    finally:
+        store.close()
+
+
+async def analyze_targets(args: argparse.Namespace) -> None:
+    """Analyse d'une liste de cibles répartie par hôte sur plusieurs processus"""
+    with open(args.targets, encoding='utf-8') as f:
+        seeds = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not seeds:
+        raise ValueError(f"No targets found in {args.targets}")
+
+    coordinator = CrawlCoordinator(args.workers)
+    print(f"\n{Fore.YELLOW}Starting analysis of {len(seeds)} targets "
+          f"with {coordinator.workers} workers...{Style.RESET_ALL}")
+
+    started_at = datetime.now().isoformat()
+    results = await asyncio.to_thread(coordinator.run, seeds)
+    results = {url: result for url, result in results.items() if result is not None}
+    save_to_store(args, results, started_at)
+    html_report = HTMLReportGenerator.generate(results)
+    filename = HTMLReportGenerator.save_report(html_report, seeds[0])
+
+    print(f"\n{Fore.GREEN}Analysis complete! {len(results)}/{len(seeds)} targets analyzed, "
+          f"report saved as {filename}{Style.RESET_ALL}")
+
+
+async def main(args: argparse.Namespace):
     print(f"{Fore.CYAN}{ASCII_ART}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}Welcome to RhinoScraper - Advanced OSINT Tool{Style.RESET_ALL}")
 
     try:
-        url = input("Enter URL to analyze: ")
-        settings = Settings.get_instance()  # Utilisation des settings
+        settings = Settings.load(args.config, args.profile, cli_overrides(args))
+        setup_logging(settings.LOG_LEVEL, settings.LOG_FILE or None)
+        state = None
+
+        if args.targets:
+            await analyze_targets(args)
+            return
+
+        if args.resume:
+            checkpoint = CrawlCheckpoint(args.resume, settings.CHECKPOINT_INTERVAL,
+                                         settings.CHECKPOINT_EVERY_PAGES)
+            state = checkpoint.load()
+            if state is None:
+                raise ValueError(f"Cannot resume from {args.resume}")
+            url = state['seed']
+        else:
+            url = args.url or input("Enter URL to analyze: ")
 
-        max_depth = int(input(f"Enter maximum depth (1-{settings.MAX_DEPTH}): "))
-        if not (1 <= max_depth <= settings.MAX_DEPTH):
-            raise ValueError(f"Depth must be between 1 and {settings.MAX_DEPTH}")
+            if args.depth is None:
+                max_depth = int(input(f"Enter maximum depth (1-{settings.MAX_DEPTH}): "))
+                if not (1 <= max_depth <= settings.MAX_DEPTH):
+                    raise ValueError(f"Depth must be between 1 and {settings.MAX_DEPTH}")
+                # Profondeur saisie : prioritaire comme une option de ligne de commande
+                settings = Settings.load(args.config, args.profile, {**cli_overrides(args), 'MAX_DEPTH': max_depth})
+
+            checkpoint_path = args.checkpoint or f"rhinoscraper_checkpoint_{urlparse(url).netloc}.pkl"
+            checkpoint = CrawlCheckpoint(checkpoint_path, settings.CHECKPOINT_INTERVAL,
+                                         settings.CHECKPOINT_EVERY_PAGES)
+
+        # Le scan précédent est chargé avant que le nouveau checkpoint ne l'écrase
+        previous_pages = None
+        if args.since:
+            previous_state = CrawlCheckpoint(args.since).load()
+            if previous_state is None:
+                raise ValueError(f"Cannot load previous scan from {args.since}")
+            previous_pages = previous_state['pages']
 
         session_manager = SessionManager()
         cache = RhinoCache()
-        analyzer = SiteAnalyzer(session_manager, cache)
+        analyzer = SiteAnalyzer(session_manager, cache, checkpoint)
+        if state:
+            analyzer.restore(state)
+        if previous_pages is not None:
+            analyzer.set_baseline(previous_pages)
 
-        print(f"\n{Fore.YELLOW}Starting analysis of {url}...{Style.RESET_ALL}")
+        profile = f" with the {settings.PROFILE} profile" if settings.PROFILE else ''
+        print(f"\n{Fore.YELLOW}Starting analysis of {url}{profile}...{Style.RESET_ALL}")
 
+        progress = ProgressLine(analyzer.progress)
         try:
-            result = await analyzer.analyze(url, depth=0)
-            html_report = HTMLReportGenerator.generate({url: result})
+            started_at = datetime.now().isoformat()
+            if settings.SHOW_PROGRESS:
+                progress.start()
+            try:
+                result = await analyzer.analyze(url, depth=0)
+            finally:
+                await progress.stop()
+            if result is not None:
+                save_to_store(args, {url: result}, started_at)
+
+            changes = None
+            if previous_pages is not None:
+                changes = compute_changes(previous_pages, analyzer.pages)
+                changes_file = save_changes(changes, url)
+                print(f"\n{Fore.GREEN}{changes['total']} changes since previous scan "
+                      f"({analyzer.counters['unchanged']} pages unchanged), "
+                      f"saved as {changes_file}{Style.RESET_ALL}")
+
+            html_report = HTMLReportGenerator.generate({url: result}, changes)
             filename = HTMLReportGenerator.save_report(html_report, url)
 
             print(f"\n{Fore.GREEN}Analysis complete! Report saved as {filename}{Style.RESET_ALL}")
+            if session_manager.transport:
+                stats = session_manager.transport.stats
+                print(f"{stats['requests']} HTTP requests over {stats['connections']} connections "
+                      f"({session_manager.backend})")
+                limits = ', '.join(f"{name} {limit}"
+                                   for name, limit in session_manager.concurrency.limits().items())
+                print(f"Concurrency limits: {limits}")
+                if isinstance(session_manager.transport, ProxyTransport):
+                    for proxy in session_manager.transport.pool.summary():
+                        print(f"Proxy {proxy['proxy']}: {proxy['requests']} requests, "
+                              f"{proxy['failures']} failures, {proxy['hosts']} hosts"
+                              f"{'' if proxy['healthy'] else ' (ejected)'}")
+
+        except asyncio.CancelledError:
+            print(f"\n{Fore.YELLOW}Progress saved to {checkpoint.path}, "
+                  f"continue with --resume {checkpoint.path}{Style.RESET_ALL}")
+            raise
 
         finally:
             await session_manager.close()
@@ -55,4 +228,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        print(f"{Fore.YELLOW}Analysis interrupted by user.{Style.RESET_ALL}")
+        sys.exit(0)
@@ -0,0 +1,55 @@
+import argparse
+import sys
+from colorama import init, Fore, Style
+from config.settings import Settings
+from core.store import ResultStore, ENTITIES
+
+init(autoreset=True)
+
+
+def parse_args() -> argparse.Namespace:
+    settings = Settings.get_instance()
+    parser = argparse.ArgumentParser(description="Query the RhinoScraper result store")
+    parser.add_argument('--db', default=settings.RESULT_STORE, help="Result store (SQLite file)")
+    parser.add_argument('--like', action='store_true', help="Use SQL LIKE patterns (%%, _) instead of exact match")
+    group = parser.add_mutually_exclusive_group(required=True)
+    for entity in ENTITIES:
+        group.add_argument(f"--{entity.replace('_', '-')}", dest=entity, metavar='VALUE')
+    group.add_argument('--header', metavar='NAME[=VALUE]', help="Security header, optionally with a value")
+    group.add_argument('--runs', action='store_true', help="List stored runs")
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    store = ResultStore(args.db)
+    try:
+        if args.runs:
+            for run in store.runs():
+                print(f"#{run['run_id']}  {run['run_at']}  {run['seed']}  ({run['pages']} pages)")
+            return
+
+        if args.header:
+            name, _, value = args.header.partition('=')
+            rows = store.find_header(name, value or None, args.like)
+            for row in rows:
+                print(f"{Fore.CYAN}{row['host']}{Style.RESET_ALL}  {row['name']}: {row['value']}  "
+                      f"(run #{row['run_id']}, {row['run_at']})")
+        else:
+            entity = next(name for name in ENTITIES if getattr(args, name))
+            rows = store.find(entity, getattr(args, entity), args.like)
+            for row in rows:
+                print(f"{Fore.CYAN}{row['host']}{Style.RESET_ALL}  {row['value']}  {row['url']}  "
+                      f"(run #{row['run_id']}, {row['run_at']})")
+
+        hosts = {row['host'] for row in rows}
+        print(f"\n{Fore.GREEN}{len(rows)} matches on {len(hosts)} hosts{Style.RESET_ALL}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    try:
+        main(parse_args())
+    except Exception as e:
+        print(f"{Fore.RED}Query error: {str(e)}{Style.RESET_ALL}")
+        sys.exit(1)
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def settings(tmp_path, monkeypatch):
+    """Paramètres par défaut, sans fichier ni variables RHINO_* ; fichiers écrits dans tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    yield Settings.load(environ={})
+    if hasattr(Settings, '_instance'):
+        del Settings._instance
+
+
+@pytest.fixture
+def make_page():
+    """Fabrique d'AnalysisResult : champs vides sauf ceux passés en argument"""
+    from core.analyzer import AnalysisResult
+
+    def make(url: str, **values) -> AnalysisResult:
+        defaults = dict(status_code=200, analyzed_at='2024-01-01T00:00:00', content={}, security={},
+                        social={}, domain={}, emails=[], phones=[], technologies=[], sensitive_files=[],
+                        internal_links={})
+        return AnalysisResult(url=url, **{**defaults, **values})
+    return make
@@ -0,0 +1,163 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from core.analyzer import CrawlOptions, SiteAnalyzer
+from core.cache import RhinoCache
+from core.diff import compute_changes
+from core.session import SessionManager
+from core.store import flatten
+from core.transport import Transport, TransportResponse
+
+SITE = 'https://example.com'
+PAGES = 10
+
+
+def page(i):
+    links = ''.join(f'<a href="/p{j}">Page {j}</a>' for j in range(i + 1, min(i + 4, PAGES)))
+    return (f"<html><body><header><nav>{links}</nav></header>"
+            f"<main><h1>Page {i}</h1><p>Write to info{i}@example.org about topic {i}.</p></main>"
+            f"<footer>Contact: contact@example.org</footer></body></html>")
+
+
+class SiteTransport(Transport):
+    """Site fictif de PAGES pages et de fichiers exposés ; enregistre les requêtes"""
+
+    def __init__(self, concurrency=None, proxy=None):
+        super().__init__(concurrency, proxy)
+        self.requests = []
+        self.exposed = set()
+
+    async def _request(self, method, url, max_bytes, allow_redirects, headers=None):
+        self.requests.append((method, url))
+        await asyncio.sleep(0.001)
+        path = url[len(SITE):] or '/'
+        if path == '/':
+            path = '/p0'
+        if path.startswith('/p') and path[2:].isdigit() and int(path[2:]) < PAGES:
+            body = page(int(path[2:])).encode()
+            return TransportResponse(url=url, status=200, headers={'Content-Type': 'text/html'}, body=body)
+        if path in self.exposed:
+            return TransportResponse(url=url, status=200, headers={}, body=b'')
+        return TransportResponse(url=url, status=404, headers={}, body=b'')
+
+    async def close(self):
+        pass
+
+
+async def aenumerate(iterator):
+    index = 0
+    async for item in iterator:
+        yield index, item
+        index += 1
+
+
+@pytest.fixture
+def site(settings, tmp_path):
+    settings.EXTRACTORS = ['content', 'email']
+    settings.SCAN_ASSETS = settings.SCAN_DOCUMENTS = settings.CHECK_DELIVERABILITY = False
+    settings.MAX_DEPTH = PAGES
+
+    def make_analyzer(cache_name='cache'):
+        session_manager = SessionManager()
+        session_manager.transport = SiteTransport(session_manager.concurrency)
+        return SiteAnalyzer(session_manager, RhinoCache(str(tmp_path / cache_name)))
+    return make_analyzer
+
+
+def test_crawl_yields_every_page(site):
+    async def run():
+        analyzer = site()
+        async with aclosing(analyzer.crawl(f"{SITE}/")) as pages:
+            return [result.url async for result in pages]
+    urls = asyncio.run(run())
+    assert sorted(urls) == sorted([f"{SITE}/"] + [f"{SITE}/p{i}" for i in range(1, PAGES)])
+
+
+@pytest.mark.parametrize('buffer_size', [1, 3])
+def test_work_ahead_of_the_consumer_is_bounded_by_buffer_size(site, buffer_size):
+    async def run():
+        analyzer = site()
+        ahead = []
+        async with aclosing(analyzer.crawl(f"{SITE}/", CrawlOptions(buffer_size=buffer_size))) as pages:
+            async for index, _ in aenumerate(pages):
+                await asyncio.sleep(0.05)
+                ahead.append(len(analyzer.pages) - index - 1)
+        return ahead
+    assert max(asyncio.run(run())) <= buffer_size
+
+
+def test_closing_the_generator_stops_the_crawl(site):
+    async def run():
+        analyzer = site()
+        async with aclosing(analyzer.crawl(f"{SITE}/", CrawlOptions(buffer_size=1))) as pages:
+            async for _ in pages:
+                break
+        done = len(analyzer.pages)
+        await asyncio.sleep(0.1)
+        return done, len(analyzer.pages), analyzer._crawl_task
+    done, later, task = asyncio.run(run())
+    assert done == later < PAGES
+    assert task is None
+
+
+def test_analyze_returns_the_page_tree(site):
+    async def run():
+        async with site() as analyzer:
+            return await analyzer.analyze(f"{SITE}/")
+    tree = asyncio.run(run())
+    assert len(flatten(tree)) == PAGES
+    assert {email['email'] for email in tree.emails} == {'info0@example.org', 'contact@example.org'}
+
+
+def test_incremental_scan_reuses_unchanged_pages(site, settings):
+    settings.EXTRACTORS = ['content', 'email', 'sensitive_files']
+
+    async def scan(cache_name, baseline=None, exposed=()):
+        async with site(cache_name) as analyzer:
+            analyzer.session_manager.transport.exposed.update(exposed)
+            if baseline is not None:
+                analyzer.set_baseline(baseline)
+            tree = await analyzer.analyze(f"{SITE}/")
+            return tree, analyzer.session_manager.transport.requests, analyzer.counters['unchanged']
+
+    first, first_requests, _ = asyncio.run(scan('first'))
+    # Fichier exposé depuis le scan précédent, derrière une page inchangée
+    rescan, requests, unchanged = asyncio.run(
+        scan('rescan', {result.url: result for result in flatten(first)}, exposed={'/.env'}))
+    assert unchanged == PAGES
+    assert rescan.emails == first.emails
+    # Contenu non ré-extrait, mais fichiers sensibles sondés de nouveau, une fois par préfixe d'URL
+    assert sorted(requests) == sorted(first_requests)
+    assert first.sensitive_files == []
+    assert [item['url'] for item in rescan.sensitive_files] == [f"{SITE}/.env"]
+    changes = compute_changes({page.url: page for page in flatten(first)}, {page.url: page for page in flatten(rescan)})
+    assert [item['value'] for item in changes['sensitive_files']['added']] == [f"{SITE}/.env (200)"]
+
+
+def test_resume_keeps_depth_and_budget(site, settings):
+    settings.CRAWL_MAX_PAGES = 5
+
+    async def interrupted():
+        async with site('first') as analyzer:
+            async with aclosing(analyzer.crawl(f"{SITE}/", CrawlOptions(max_depth=2, buffer_size=1))) as pages:
+                async for _ in pages:
+                    break
+            return analyzer.state()
+
+    async def resumed(state):
+        async with site('resumed') as analyzer:
+            analyzer.restore(state)
+            await analyzer.analyze(state['seed'])
+            return analyzer
+
+    state = asyncio.run(interrupted())
+    assert state['max_depth'] == 2 and 0 < state['budget']['pages'] < 5
+    analyzer = asyncio.run(resumed(state))
+    # Profondeur 2 : p0 à p6 ; budget de 5 pages décompté depuis le début du crawl
+    assert analyzer.settings.MAX_DEPTH == 2
+    assert analyzer.stop_reason == 'page limit'
+    assert analyzer.budget.pages == len(analyzer.pages) == 5
+    sizes = {f"{SITE}/": len(page(0)), **{f"{SITE}/p{i}": len(page(i)) for i in range(1, PAGES)}}
+    assert analyzer.budget.bytes == sum(sizes[url] for url in analyzer.pages)
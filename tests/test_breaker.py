@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+from core import breaker as breaker_module
+from core.assets import AssetScanner
+from core.breaker import CircuitBreaker
+from core.cache import RhinoCache
+from core.documents import DocumentScanner
+from core.frontier import Frontier
+from core.transport import TransportResponse
+
+
+def make_breaker(monkeypatch, **options):
+    now = [0.0]
+    monkeypatch.setattr(breaker_module.time, 'monotonic', lambda: now[0])
+    return CircuitBreaker(**options), now
+
+
+def test_circuit_opens_after_consecutive_failures(monkeypatch):
+    breaker, now = make_breaker(monkeypatch, failure_threshold=3, cool_down=60)
+    breaker.record_failure('example.com')
+    breaker.record_failure('example.com')
+    breaker.record_success('example.com')
+    breaker.record_failure('example.com')
+    breaker.record_failure('example.com')
+    assert breaker.allow('example.com')
+    breaker.record_failure('example.com')
+    assert not breaker.allow('example.com')
+    assert breaker.retry_after('example.com') == 60
+    assert breaker.open_keys() == {'example.com': 3}
+    assert breaker.allow('other.example')
+
+
+def test_half_open_allows_a_single_probe(monkeypatch):
+    breaker, now = make_breaker(monkeypatch, failure_threshold=1, cool_down=10)
+    breaker.record_failure('example.com')
+    now[0] = 10
+    assert breaker.allow('example.com')
+    assert not breaker.allow('example.com')  # une seule requête d'essai
+    breaker.release('example.com')
+    assert breaker.allow('example.com')
+    breaker.record_success('example.com')
+    assert breaker.allow('example.com') and breaker.allow('example.com')
+    assert breaker.open_keys() == {}
+
+
+def test_failed_probe_reopens_and_key_is_abandoned_after_max_trips(monkeypatch):
+    breaker, now = make_breaker(monkeypatch, failure_threshold=1, cool_down=10, max_trips=2)
+    breaker.record_failure('example.com')
+    now[0] = 10
+    assert breaker.allow('example.com')
+    breaker.record_failure('example.com')
+    assert not breaker.allow('example.com')
+    assert breaker.abandoned('example.com')
+    assert breaker.retry_after('example.com') is None
+    now[0] = 1000
+    assert not breaker.allow('example.com')
+
+
+def test_held_frontier_entries_come_back_after_the_delay():
+    async def run():
+        frontier = Frontier()
+        frontier.push('https://example.com/', 0)
+        entry = await frontier.get()
+        frontier.hold(entry, 0.01)
+        assert len(frontier) == 0
+        assert [e.url for e in frontier.snapshot()] == ['https://example.com/']
+        again = await asyncio.wait_for(frontier.get(), 1)
+        frontier.task_done(again)
+        return again, await frontier.get()
+    again, end = asyncio.run(run())
+    assert again.url == 'https://example.com/' and end is None
+
+
+class SlowExtractor:
+    url = 'https://example.com/'
+    timeout = 0.01
+
+    async def extract(self):
+        await asyncio.sleep(1)
+
+
+def test_extractor_timeouts_give_partial_results_then_open_the_circuit(settings):
+    from core.analyzer import SiteAnalyzer
+
+    settings.BREAKER_FAILURE_THRESHOLD = 2
+
+    async def run():
+        async with SiteAnalyzer() as analyzer:
+            return [await analyzer._run_extractor(SlowExtractor(), 'example.com') for _ in range(3)]
+    assert asyncio.run(run()) == [('SlowExtractor', 'timeout')] * 2 + [('SlowExtractor', 'circuit open')]
+
+
+class FailingSession:
+    """SessionManager minimal : chaque requête reçoit une erreur 503"""
+
+    concurrency = SimpleNamespace(ceiling=4)
+
+    def __init__(self):
+        self.fetched = []
+
+    async def fetch(self, url, **options):
+        self.fetched.append(url)
+        return TransportResponse(url=url, status=503, headers={}, body=b'')
+
+
+def test_assets_and_documents_respect_the_host_circuit(tmp_path):
+    breaker = CircuitBreaker(failure_threshold=2)
+    session = FailingSession()
+    cache = RhinoCache(str(tmp_path / 'cache'))
+    assets = AssetScanner(session, cache, breaker)
+    documents = DocumentScanner(session, cache, breaker)
+    pages = {'https://example.com/': SimpleNamespace(
+        asset_urls=[f"https://example.com/{i}.js" for i in range(4)],
+        document_urls=['https://example.com/report.pdf'])}
+
+    async def run():
+        # Deux échecs ouvrent le circuit : les requêtes suivantes ne partent pas
+        for i in range(2):
+            await assets._scan_asset(f"https://example.com/{i}.js")
+        await assets.scan(pages)
+        await documents.scan(pages)
+    asyncio.run(run())
+    assert session.fetched == ['https://example.com/0.js', 'https://example.com/1.js']
+    # Réponses 503 déjà obtenues (et mises en cache), puis assets refusés
+    assert [asset.get('error') or asset['status'] for asset in pages['https://example.com/'].assets] == \
+        [503, 503, 'circuit open', 'circuit open']
+    assert pages['https://example.com/'].documents[0]['error'] == 'circuit open'
@@ -0,0 +1,65 @@
+from bs4 import BeautifulSoup
+
+from core import budget as budget_module
+from core.budget import CrawlBudget
+from core.scoring import LinkScorer
+
+
+def test_unlimited_budget_is_never_exhausted():
+    budget = CrawlBudget()
+    budget.start()
+    budget.add_page()
+    budget.add_bytes(10 ** 9)
+    assert budget.exhausted(in_progress=100) is None
+    assert budget.time_left() is None
+    assert budget.host_allowed({'pages': 10 ** 6, 'bytes': 10 ** 12})
+
+
+def test_page_limit_counts_pages_in_progress():
+    budget = CrawlBudget(max_pages=3)
+    budget.add_page()
+    assert budget.exhausted(in_progress=1) is None
+    assert budget.exhausted(in_progress=2) == 'page limit'
+
+
+def test_byte_and_time_limits(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(budget_module.time, 'monotonic', lambda: now[0])
+    budget = CrawlBudget(max_bytes=1000, time_limit=30)
+    budget.start()
+    budget.add_bytes(999)
+    assert budget.exhausted() is None
+    now[0] += 10
+    assert budget.time_left() == 20
+    budget.add_bytes(1)
+    assert budget.exhausted() == 'byte limit'
+    now[0] += 20
+    assert budget.exhausted() == 'time limit'
+
+
+def test_per_host_limits():
+    budget = CrawlBudget(max_pages_per_host=2, max_bytes_per_host=500)
+    assert budget.host_allowed({'pages': 1, 'bytes': 499})
+    assert not budget.host_allowed({'pages': 2, 'bytes': 0})
+    assert not budget.host_allowed({'pages': 0, 'bytes': 500})
+
+
+def test_budget_from_settings(settings):
+    settings.CRAWL_MAX_PAGES = 7
+    assert CrawlBudget.from_settings().max_pages == 7
+
+
+def test_contact_and_legal_pages_rank_above_archives():
+    scorer = LinkScorer()
+    contact = scorer.score('https://example.com/contact')
+    archive = scorer.score('https://example.com/blog/tag/news/page/3')
+    article = scorer.score('https://example.com/blog/2024/01/02/post')
+    assert contact > article > archive
+
+
+def test_anchor_text_and_footer_position_raise_the_score():
+    soup = BeautifulSoup('<main><a href="/x">Read</a></main><footer><a href="/x">Imprint</a></footer>',
+                         'html.parser')
+    body_link, footer_link = soup.find_all('a')
+    scorer = LinkScorer()
+    assert scorer.score('https://example.com/x', footer_link, 1.0) > scorer.score('https://example.com/x', body_link)
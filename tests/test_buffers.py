@@ -0,0 +1,76 @@
+import asyncio
+
+from bs4 import BeautifulSoup
+
+from extractors.buffers import SEPARATOR, PageBuffers
+from extractors.content import ContentExtractor
+from extractors.email import EmailExtractor
+from extractors.phone import PhoneExtractor
+from extractors.social import SocialExtractor
+
+URL = 'https://example.com/'
+HTML = """<html>
+<head><title>Titre caché</title><meta name="author" content="Alice Martin"></head>
+<body>
+<h1>Bienvenue</h1>
+<p>Écrire à <b>info@example.org</b></p>
+<script>var tag = "G-ABC1234"; var mail = "script@example.org";</script>
+<style>.x { color: red }</style>
+<svg><text>dessin</text></svg>
+<!-- commentaire@example.org -->
+<a href="https://twitter.com/rhino">Suivez-nous</a>
+<p>Appeler le +33 1 42 68 53 00</p>
+<footer>Contact : contact@example.org</footer>
+</body>
+</html>"""
+
+
+def buffers():
+    return PageBuffers(BeautifulSoup(HTML, 'html.parser'))
+
+
+def extract(extractor_class, page=None):
+    page = page or buffers()
+    return asyncio.run(extractor_class(page.soup, URL, page).extract())
+
+
+def test_text_holds_only_visible_text():
+    assert buffers().text.split(SEPARATOR) == [
+        'Bienvenue', 'Écrire à', 'info@example.org', 'Suivez-nous', 'Appeler le +33 1 42 68 53 00',
+        'Contact : contact@example.org']
+
+
+def test_attributes_and_scripts_are_collected_separately():
+    page = buffers()
+    assert page.attrs.split(SEPARATOR) == ['Alice Martin', 'https://twitter.com/rhino']
+    assert page.get('scripts') == 'var tag = "G-ABC1234"; var mail = "script@example.org";'
+    assert page.get('markup') == str(page.soup)
+    assert page.get('markup') is page.get('markup')
+
+
+def test_source_position_of_each_segment():
+    page = buffers()
+    text = page.text
+    assert page.source_position('text', text.index('Bienvenue')) == (4, 0)
+    assert page.source_position('text', text.index('info@')) == (5, 12)
+    # Tout offset d'un segment renvoie la position de son élément
+    assert page.source_position('text', text.index('contact@')) == (12, 0)
+    assert page.source_position('text', len(text) - 1) == (12, 0)
+    assert page.source_position('attrs', page.attrs.index('twitter')) == (10, 0)
+    assert page.source_position('scripts', 0) == (6, 0)
+    assert page.source_position('text', -1) is None
+    assert PageBuffers(BeautifulSoup('', 'html.parser')).source_position('text', 0) is None
+
+
+def test_emails_keep_their_source_line():
+    emails = {item['email']: item['line'] for item in extract(EmailExtractor)['emails']}
+    # Ni scripts ni commentaires
+    assert emails == {'info@example.org': 5, 'contact@example.org': 12}
+
+
+def test_other_extractors_read_their_buffers():
+    page = buffers()
+    assert extract(PhoneExtractor, page)['phones'] == ['+33 1 42 68 53 00']
+    assert extract(SocialExtractor, page)['social_media']['links'] == {
+        'twitter': {'links': ['twitter.com/rhino'], 'count': 1}}
+    assert ContentExtractor(page.soup, URL, page)._extract_analytics_ids() == ['G-ABC1234']
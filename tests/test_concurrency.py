@@ -0,0 +1,86 @@
+import asyncio
+
+from core import concurrency as concurrency_module
+from core.concurrency import OK, THROTTLED, TIMEOUT, AdaptiveLimiter, ConcurrencyController
+
+
+def saturate(limiter, outcome=OK, latency=0.1):
+    """Remplit la limite puis libère une requête"""
+    limiter.in_flight = int(limiter.limit)
+    limiter.release(latency, outcome)
+
+
+def test_limit_grows_additively_only_when_saturated():
+    limiter = AdaptiveLimiter('example.com', initial=2, maximum=4)
+    limiter.in_flight = 1
+    limiter.release(0.1, OK)
+    assert limiter.limit == 2
+    # + 1/limite par requête : environ +1 par fenêtre complète
+    for _ in range(2):
+        saturate(limiter)
+    assert 2 < limiter.limit < 3
+    saturate(limiter)
+    assert int(limiter.limit) == 3
+    for _ in range(100):
+        saturate(limiter)
+    assert limiter.limit == 4
+
+
+def test_overload_halves_the_limit_once_per_round_trip(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(concurrency_module.time, 'monotonic', lambda: now[0])
+    limiter = AdaptiveLimiter('example.com', initial=16, maximum=32)
+    saturate(limiter, THROTTLED)
+    saturate(limiter, TIMEOUT)
+    assert limiter.limit == 8
+    now[0] += 2
+    saturate(limiter, TIMEOUT)
+    assert limiter.limit == 4
+
+
+def test_rising_latency_is_an_overload_signal():
+    limiter = AdaptiveLimiter('example.com', initial=8, maximum=32, latency_tolerance=2.0)
+    for _ in range(20):
+        limiter.in_flight = 1
+        limiter.release(0.1, OK)
+    limiter._last_decrease = -10.0
+    for _ in range(3):
+        limiter.in_flight = 1
+        limiter.release(2.0, OK)
+    assert limiter.limit < 8
+
+
+def test_fixed_limit_queues_requests_in_order():
+    async def run():
+        limiter = AdaptiveLimiter('example.com', initial=1, adaptive=False)
+        order = []
+
+        async def request(name):
+            await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(0)
+            limiter.release(0.0, TIMEOUT)
+
+        await asyncio.gather(*[request(name) for name in 'abc'])
+        return order, limiter.limit
+    assert asyncio.run(run()) == (['a', 'b', 'c'], 1)
+
+
+def test_controller_slots_are_limited_per_host():
+    async def run():
+        controller = ConcurrencyController(initial=1, maximum=4, host_maximum=1, adaptive=False)
+        active, peak = {'a': 0, 'b': 0}, {'a': 0, 'b': 0}
+
+        async def request(host):
+            async with controller.slot(host) as outcome:
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+                await asyncio.sleep(0.001)
+                active[host] -= 1
+                outcome['result'] = OK
+
+        await asyncio.gather(*[request(host) for host in 'abab'])
+        return peak, controller.limits()
+    peak, limits = asyncio.run(run())
+    assert peak == {'a': 1, 'b': 1}
+    assert limits == {'all hosts': 1, 'a': 1, 'b': 1}
@@ -0,0 +1,25 @@
+import queue
+
+from core.coordinator import CrawlCoordinator, HashRing, _take_host_group
+
+
+def test_hosts_are_sharded_consistently():
+    seeds = ['https://a.example/', 'https://a.example/contact', 'https://b.example/', 'https://c.example/']
+    shards = CrawlCoordinator(workers=3).shard(seeds)
+    groups = {host: urls for shard in shards for host, urls in shard.items()}
+    assert groups == {'a.example': seeds[:2], 'b.example': [seeds[2]], 'c.example': [seeds[3]]}
+    ring = HashRing(3)
+    assert all(host in shards[ring.node_for(host)] for host in groups)
+
+
+def test_workers_steal_groups_and_leave_sentinels_in_place():
+    shards = [queue.Queue(), queue.Queue()]
+    shards[0].put(None)
+    shards[1].put(('b.example', ['https://b.example/']))
+    shards[1].put(None)
+
+    assert _take_host_group(0, shards) == ('b.example', ['https://b.example/'])
+    assert _take_host_group(0, shards) is None
+    # Les files épuisées répondent encore None à leur propriétaire
+    assert _take_host_group(1, shards) is None
+    assert shards[0].get_nowait() is None and shards[1].get_nowait() is None
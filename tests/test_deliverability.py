@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import dns.exception
+import dns.name
+import dns.resolver
+import pytest
+
+from core.deliverability import DeliverabilityChecker
+from core.intel import DomainIntelStore
+
+
+class FakeResolver:
+    """Réponses DNS fixées : (domaine, type) -> enregistrements ou exception ; NoAnswer sinon"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    async def resolve(self, domain, rdtype, search=True):
+        self.queries.append((domain, rdtype))
+        answer = self.answers.get((domain, rdtype), dns.resolver.NoAnswer)
+        if isinstance(answer, type) and issubclass(answer, Exception):
+            raise answer()
+        return answer
+
+
+def mx(preference, exchange):
+    return SimpleNamespace(preference=preference, exchange=dns.name.from_text(exchange))
+
+
+@pytest.fixture
+def checker(tmp_path):
+    def make(answers, store=None):
+        checker = DeliverabilityChecker(store or DomainIntelStore(str(tmp_path / 'intel.db')))
+        checker.resolver = FakeResolver(answers)
+        return checker
+    return make
+
+
+def check(checker, domain):
+    return asyncio.run(checker.check([domain]))[domain]
+
+
+def test_mx_records_sorted_by_preference(checker):
+    result = check(checker({('example.org', 'MX'): [mx(20, 'mx2.example.org.'), mx(10, 'mx1.example.org.')]}),
+                   'example.org')
+    assert result == {'deliverable': True, 'mx': ['mx1.example.org', 'mx2.example.org'], 'reason': None}
+
+
+def test_null_mx_is_not_deliverable(checker):
+    fake = checker({('example.org', 'MX'): [mx(0, '.')], ('example.org', 'A'): ['192.0.2.10']})
+    assert check(fake, 'example.org') == {'deliverable': False, 'mx': [], 'reason': 'null MX'}
+    # Pas de repli sur A/AAAA
+    assert fake.resolver.queries == [('example.org', 'MX')]
+
+
+def test_implicit_mx_from_address_records(checker):
+    fake = checker({('example.org', 'AAAA'): ['2001:db8::1']})
+    assert check(fake, 'example.org') == {'deliverable': True, 'mx': ['example.org'], 'reason': 'implicit MX'}
+    assert fake.resolver.queries == [('example.org', 'MX'), ('example.org', 'A'), ('example.org', 'AAAA')]
+    assert check(checker({}), 'other.example') == {'deliverable': False, 'mx': [],
+                                                    'reason': 'no MX or address records'}
+
+
+def test_unknown_domain(checker):
+    assert check(checker({('nowhere.example', 'MX'): dns.resolver.NXDOMAIN}), 'nowhere.example') == \
+        {'deliverable': False, 'mx': [], 'reason': 'domain does not exist'}
+
+
+@pytest.mark.parametrize('failure', [dns.exception.Timeout, dns.resolver.NoNameservers])
+def test_dns_failures_are_inconclusive(checker, failure):
+    result = check(checker({('example.org', 'MX'): failure}), 'example.org')
+    assert result['deliverable'] is None
+    assert result['mx'] == [] and result['reason']
+
+
+def test_one_lookup_per_domain(checker, make_page, tmp_path):
+    answers = {('example.org', 'MX'): [mx(10, 'mx.example.org.')]}
+    emails = [{'email': f"user{i}@{domain}", 'domain': domain} for i, domain in
+              enumerate(['example.org', 'Example.ORG', 'example.org'])]
+    pages = {'/a': make_page('/a', emails=emails[:2]), '/b': make_page('/b', emails=emails[2:])}
+    store = DomainIntelStore(str(tmp_path / 'shared.db'))
+
+    fake = checker(answers, store)
+    results = asyncio.run(fake.annotate(pages))
+    assert fake.resolver.queries == [('example.org', 'MX')]
+    assert list(results) == ['example.org']
+    assert all(email['deliverable'] is True and email['mx'] == ['mx.example.org'] for email in emails)
+    # Résultat réutilisé par les runs suivants
+    again = checker(answers, store)
+    asyncio.run(again.check(['example.org']))
+    assert again.resolver.queries == []
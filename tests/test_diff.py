@@ -0,0 +1,38 @@
+from core.diff import compute_changes
+
+
+def test_compute_changes_reports_pages_entities_and_host_facts(make_page):
+    previous = {
+        'https://example.com/': make_page(
+            'https://example.com/', content_hash='a',
+            emails=[{'email': 'old@example.com'}], technologies=['WordPress'],
+            security={'headers': {'X-Frame-Options': 'Missing'}, 'ssl': {'expiry': '2024'}}),
+        'https://example.com/gone': make_page('https://example.com/gone', content_hash='g'),
+    }
+    current = {
+        'https://example.com/': make_page(
+            'https://example.com/', content_hash='b',
+            emails=[{'email': 'new@example.com'}], technologies=['WordPress'], phones=['+33 1 00 00 00 00'],
+            sensitive_files=[{'url': 'https://example.com/.env', 'status': 200}],
+            security={'headers': {'X-Frame-Options': 'DENY'}, 'ssl': {'expiry': '2024'}}),
+        'https://example.com/new': make_page('https://example.com/new', content_hash='n'),
+    }
+    changes = compute_changes(previous, current)
+
+    assert changes['pages'] == {'added': ['https://example.com/new'], 'removed': ['https://example.com/gone'],
+                                'changed': ['https://example.com/']}
+    assert changes['emails'] == {'added': [{'value': 'new@example.com', 'pages': ['https://example.com/']}],
+                                 'removed': [{'value': 'old@example.com', 'pages': ['https://example.com/']}]}
+    assert changes['technologies'] == {'added': [], 'removed': []}
+    assert [item['value'] for item in changes['phones']['added']] == ['+33 1 00 00 00 00']
+    assert [item['value'] for item in changes['sensitive_files']['added']] == ['https://example.com/.env (200)']
+    assert changes['headers'] == [{'host': 'example.com', 'name': 'X-Frame-Options',
+                                   'before': 'Missing', 'after': 'DENY'}]
+    assert changes['certificates'] == []
+    assert changes['total'] == 3 + 2 + 1 + 1 + 1
+
+
+def test_identical_scans_have_no_changes(make_page):
+    pages = {'https://example.com/': make_page('https://example.com/', content_hash='a',
+                                               emails=[{'email': 'a@example.com'}])}
+    assert compute_changes(pages, dict(pages))['total'] == 0
@@ -0,0 +1,35 @@
+from core.fingerprint import DuplicateIndex, fingerprint, hamming_distance, simhash
+
+TEXT = ("RhinoScraper collects emails, phone numbers and technologies from every page "
+        "of a site and reports them in a single document for the analyst. ") * 3
+
+
+def test_simhash_depends_on_words_not_on_spacing_or_case():
+    assert simhash(TEXT) == simhash('  ' + TEXT.upper().replace(' ', '\n'))
+
+
+def test_similar_texts_are_close_and_different_texts_are_far():
+    near = TEXT + "Updated today."
+    assert hamming_distance(simhash(TEXT), simhash(near)) <= 3
+    assert hamming_distance(simhash(TEXT), simhash("A completely unrelated recipe for pancakes.")) > 10
+
+
+def test_content_hash_covers_the_markup():
+    assert fingerprint('<p>a</p>', 'a').content_hash != fingerprint('<p class="x">a</p>', 'a').content_hash
+    assert fingerprint('<p>a</p>', 'a') == fingerprint('<p>a</p>', 'a')
+
+
+def test_duplicate_index_finds_the_closest_page_under_the_threshold():
+    index = DuplicateIndex(max_distance=3)
+    base = simhash(TEXT)
+    index.add(base ^ 0b111, 'https://example.com/three')
+    index.add(base ^ 0b1, 'https://example.com/one')
+    assert index.find(base) == ('https://example.com/one', 1)
+    assert DuplicateIndex(max_distance=3).find(base) is None
+
+
+def test_duplicate_index_ignores_pages_beyond_the_threshold():
+    index = DuplicateIndex(max_distance=3)
+    base = simhash(TEXT)
+    index.add(base ^ 0b1111, 'https://example.com/four')
+    assert index.find(base) is None
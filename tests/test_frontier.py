@@ -0,0 +1,57 @@
+import asyncio
+
+from core.frontier import Frontier, FrontierEntry
+
+
+def drain(frontier):
+    async def run():
+        urls = []
+        while (entry := await frontier.get()) is not None:
+            urls.append(entry.url)
+            frontier.task_done(entry)
+        return urls
+    return asyncio.run(run())
+
+
+def test_entries_come_out_by_score_then_depth_then_insertion():
+    frontier = Frontier()
+    frontier.push('deep', 2, score=1.0)
+    frontier.push('first', 1)
+    frontier.push('second', 1)
+    frontier.push('shallow', 0)
+    frontier.push('best', 3, score=5.0)
+    assert drain(frontier) == ['best', 'deep', 'shallow', 'first', 'second']
+
+
+def test_get_returns_none_once_nothing_is_pending_or_in_flight():
+    async def run():
+        frontier = Frontier()
+        frontier.push('a', 0)
+        entry = await frontier.get()
+        waiter = asyncio.ensure_future(frontier.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()  # une entrée en cours peut encore produire des liens
+        frontier.push('b', 1, 'a')
+        frontier.task_done(entry)
+        second = await waiter
+        frontier.task_done(second)
+        return second.url, await frontier.get()
+    assert asyncio.run(run()) == ('b', None)
+
+
+def test_requeue_and_snapshot_keep_unfinished_entries():
+    async def run():
+        frontier = Frontier()
+        frontier.push('a', 0)
+        frontier.push('b', 1)
+        frontier.push('c', 1)
+        a = await frontier.get()
+        b = await frontier.get()
+        frontier.requeue(b)
+        frontier.defer(FrontierEntry('d', 2, 'a'))
+        return a, frontier
+    a, frontier = asyncio.run(run())
+    assert len(frontier) == 2
+    assert frontier.in_flight == 1 and frontier.deferred == 1
+    # En cours d'abord, puis en attente (b remise derrière c), puis mises de côté
+    assert [entry.url for entry in frontier.snapshot()] == ['a', 'c', 'b', 'd']
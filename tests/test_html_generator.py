@@ -0,0 +1,34 @@
+from utils.html_generator import HTMLReportGenerator
+
+URL = 'https://example.com/'
+
+
+def social(*links):
+    return {'links': {'twitter': {'links': list(links), 'count': len(links)}}, 'meta': {}}
+
+
+def test_site_template_entities_are_reported_once(make_page):
+    footer = {'emails': [{'email': 'contact@example.org', 'domain': 'example.org'}],
+              'phones': ['+33 1 42 68 53 00'], 'social_media': social('twitter.com/rhino')}
+    page = make_page(URL,
+                     emails=[{'email': 'contact@example.org', 'domain': 'example.org'},
+                             {'email': 'jobs@example.org', 'domain': 'example.org'}],
+                     phones=['+33 1 42 68 53 00', '+33 6 12 34 56 78'],
+                     social=social('twitter.com/rhino', 'twitter.com/rhino_jobs'),
+                     templates=[{'host': 'example.com', 'kind': 'footer', 'hash': 'h', 'pages': [URL, f"{URL}a"],
+                                 'findings': footer}])
+    html = HTMLReportGenerator.generate({URL: page})
+    contact = html.split('<h3>Contact Information</h3>')[1].split('<div class="section">')[0]
+    # Entités du gabarit : uniquement dans la section Site Template
+    for value in ('contact@example.org', '+33 1 42 68 53 00', 'twitter.com/rhino<'):
+        assert value not in contact
+        assert value.rstrip('<') in html
+    for value in ('jobs@example.org', '+33 6 12 34 56 78', 'twitter.com/rhino_jobs'):
+        assert value in contact
+
+
+def test_contact_values_are_escaped(make_page):
+    page = make_page(URL, phones=['<b>+33</b>'], social=social('twitter.com/<script>'))
+    html = HTMLReportGenerator.generate({URL: page})
+    assert '&lt;b&gt;+33&lt;/b&gt;' in html and '<b>+33' not in html
+    assert 'twitter.com/&lt;script&gt;' in html
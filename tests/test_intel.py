@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from core import intel as intel_module
+from core.intel import DomainIntelStore, registrable_domain
+
+
+@pytest.mark.parametrize('hostname, expected', [
+    ('www.shop.example.com', 'example.com'),
+    ('www.shop.example.co.uk', 'example.co.uk'),
+    ('Example.COM.', 'example.com'),
+    ('localhost', 'localhost'),
+    ('192.0.2.10', '192.0.2.10'),
+])
+def test_registrable_domain(hostname, expected):
+    assert registrable_domain(hostname) == expected
+
+
+def test_lookup_loads_once_and_caches_failures(tmp_path):
+    store = DomainIntelStore(str(tmp_path / 'intel.db'))
+    calls = []
+
+    async def loader():
+        calls.append('dns')
+        return {'a': ['192.0.2.10']}
+
+    async def failing():
+        calls.append('tls')
+        raise ConnectionError('refused')
+
+    async def run():
+        results = await asyncio.gather(*[store.lookup('dns', 'example.com', loader) for _ in range(5)])
+        failures = [await store.lookup('tls', 'example.com', failing) for _ in range(2)]
+        return results, failures
+
+    results, failures = asyncio.run(run())
+    assert results == [(True, {'a': ['192.0.2.10']})] * 5
+    assert failures == [(False, 'refused')] * 2
+    assert calls == ['dns', 'tls']
+
+
+def test_facts_expire_after_their_ttl(tmp_path, monkeypatch, settings):
+    now = [1000.0]
+    monkeypatch.setattr(intel_module.time, 'time', lambda: now[0])
+    store = DomainIntelStore(str(tmp_path / 'intel.db'))
+    store.put('tls', 'example.com', {'issuer': 'CA'})
+    store.put('dns', 'example.com', 'timeout', ok=False)
+    assert store.get('tls', 'example.com') == (True, {'issuer': 'CA'})
+    now[0] += settings.NEGATIVE_TTL + 1
+    assert store.get('dns', 'example.com') is None
+    assert store.get('tls', 'example.com') is not None
+    now[0] += settings.TLS_TTL
+    assert store.get('tls', 'example.com') is None
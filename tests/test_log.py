@@ -0,0 +1,57 @@
+import io
+import json
+import logging
+import sys
+
+from utils.log import ConsoleFormatter, JsonFormatter, LocalQueueHandler, ProgressLine
+
+
+def record(level, message, *args, exc_info=None):
+    return logging.LogRecord('core.analyzer', level, __file__, 1, message, args, exc_info)
+
+
+def failure():
+    try:
+        raise ValueError('bad thing')
+    except ValueError:
+        return sys.exc_info()
+
+
+def test_json_lines_carry_level_logger_and_message():
+    entry = json.loads(JsonFormatter().format(record(logging.WARNING, "Timeout on %s", 'https://example.com/')))
+    assert entry['level'] == 'WARNING'
+    assert entry['logger'] == 'core.analyzer'
+    assert entry['message'] == 'Timeout on https://example.com/'
+
+
+def test_console_shows_info_as_is_and_prefixes_other_levels():
+    formatter = ConsoleFormatter()
+    assert formatter.format(record(logging.INFO, "Crawl done")) == 'Crawl done'
+    assert formatter.format(record(logging.DEBUG, "Link")) == 'DEBUG core.analyzer: Link'
+    assert formatter.format(record(logging.ERROR, "Failed")) == 'ERROR: Failed'
+
+
+def test_console_summarizes_exceptions():
+    error = record(logging.ERROR, "Error analyzing %s", 'https://example.com/', exc_info=failure())
+    assert ConsoleFormatter().format(error) == 'ERROR: Error analyzing https://example.com/: ValueError: bad thing'
+    # Pile d'appels au niveau DEBUG
+    lines = ConsoleFormatter(tracebacks=True).format(error).splitlines()
+    assert lines[0] == 'ERROR: Error analyzing https://example.com/: ValueError: bad thing'
+    assert lines[1] == 'Traceback (most recent call last):'
+    assert lines[-1] == 'ValueError: bad thing'
+
+
+def test_queue_keeps_the_exception_for_the_formatters():
+    error = LocalQueueHandler(None).prepare(
+        record(logging.ERROR, "Error analyzing %s", 'https://example.com/', exc_info=failure()))
+    assert error.getMessage() == 'Error analyzing https://example.com/'
+    assert error.exc_info[0] is ValueError
+    assert json.loads(JsonFormatter().format(error))['exception'].endswith('ValueError: bad thing')
+
+
+def test_progress_line_stays_silent_outside_a_terminal():
+    stream = io.StringIO()
+    progress = ProgressLine(lambda: {'pages': 1, 'queued': 0, 'in_flight': 0, 'errors': 0}, stream=stream)
+    progress.start()
+    assert not ProgressLine.active
+    assert stream.getvalue() == ''
@@ -0,0 +1,159 @@
+import io
+import struct
+import zipfile
+import zlib
+
+from core.metadata import (detect_type, parse_jpeg, parse_ooxml_properties, parse_pdf_info, parse_png,
+                           parse_tiff, pdf_object, pdf_reference, pdf_startxref, pdf_xref_stream,
+                           pdf_xref_table, summarize, zip_central_directory, zip_entries, zip_member)
+
+
+def tiff(tags, gps=None):
+    """Structure TIFF petit-boutiste : IFD0 (chaînes ASCII) et IFD GPS facultatif (rationnels)"""
+    entries = [(tag, 2, value.encode() + b'\x00') for tag, value in sorted(tags.items())]
+    if gps:
+        entries.append((0x8825, 4, None))
+    ifd_size = 2 + 12 * len(entries) + 4
+    data_at = 8 + ifd_size
+    ifd, data = [], b''
+    for tag, kind, value in entries:
+        if value is None:
+            continue
+        if len(value) <= 4:
+            ifd.append(struct.pack('<HHI4s', tag, kind, len(value), value))
+        else:
+            ifd.append(struct.pack('<HHII', tag, kind, len(value), data_at + len(data)))
+            data += value
+    if gps:
+        gps_at = data_at + len(data)
+        gps_entries = [(1, 2, 1, gps[0].encode().ljust(4, b'\x00')), (3, 2, 1, gps[2].encode().ljust(4, b'\x00'))]
+        rationals = b''
+        gps_data_at = gps_at + 2 + 12 * 4 + 4
+        for tag, values in ((2, gps[1]), (4, gps[3])):
+            gps_entries.append((tag, 5, 3, struct.pack('<I', gps_data_at + len(rationals))))
+            rationals += b''.join(struct.pack('<II', value, 1) for value in values)
+        gps_ifd = struct.pack('<H', 4) + b''.join(struct.pack('<HHI4s', *entry) for entry in sorted(gps_entries))
+        data += gps_ifd + b'\x00' * 4 + rationals
+        ifd.append(struct.pack('<HHII', 0x8825, 4, 1, gps_at))
+    return b'II*\x00' + struct.pack('<I', 8) + struct.pack('<H', len(ifd)) + b''.join(ifd) + b'\x00' * 4 + data
+
+
+def test_detect_type():
+    assert detect_type(b'%PDF-1.7\n') == 'pdf'
+    assert detect_type(b'PK\x03\x04rest') == 'ooxml'
+    assert detect_type(b'\xff\xd8\xff\xe0') == 'jpeg'
+    assert detect_type(b'\x89PNG\r\n\x1a\n') == 'png'
+    assert detect_type(b'MM\x00*') == 'tiff'
+    assert detect_type(b'<html>') is None
+
+
+def test_parse_tiff_reads_strings_and_gps():
+    data = tiff({0x010F: 'Canon', 0x0110: 'EOS', 0x013B: 'Alice Martin'}, gps=('N', [48, 51, 36], 'W', [2, 21, 0]))
+    assert parse_tiff(data) == {'make': 'Canon', 'model': 'EOS', 'author': 'Alice Martin',
+                                'gps': '48.860000, -2.350000'}
+
+
+def test_parse_tiff_ignores_values_outside_the_bytes_read():
+    data = tiff({0x013B: 'Alice Martin'})
+    # Chaîne stockée après l'IFD : tronquée, elle est ignorée
+    assert parse_tiff(data[:-4]) == {}
+    assert parse_tiff(b'not a tiff') == {}
+
+
+def test_parse_jpeg_reads_exif_and_comment():
+    exif = b'Exif\x00\x00' + tiff({0x0131: 'GIMP 2.10'})
+    comment = b'Made by Bob'
+    data = (b'\xff\xd8'
+            + b'\xff\xe1' + struct.pack('>H', len(exif) + 2) + exif
+            + b'\xff\xfe' + struct.pack('>H', len(comment) + 2) + comment
+            + b'\xff\xda\x00\x02' + b'\x00' * 16)
+    assert parse_jpeg(data) == {'software': 'GIMP 2.10', 'comment': 'Made by Bob'}
+
+
+def png_chunk(kind, body):
+    return struct.pack('>I4s', len(body), kind) + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def test_parse_png_reads_text_chunks_before_image_data():
+    data = (b'\x89PNG\r\n\x1a\n'
+            + png_chunk(b'tEXt', b'Author\x00Alice')
+            + png_chunk(b'zTXt', b'Software\x00\x00' + zlib.compress(b'Photoshop'))
+            + png_chunk(b'iTXt', b'Title\x00\x00\x00fr\x00Titre\x00' + 'Été'.encode())
+            + png_chunk(b'IDAT', b'\x00' * 8)
+            + png_chunk(b'tEXt', b'Comment\x00after image data'))
+    assert parse_png(data) == {'author': 'Alice', 'software': 'Photoshop', 'title': 'Été'}
+
+
+def pdf(info):
+    """PDF minimal avec table de références croisées classique ; renvoie (octets, position de Info)"""
+    objects = [b'<< /Type /Catalog >>', info]
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref_at = len(data)
+    data += b'xref\n0 3\n0000000000 65535 f \n' + b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    data += b'trailer\n<< /Size 3 /Root 1 0 R /Info 2 0 R >>\nstartxref\n%d\n%%%%EOF\n' % xref_at
+    return data, offsets[1]
+
+
+def test_pdf_info_is_found_through_the_xref_table():
+    data, info_at = pdf(b'<< /Author (Jean \\(JD\\) Dupont) /Producer <FEFF00C90064> '
+                        b"/CreationDate (D:20240305142000+01'00') >>")
+    xref_at = pdf_startxref(data[-64:])
+    assert data[xref_at:].startswith(b'xref')
+    assert pdf_reference(data[xref_at:], b'Info') == 2
+    offset, prev = pdf_xref_table(data[xref_at:], 2)
+    assert (offset, prev) == (info_at, None)
+    info = pdf_object(data[offset:], 2)
+    assert parse_pdf_info(info) == {'author': 'Jean (JD) Dupont', 'producer': 'Éd',
+                                    'created': '2024-03-05T14:20:00+01:00'}
+
+
+def test_pdf_object_prefers_the_last_definition():
+    data = b'3 0 obj\n(old)\nendobj\n13 0 obj\n(other)\nendobj\n3 0 obj\n(new)\nendobj\n'
+    assert pdf_object(data, 3).strip() == b'(new)'
+    assert pdf_object(data, 4) is None
+
+
+def test_pdf_xref_stream_with_png_predictor():
+    # Entrées /W [1 2 1] pour les objets 0 à 2, filtre PNG « Up » sur chaque ligne
+    rows = [b'\x00\x00\x00\xff', b'\x01\x00\x0f\x00', b'\x02\x00\x05\x01']
+    previous, encoded = bytes(4), b''
+    for row in rows:
+        encoded += b'\x02' + bytes((value - before) & 0xFF for value, before in zip(row, previous))
+        previous = row
+    stream = zlib.compress(encoded)
+    data = (b'<< /Type /XRef /Size 3 /W [1 2 1] /Prev 116 /Filter /FlateDecode '
+            b'/DecodeParms << /Predictor 12 /Columns 4 >> /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+    assert pdf_xref_stream(data, 1) == ((1, 15, 0), 116)
+    assert pdf_xref_stream(data, 2) == ((2, 5, 1), 116)
+    assert pdf_xref_stream(data, 7) == (None, 116)
+
+
+def test_ooxml_properties_are_read_from_the_central_directory():
+    core = ('<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            '<dc:creator>Alice</dc:creator><cp:lastModifiedBy>Bob</cp:lastModifiedBy>'
+            '<dc:title> </dc:title></cp:coreProperties>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>', compress_type=zipfile.ZIP_STORED)
+        archive.writestr('docProps/core.xml', core, compress_type=zipfile.ZIP_DEFLATED)
+    data = buffer.getvalue()
+
+    offset, size = zip_central_directory(data[-64:])
+    entries = zip_entries(data[offset:offset + size])
+    assert set(entries) == {'[Content_Types].xml', 'docProps/core.xml'}
+    entry = entries['docProps/core.xml']
+    assert entry['method'] == 8
+    member = zip_member(data[entry['offset']:], entry)
+    assert parse_ooxml_properties(member) == {'author': 'Alice', 'last_modified_by': 'Bob'}
+    assert zip_member(data[entries['[Content_Types].xml']['offset']:], entries['[Content_Types].xml']) == b'<Types/>'
+    assert parse_ooxml_properties(b'<broken') == {}
+
+
+def test_summarize_puts_identifying_fields_first():
+    assert summarize({'title': 't', 'created': 'c', 'author': 'a', 'comment': 'x'}) == \
+        ['author', 'created', 'comment', 'title']
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from core.proxies import ProxyEndpoint, ProxyPool, ProxyTransport
+from core.transport import Transport, TransportError, TransportResponse
+
+
+class FakeTransport(Transport):
+    """Backend sans réseau : les proxies listés dans `down` échouent"""
+
+    down = set()
+    calls = []
+
+    async def _request(self, method, url, max_bytes, allow_redirects, headers=None):
+        FakeTransport.calls.append(self.proxy)
+        if self.proxy in FakeTransport.down:
+            raise TransportError('proxy refused', proxy=True)
+        if url.endswith('/missing'):
+            raise TransportError('connection reset')
+        return TransportResponse(url=url, status=200, headers={}, body=b'ok')
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeTransport.down, FakeTransport.calls = set(), []
+
+
+def make_pool(count, **options):
+    return ProxyPool([ProxyEndpoint(f"http://user:pw@10.0.0.{i}:8080", FakeTransport(proxy=f"p{i}"))
+                      for i in range(count)], **options)
+
+
+def test_pool_prefers_least_loaded_and_keeps_hosts_sticky():
+    pool = make_pool(2)
+    pool.endpoints[0].in_flight = 3
+    chosen = pool.choose('example.com')
+    assert chosen is pool.endpoints[1]
+    assert chosen.label == 'http://10.0.0.1:8080'  # sans identifiants
+    chosen.in_flight = 10
+    assert pool.choose('example.com') is chosen
+    assert pool.choose('other.example') is pool.endpoints[0]
+
+
+def test_failing_proxy_is_ejected_and_host_moves():
+    pool = make_pool(2, max_failures=2)
+    first = pool.choose('example.com')
+    pool.record_failure(first)
+    assert pool.choose('example.com') is first
+    pool.record_failure(first)
+    moved = pool.choose('example.com')
+    assert moved is not first
+    healthy = {proxy['proxy']: proxy['healthy'] for proxy in pool.summary()}
+    assert healthy == {first.label: False, moved.label: True}
+
+
+def test_transport_replays_requests_refused_by_a_proxy(settings):
+    settings.PROXY_REQUESTS_PER_SECOND = 0
+    transport = ProxyTransport(FakeTransport, ['http://10.0.0.1:8080', 'http://10.0.0.2:8080'])
+    FakeTransport.down = {'http://10.0.0.1:8080'}
+
+    async def run():
+        response = await transport.request('GET', 'https://example.com/')
+        with pytest.raises(TransportError):
+            await transport.request('GET', 'https://example.com/missing')
+        return response
+    assert asyncio.run(run()).status == 200
+    # Premier proxy refusé puis rejoué ; une erreur de la cible n'est pas rejouée
+    assert FakeTransport.calls == ['http://10.0.0.1:8080', 'http://10.0.0.2:8080', 'http://10.0.0.2:8080']
@@ -0,0 +1,107 @@
+import re
+
+import pytest
+
+from config.settings import PROFILES, Settings
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_defaults_without_file_or_environment(settings):
+    assert settings.PROFILE == ''
+    assert Settings.get_instance() is settings
+    assert settings.MAX_DEPTH == Settings().MAX_DEPTH
+
+
+def test_layers_override_in_order(tmp_path):
+    path = write(tmp_path / 'custom.toml', 'MAX_DEPTH = 4\nTIMEOUT = 12\nmax_links_per_level = 7\n')
+    environ = {'RHINO_TIMEOUT': '40', 'RHINO_CONCURRENT_REQUESTS': '3'}
+    settings = Settings.load(path, 'fast', {'CONCURRENT_REQUESTS': 9}, environ=environ)
+    # Profil < fichier < environnement < ligne de commande
+    assert settings.PROFILE == 'fast'
+    assert settings.EXTRACTOR_TIMEOUT == PROFILES['fast']['EXTRACTOR_TIMEOUT']
+    assert settings.MAX_DEPTH == 4
+    assert settings.MAX_LINKS_PER_LEVEL == 7
+    assert settings.TIMEOUT == 40
+    assert settings.CONCURRENT_REQUESTS == 9
+    assert Settings.get_instance() is settings
+
+
+def test_profile_and_config_path_from_environment(tmp_path):
+    path = write(tmp_path / 'other.toml', 'MAX_DEPTH = 1\n')
+    settings = Settings.load(environ={'RHINO_PROFILE': 'deep', 'RHINO_CONFIG': path})
+    assert settings.PROFILE == 'deep'
+    assert settings.MAX_DEPTH == 1
+    assert settings.MAX_LINKS_PER_LEVEL == PROFILES['deep']['MAX_LINKS_PER_LEVEL']
+
+
+def test_default_config_file_in_working_directory(tmp_path):
+    write(tmp_path / 'rhinoscraper.toml', 'PROFILE = "stealth"\n')
+    settings = Settings.load(environ={})
+    assert settings.PROFILE == 'stealth'
+    assert settings.HOST_CONCURRENCY_MAX == 1
+
+
+def test_profiles_defined_in_the_file(tmp_path):
+    path = write(tmp_path / 'custom.toml', '[profiles.quick]\nmax_depth = 1\n\n[profiles.deep]\nmax_depth = 9\n')
+    assert Settings.load(path, 'quick', environ={}).MAX_DEPTH == 1
+    # Un profil existant est complété, pas remplacé
+    deep = Settings.load(path, 'deep', environ={})
+    assert deep.MAX_DEPTH == 9
+    assert deep.MAX_LINKS_PER_LEVEL == PROFILES['deep']['MAX_LINKS_PER_LEVEL']
+
+
+def test_yaml_file(tmp_path):
+    pytest.importorskip('yaml')
+    path = write(tmp_path / 'custom.yaml', 'max_depth: 6\nextractors: [content, email]\n')
+    settings = Settings.load(path, environ={})
+    assert settings.MAX_DEPTH == 6
+    assert settings.EXTRACTORS == ['content', 'email']
+
+
+def test_environment_strings_are_coerced():
+    settings = Settings.load(environ={
+        'RHINO_ADAPTIVE_CONCURRENCY': 'off',
+        'RHINO_EXTRACTORS': 'content, email,',
+        'RHINO_HOST_REQUESTS_PER_SECOND': '2',
+        'RHINO_PROXIES': '["http://a:8080", "http://b:8080"]',
+        'RHINO_HEADERS': '{"User-Agent": "test"}',
+    })
+    assert settings.ADAPTIVE_CONCURRENCY is False
+    assert settings.EXTRACTORS == ['content', 'email']
+    assert settings.HOST_REQUESTS_PER_SECOND == 2.0
+    assert settings.PROXIES == ['http://a:8080', 'http://b:8080']
+    assert settings.HEADERS == {'User-Agent': 'test'}
+
+
+@pytest.mark.parametrize('environ, message', [
+    ({'RHINO_ADAPTIVE_CONCURRENCY': 'maybe'}, 'Invalid value for ADAPTIVE_CONCURRENCY'),
+    ({'RHINO_MAX_DEPTH': 'deep'}, 'Invalid value for MAX_DEPTH'),
+    ({'RHINO_PROFILE': 'turbo'}, "Unknown profile 'turbo'"),
+])
+def test_invalid_values_are_rejected(environ, message):
+    with pytest.raises(ValueError, match=message):
+        Settings.load(environ=environ)
+
+
+def test_unknown_environment_variables_are_ignored(caplog):
+    settings = Settings.load(environ={'RHINO_NOT_A_SETTING': '1', 'RHINO_TIMEOUT': '40'})
+    assert settings.TIMEOUT == 40
+    assert 'RHINO_NOT_A_SETTING' in caplog.text
+
+
+def test_unknown_settings_in_files_and_overrides_are_rejected(tmp_path):
+    path = write(tmp_path / 'custom.toml', 'NOT_A_SETTING = 1\n')
+    with pytest.raises(ValueError, match=re.escape(f"Unknown setting 'NOT_A_SETTING' ({path})")):
+        Settings.load(path, environ={})
+    with pytest.raises(ValueError, match=r"Unknown setting 'NOT_A_SETTING' \(command line\)"):
+        Settings.load(overrides={'not_a_setting': 1}, environ={})
+
+
+def test_file_values_must_have_the_setting_type(tmp_path):
+    path = write(tmp_path / 'custom.toml', 'MAX_DEPTH = true\n')
+    with pytest.raises(ValueError, match='Invalid value for MAX_DEPTH'):
+        Settings.load(path, environ={})
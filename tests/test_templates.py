@@ -0,0 +1,79 @@
+from bs4 import BeautifulSoup
+
+from core.templates import TemplateBlock, TemplateIndex, block_hash, block_kind, find_blocks, merge_findings
+
+
+def soup(html):
+    return BeautifulSoup(html, 'html.parser')
+
+
+def test_block_kind_from_tag_role_and_hints():
+    page = soup('<header></header><div role="Navigation"></div><div id="site-footer"></div>'
+                '<ul class="main-menu"></ul><section class="sidebar-left"></section>'
+                '<div class="headerless"></div><p class="footer"></p>')
+    kinds = [block_kind(element) for element in page.find_all(True)]
+    assert kinds == ['header', 'nav', 'footer', 'nav', 'aside', None, None]
+
+
+def test_find_blocks_skips_nested_and_content_blocks():
+    page = soup('<header><nav><a href="/">Accueil</a></nav></header>'
+                '<main><article><header><h1>Titre</h1></header><footer>Par Alice</footer></article></main>'
+                '<noscript><footer>Activez JavaScript</footer></noscript>'
+                '<div class="site-footer">Contact</div>')
+    blocks = find_blocks(page)
+    assert [kind for kind, _ in blocks] == ['header', 'footer']
+    assert blocks[1][1].get_text() == 'Contact'
+
+
+def test_block_hash_ignores_classes_but_not_text_or_links():
+    base = block_hash(soup('<nav><a href="/a">A</a> <a href="/b">B</a></nav>').nav)
+    # Entrée de menu active et espaces différents : même bloc
+    assert block_hash(soup('<nav id="x"><a class="active" href="/a">A</a>\n  <a href="/b">B</a></nav>').nav) == base
+    assert block_hash(soup('<nav><a href="/a">A</a> <a href="/c">B</a></nav>').nav) != base
+    assert block_hash(soup('<nav><a href="/a">A</a> <a href="/b">C</a></nav>').nav) != base
+
+
+def test_merge_findings_deduplicates_and_recounts():
+    target = {
+        'emails': [{'email': 'a@example.org', 'line': 3}],
+        'social_info': {'links': [{'platform': 'x', 'url': 'https://x.com/a'}], 'count': 1},
+        'technologies': {'nginx'},
+    }
+    source = {
+        'emails': [{'email': 'a@example.org', 'line': 40}, {'email': 'b@example.org', 'line': 41}],
+        'social_info': {'links': [{'platform': 'x', 'url': 'https://x.com/a'},
+                                  {'platform': 'github', 'url': 'https://github.com/a'}], 'count': 2},
+        'technologies': {'nginx', 'jQuery'},
+        'phones': [{'number': '+33 1 23 45 67 89', 'line': 42}],
+    }
+    merge_findings(target, source, located=False)
+    # Lignes d'une autre page : non reportées
+    assert target['emails'] == [{'email': 'a@example.org', 'line': 3}, {'email': 'b@example.org', 'line': None}]
+    assert target['phones'] == [{'number': '+33 1 23 45 67 89', 'line': None}]
+    assert target['social_info']['count'] == 2
+    assert target['technologies'] == {'nginx', 'jQuery'}
+    # Les résultats du bloc ne sont pas modifiés
+    assert source['phones'][0]['line'] == 42
+
+
+def test_merge_findings_keeps_lines_of_the_same_page():
+    target = {}
+    merge_findings(target, {'emails': [{'email': 'a@example.org', 'line': 7}]})
+    assert target == {'emails': [{'email': 'a@example.org', 'line': 7}]}
+
+
+def test_template_index_reports_blocks_shared_by_enough_pages():
+    index = TemplateIndex(min_pages=2)
+    for host, digest, pages in (('b.example', 'h1', {'/1', '/2'}), ('a.example', 'h2', {'/1', '/2', '/3'}),
+                                ('a.example', 'h3', {'/1'})):
+        index.add(TemplateBlock(host, digest, 'footer', f"https://{host}/1", 'texte', {'emails': []}, pages))
+    assert index.get('a.example', 'h3').pages == {'/1'}
+    assert index.get('a.example', 'h1') is None
+    assert [(block.host, block.hash) for block in index.site_blocks()] == [('a.example', 'h2'), ('b.example', 'h1')]
+    assert index.summary()[0] == {'host': 'a.example', 'kind': 'footer', 'hash': 'h2',
+                                  'pages': ['/1', '/2', '/3'], 'findings': {'emails': []}}
+
+
+def test_template_index_from_settings(settings):
+    settings.TEMPLATE_MIN_PAGES = 5
+    assert TemplateIndex.from_settings().min_pages == 5
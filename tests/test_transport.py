@@ -0,0 +1,132 @@
+import asyncio
+import socket
+
+import pytest
+from aiohttp import web
+
+from core import transport as transport_module
+from core.proxies import ProxyTransport
+from core.transport import TRANSPORTS, AiohttpTransport, TransportError, create_transport
+
+BIG = bytes(range(256)) * 1024
+
+BACKENDS = ['aiohttp', pytest.param('httpx', marks=pytest.mark.skipif(
+    transport_module.httpx is None, reason='httpx is not installed'))]
+
+
+async def page(request):
+    return web.Response(text='<p>Été</p>', content_type='text/html', charset='utf-8')
+
+
+async def big(request):
+    return web.Response(body=BIG, content_type='application/octet-stream')
+
+
+async def slow(request):
+    await asyncio.sleep(1)
+    return web.Response(text='late')
+
+
+async def redirect(request):
+    raise web.HTTPFound('/page')
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(backend, scenario, proxy=None):
+    """Lance scenario(transport, base) contre un serveur aiohttp local"""
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get('/page', page), web.get('/big', big), web.get('/slow', slow),
+                        web.get('/redirect', redirect)])
+        runner = web.AppRunner(app, shutdown_timeout=0.1)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        transport = TRANSPORTS[backend](proxy=proxy)
+        try:
+            return await scenario(transport, base)
+        finally:
+            await transport.close()
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_full_response(backend):
+    async def scenario(transport, base):
+        return await transport.request('GET', f"{base}/page")
+    response = serve(backend, scenario)
+    assert response.status == 200
+    assert response.text == '<p>Été</p>'
+    assert response.headers['content-type'].startswith('text/html')
+    assert not response.truncated
+    assert response.http_version == 'HTTP/1.1'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_body_is_truncated_at_max_bytes(backend):
+    async def scenario(transport, base):
+        return (await transport.request('GET', f"{base}/big", max_bytes=1000),
+                await transport.request('GET', f"{base}/big", max_bytes=len(BIG) + 1))
+    truncated, complete = serve(backend, scenario)
+    assert truncated.body == BIG[:1000] and truncated.truncated
+    assert complete.body == BIG and not complete.truncated
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_redirects(backend):
+    async def scenario(transport, base):
+        return (await transport.request('GET', f"{base}/redirect", allow_redirects=False),
+                await transport.request('GET', f"{base}/redirect"))
+    not_followed, followed = serve(backend, scenario)
+    assert not_followed.status == 302
+    assert followed.status == 200 and followed.url.endswith('/page')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_timeout_is_flagged(backend, settings):
+    settings.TIMEOUT = 0.2
+
+    async def scenario(transport, base):
+        with pytest.raises(TransportError) as error:
+            await transport.request('GET', f"{base}/slow")
+        return error.value
+    error = serve(backend, scenario)
+    assert error.timeout and not error.proxy
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_connection_errors(backend):
+    port = closed_port()
+
+    async def scenario(transport, base):
+        with pytest.raises(TransportError) as error:
+            await transport.request('GET', f"http://127.0.0.1:{port}/")
+        return error.value
+    # Cible injoignable : ni délai ni proxy en cause
+    error = serve(backend, scenario)
+    assert not error.timeout and not error.proxy
+    # Proxy injoignable : l'échec lui est imputé
+    error = serve(backend, scenario, proxy=f"http://127.0.0.1:{port}")
+    assert error.proxy
+
+
+def test_create_transport(settings):
+    assert isinstance(create_transport(), AiohttpTransport)
+    with pytest.raises(ValueError, match="Unknown HTTP backend 'curl'"):
+        create_transport('curl')
+
+
+def test_create_transport_behind_proxies(settings):
+    settings.PROXIES = ['http://127.0.0.1:3128', 'http://127.0.0.1:3129']
+    transport = create_transport('aiohttp')
+    assert isinstance(transport, ProxyTransport)
+    endpoints = transport.pool.endpoints
+    assert [endpoint.url for endpoint in endpoints] == settings.PROXIES
+    assert all(type(endpoint.transport) is AiohttpTransport and endpoint.transport.proxy == endpoint.url
+               and endpoint.transport.concurrency is transport.concurrency for endpoint in endpoints)
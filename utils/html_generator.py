@@ -1,13 +1,19 @@
 # utils/html_generator.py
-from typing import Dict
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from html import escape
 from urllib.parse import urlparse
+import logging
 from core.analyzer import AnalysisResult
+from core.metadata import summarize
+from core.store import flatten
+
+logger = logging.getLogger(__name__)
 
 
 class HTMLReportGenerator:
     @staticmethod
-    def generate(results: Dict[str, AnalysisResult]) -> str:
+    def generate(results: Dict[str, AnalysisResult], changes: Optional[Dict[str, Any]] = None) -> str:
         css = """
         <style>
             body { 
@@ -52,7 +58,9 @@ class HTMLReportGenerator:
                 text-align: left;
                 border-bottom: 1px solid #ddd;
             }
-            .email-item, .phone-item {
+            .added { color: #27ae60; }
+            .removed { color: #c0392b; }
+            .email-item, .phone-item, .social-item {
                 background: #f8f9fa;
                 padding: 10px;
                 margin: 5px 0;
@@ -74,6 +82,9 @@ class HTMLReportGenerator:
             </div>
         """
 
+        if changes is not None:
+            html += HTMLReportGenerator._changes_section(changes)
+
         for url, data in results.items():
             domain = urlparse(url).netloc
             html += f"""
@@ -85,6 +96,36 @@ class HTMLReportGenerator:
             </div>
             """
 
+            # Site Template Section
+            site_entities = set()
+            if templates := getattr(data, 'templates', []):
+                html += """
+                <div class="section">
+                    <h3>Site Template</h3>
+                    <p>Blocks repeated across pages (header, navigation, footer, sidebars), reported once.</p>
+                    <table class="data-table">
+                        <tr>
+                            <th>Block</th>
+                            <th>Findings</th>
+                            <th>Pages</th>
+                        </tr>
+                """
+                for block in templates:
+                    findings = block['findings']
+                    entities = HTMLReportGenerator._entities(
+                        findings.get('emails'), findings.get('phones'), findings.get('social_media'),
+                        findings.get('technologies'), findings.get('content'))
+                    site_entities.update((label, value) for label, values in entities.items() for value in values)
+                    html += f"""
+                        <tr>
+                            <td>{block['kind']} ({escape(block['host'])})</td>
+                            <td>{'<br>'.join(f"{label}: {escape(value)}" for label, values in entities.items()
+                                             for value in values)}</td>
+                            <td>{len(block['pages'])} pages</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
             # Technologies Section
             if data.technologies:
                 html += """
@@ -106,23 +147,34 @@ class HTMLReportGenerator:
                     html += f"<tr><th>{key}</th><td>{value}</td></tr>"
                 html += "</table></div>"
 
-            # Contact Information Section
+            # Contact Information Section (entités du gabarit exclues : rapportées une fois plus haut)
+            emails = [email for email in data.emails or []
+                      if ('Emails', email.get('email', '')) not in site_entities]
+            phones = [phone for phone in data.phones or [] if ('Phones', phone) not in site_entities]
+            social_links = [link for link in HTMLReportGenerator._entities(social=data.social).get('Social links', [])
+                            if ('Social links', link) not in site_entities]
             html += '<div class="section"><h3>Contact Information</h3>'
 
-            if data.emails:
+            if emails:
                 html += "<h4>Email Addresses</h4>"
-                for email in data.emails:
+                for email in emails:
                     html += f"""
                     <div class="email-item">
                         <p>Email: {email.get('email', '')}</p>
                         <p>Domain: {email.get('domain', '')}</p>
+                        {HTMLReportGenerator._deliverability(email)}
                     </div>
                     """
 
-            if data.phones:
+            if phones:
                 html += "<h4>Phone Numbers</h4>"
-                for phone in data.phones:
-                    html += f'<div class="phone-item">{phone}</div>'
+                for phone in phones:
+                    html += f'<div class="phone-item">{escape(phone)}</div>'
+
+            if social_links:
+                html += "<h4>Social Profiles</h4>"
+                for link in social_links:
+                    html += f'<div class="social-item">{escape(link)}</div>'
 
             html += "</div>"
 
@@ -159,6 +211,141 @@ class HTMLReportGenerator:
                         """
                 html += "</table></div>"
 
+            # Page-Specific Findings Section
+            page_findings = []
+            for page in flatten(data):
+                entities = HTMLReportGenerator._entities(page.emails, page.phones, page.social)
+                values = [f"{label}: {escape(value)}" for label, items in entities.items()
+                          for value in items if (label, value) not in site_entities]
+                if values:
+                    page_findings.append((page.url, values))
+            if page_findings and templates:
+                html += """
+                <div class="section">
+                    <h3>Page-Specific Findings</h3>
+                    <table class="data-table">
+                        <tr>
+                            <th>URL</th>
+                            <th>Findings outside the site template</th>
+                        </tr>
+                """
+                for page_url, values in page_findings:
+                    html += f"""
+                        <tr>
+                            <td>{escape(page_url)}</td>
+                            <td>{'<br>'.join(values)}</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
+            # Linked Assets Section
+            if assets := HTMLReportGenerator._asset_findings(data):
+                html += """
+                <div class="section">
+                    <h3>Scripts and Stylesheets</h3>
+                    <table class="data-table">
+                        <tr>
+                            <th>Asset</th>
+                            <th>Findings</th>
+                            <th>Referenced by</th>
+                        </tr>
+                """
+                for asset in assets:
+                    # Contenu des scripts et feuilles de style : échappé comme le reste des données collectées
+                    findings = [f"Secret ({escape(s['type'])}): {escape(s['value'])}" for s in asset.get('secrets', [])]
+                    findings += [f"Email: {escape(e)}" for e in asset.get('emails', [])]
+                    findings += [f"Analytics: {escape(a)}" for a in asset.get('analytics_ids', [])]
+                    findings += [f"Technology: {escape(t)}" for t in asset.get('technologies', [])]
+                    html += f"""
+                        <tr>
+                            <td>{escape(asset['url'])}</td>
+                            <td>{'<br>'.join(findings)}</td>
+                            <td>{len(asset.get('pages', []))} pages</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
+            # Linked Documents Section
+            if documents := HTMLReportGenerator._documents(data):
+                html += """
+                <div class="section">
+                    <h3>Document Metadata</h3>
+                    <table class="data-table">
+                        <tr>
+                            <th>Document</th>
+                            <th>Metadata</th>
+                            <th>Linked from</th>
+                        </tr>
+                """
+                for document in documents:
+                    metadata = document['metadata']
+                    # Valeurs choisies par l'auteur du document : échappées
+                    fields = [f"{name.replace('_', ' ').capitalize()}: {escape(str(metadata[name]))}"
+                              for name in summarize(metadata)]
+                    pages = document.get('pages', [])
+                    linked_from = '<br>'.join(escape(page) for page in pages[:5])
+                    if len(pages) > 5:
+                        linked_from += f"<br>and {len(pages) - 5} more"
+                    html += f"""
+                        <tr>
+                            <td>{escape(document['url'])}<br>{(document.get('type') or '').upper()}</td>
+                            <td>{'<br>'.join(fields)}</td>
+                            <td>{linked_from}</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
+            # Collapsed Pages Section
+            if collapsed := HTMLReportGenerator._collapsed_pages(data):
+                html += """
+                <div class="section">
+                    <h3>Duplicate Pages</h3>
+                    <table class="data-table">
+                        <tr>
+                            <th>URL</th>
+                            <th>Same content as</th>
+                            <th>Note</th>
+                        </tr>
+                """
+                for page in collapsed:
+                    duplicate = page.duplicate
+                    if duplicate['kind'] == 'exact':
+                        note = "Identical content, results reused"
+                    elif duplicate['skipped']:
+                        note = f"Near-duplicate ({duplicate['distance']} bits), extraction and links skipped"
+                    else:
+                        note = f"Near-duplicate ({duplicate['distance']} bits)"
+                    html += f"""
+                        <tr>
+                            <td>{escape(page.url)}</td>
+                            <td>{escape(duplicate['url'])}</td>
+                            <td>{note}</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
+            # Partial Results Section
+            partial = [page for page in flatten(data) if getattr(page, 'incomplete', None)]
+            if partial:
+                html += """
+                <div class="section">
+                    <h3>Partial Results</h3>
+                    <table class="data-table">
+                        <tr>
+                            <th>URL</th>
+                            <th>Missing extractors</th>
+                        </tr>
+                """
+                for page in partial:
+                    missing = ', '.join(f"{name} ({reason})" for name, reason in sorted(page.incomplete.items()))
+                    html += f"""
+                        <tr>
+                            <td>{escape(page.url)}</td>
+                            <td>{missing}</td>
+                        </tr>
+                    """
+                html += "</table></div>"
+
         html += """
             <div class="footer">
                 <p>Generated by RhinoScraper - © 2024</p>
@@ -169,6 +356,104 @@ class HTMLReportGenerator:
 
         return html
 
+    @staticmethod
+    def _changes_section(changes: Dict[str, Any]) -> str:
+        """Section listant les changements depuis le scan précédent"""
+        html = f"""
+            <div class="section">
+                <h2>Changes Since Previous Scan</h2>
+                <p>{changes['total']} changes detected</p>
+        """
+        pages = changes['pages']
+        for label, key in (('New pages', 'added'), ('Removed pages', 'removed'), ('Modified pages', 'changed')):
+            if pages[key]:
+                html += f"<h4>{label}</h4>"
+                for page in pages[key]:
+                    html += f"<div>{escape(page)}</div>"
+
+        for label, key in (('Emails', 'emails'), ('Phone Numbers', 'phones'),
+                           ('Technologies', 'technologies'), ('Sensitive Files', 'sensitive_files')):
+            entity_changes = changes[key]
+            if entity_changes['added'] or entity_changes['removed']:
+                html += f"<h4>{label}</h4>"
+                for item in entity_changes['added']:
+                    html += f'<div class="added">+ {escape(item["value"])}</div>'
+                for item in entity_changes['removed']:
+                    html += f'<div class="removed">- {escape(item["value"])}</div>'
+
+        for label, key in (('Security Headers', 'headers'), ('Certificates', 'certificates')):
+            if changes[key]:
+                html += f"""
+                <h4>{label}</h4>
+                <table class="data-table">
+                    <tr><th>Host</th><th>Name</th><th>Before</th><th>After</th></tr>
+                """
+                for change in changes[key]:
+                    html += (f"<tr><td>{escape(change['host'])}</td><td>{escape(change['name'])}</td>"
+                             f"<td>{escape(str(change['before']))}</td><td>{escape(str(change['after']))}</td></tr>")
+                html += "</table>"
+
+        html += "</div>"
+        return html
+
+    @staticmethod
+    def _asset_findings(result: AnalysisResult) -> List[Dict[str, Any]]:
+        """Assets de l'arborescence ayant au moins un résultat, sans doublons"""
+        assets = {}
+        for page in flatten(result):
+            for asset in getattr(page, 'assets', []):
+                if any(asset.get(key) for key in ('secrets', 'emails', 'analytics_ids', 'technologies')):
+                    assets[asset['url']] = asset
+        return [assets[url] for url in sorted(assets)]
+
+    @staticmethod
+    def _documents(result: AnalysisResult) -> List[Dict[str, Any]]:
+        """Documents de l'arborescence ayant des métadonnées, sans doublons"""
+        documents = {}
+        for page in flatten(result):
+            for document in getattr(page, 'documents', []):
+                if document.get('metadata'):
+                    documents[document['url']] = document
+        return [documents[url] for url in sorted(documents)]
+
+    @staticmethod
+    def _entities(emails: Optional[List[Dict[str, Any]]] = None,
+                  phones: Optional[List[str]] = None,
+                  social: Optional[Dict[str, Any]] = None,
+                  technologies: Optional[List[str]] = None,
+                  content: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+        """Entités d'une page ou d'un bloc de gabarit, par catégorie"""
+        entities = {
+            'Emails': [email.get('email', '') for email in emails or []],
+            'Phones': list(phones or []),
+            'Social links': sorted(link for data in ((social or {}).get('links') or {}).values()
+                                   for link in data.get('links', [])),
+            'Technologies': list(technologies or []),
+            'Analytics IDs': list((content or {}).get('analytics_ids', [])),
+        }
+        return {label: values for label, values in entities.items() if values}
+
+    @staticmethod
+    def _deliverability(email: Dict[str, Any]) -> str:
+        """Résultat de la vérification MX du domaine, si elle a eu lieu"""
+        if 'deliverable' not in email:
+            return ''
+        if email['deliverable']:
+            return f"<p>Mail servers: {escape(', '.join(email.get('mx', [])))}</p>"
+        status = 'Undeliverable' if email['deliverable'] is False else 'Deliverability unknown'
+        return f"<p>{status}: {escape(str(email.get('reason') or ''))}</p>"
+
+    @staticmethod
+    def _collapsed_pages(result: AnalysisResult) -> List[AnalysisResult]:
+        """Pages de l'arborescence identiques ou quasi identiques à une autre page"""
+        pages = []
+        if getattr(result, 'duplicate', None):
+            pages.append(result)
+        for child in result.internal_links.values():
+            if child:
+                pages.extend(HTMLReportGenerator._collapsed_pages(child))
+        return pages
+
     @staticmethod
     def save_report(html: str, url: str) -> str:
         """Sauvegarde le rapport HTML dans un fichier"""
@@ -178,5 +463,5 @@ class HTMLReportGenerator:
                 f.write(html)
             return filename
         except Exception as e:
-            print(f"Error saving report: {str(e)}")
+            logger.error("Error saving report: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,156 @@
+import asyncio
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, TextIO
+
+# Partagé par les messages console et la ligne de progression, qui écrivent sur le même terminal
+_console_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Bibliothèques qui journalisent chaque requête
+NOISY_LOGGERS = ('asyncio', 'aiohttp.access', 'httpx', 'httpcore', 'hpack', 'hypercorn')
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Messages d'information tels quels, niveau et module pour le reste.
+
+    Une exception est résumée en une ligne (type et message), suivie de la pile d'appels
+    si tracebacks est vrai (niveau DEBUG).
+    """
+
+    def __init__(self, tracebacks: bool = False):
+        super().__init__()
+        self.tracebacks = tracebacks
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info and record.exc_info[1] is not None:
+            exc = record.exc_info[1]
+            message = f"{message}: {type(exc).__name__}: {exc}"
+            if self.tracebacks:
+                message = f"{message}\n{self.formatException(record.exc_info)}"
+        if record.levelno == logging.INFO:
+            return message
+        if record.levelno == logging.DEBUG:
+            return f"DEBUG {record.name}: {message}"
+        return f"{record.levelname}: {message}"
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """File lue par un thread du même processus : l'exception est transmise telle quelle aux formateurs"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Efface la ligne de progression avant d'écrire un message ; elle est redessinée ensuite"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with _console_lock:
+            if ProgressLine.active:
+                self.stream.write('\r\x1b[K')
+            super().emit(record)
+
+
+def setup_logging(level: str = 'INFO', json_file: Optional[str] = None) -> None:
+    """Configure les logs : les modules écrivent dans une file, un thread se charge des sorties"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    console = ConsoleHandler()
+    console.setFormatter(ConsoleFormatter(tracebacks=level.upper() == 'DEBUG'))
+    handlers = [console]
+    if json_file:
+        file_handler = logging.FileHandler(json_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [LocalQueueHandler(log_queue)]
+    root.setLevel(level.upper())
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(max(logging.WARNING, root.level))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class ProgressLine:
+    """Ligne de progression du crawl, redessinée sur place (uniquement sur un terminal)"""
+
+    active = False
+
+    def __init__(self,
+                 snapshot: Callable[[], Dict[str, int]],
+                 interval: float = 0.5,
+                 stream: TextIO = sys.stderr):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.stream = stream
+        self._task: Optional[asyncio.Task] = None
+        self._started = time.monotonic()
+
+    def start(self) -> None:
+        if not self.stream.isatty():
+            return
+        self._started = time.monotonic()
+        ProgressLine.active = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.render()
+        with _console_lock:
+            self.stream.write('\n')
+            self.stream.flush()
+        ProgressLine.active = False
+
+    async def _run(self) -> None:
+        while True:
+            self.render()
+            await asyncio.sleep(self.interval)
+
+    def render(self) -> None:
+        stats = self.snapshot()
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        line = (f"pages {stats['pages']} | queued {stats['queued']} | in flight {stats['in_flight']} | "
+                f"{stats['pages'] / elapsed:.1f} pages/s | errors {stats['errors']}")
+        with _console_lock:
+            self.stream.write('\r\x1b[K' + line)
+            self.stream.flush()